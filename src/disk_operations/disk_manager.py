@@ -5,11 +5,116 @@ JSDoc: ディスク操作モジュール
 制限: Linux環境（LubuntuまたはUbuntuベース）での動作を前提とする
 """
 
+import functools
 import os
+import shutil
 import subprocess
 import json
-from typing import List, Any
-from ..utils.logger import Logger
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple, Union
+from ..utils.logger import logger
+
+try:
+    import orjson
+except ImportError:  # orjsonは任意依存のため、未導入時は標準のjsonを使用する
+    orjson = None
+
+
+# ディスク検出結果をキャッシュする秒数
+_DISK_CACHE_TTL = 2.0
+
+# ディスク詳細情報（SMARTステータスを含む）をキャッシュする秒数
+_INFO_CACHE_TTL = 30.0
+
+# ブロックデバイスの増減を検知するために参照するファイル
+_PARTITIONS_PATH = "/proc/partitions"
+
+# ブロックデバイスの属性を参照するsysfsのディレクトリ
+_SYSFS_BLOCK_PATH = "/sys/class/block"
+# デバイス番号（major:minor）からブロックデバイスを参照するsysfsのディレクトリ
+_SYSFS_DEV_BLOCK_PATH = "/sys/dev/block"
+
+# シリアル番号を公開するsysfsの属性（NVMe・virtioなど、ドライバにより位置が異なる）
+_SYSFS_SERIAL_ATTRIBUTES = ("device/serial", "serial")
+
+# ディスク詳細情報を並行して取得するスレッド数の上限
+_INFO_MAX_WORKERS = 16
+
+# 詳細情報の取得に使用するlsblkの全列出力のコマンド
+_LSBLK_ALL_COLUMNS_COMMAND = ["lsblk", "-J", "-O", "-b"]
+
+# ファイルシステム毎の整合性チェックのコマンドと、成功時にコマンドの出力を表示するかどうか
+# （コマンドの末尾にデバイスパスを付けて実行し、終了コード0を整合性ありとする）
+_FSCK_COMMANDS: Dict[str, Tuple[List[str], bool]] = {
+    "ext4": (["fsck.ext4", "-n"], True),
+    "ntfs": (["ntfsfix"], False),
+}
+
+# 全ディスクのデバイス名と種類を一度に列挙するsmartctlのコマンド
+_SMARTCTL_SCAN_COMMAND = ["smartctl", "--scan-open", "--json=c"]
+# SMART情報を取得するsmartctlのオプション（JSON出力、識別情報・総合判定・能力・属性）
+_SMARTCTL_INFO_OPTIONS = ["--json=c", "-i", "-H", "-c", "-A"]
+
+# 取得できなかった詳細情報の表示
+_UNKNOWN = "不明"
+
+# サイズ文字列（例: "931.5G"）を整数部・小数部・単位に分けるパターン
+_SIZE_PATTERN = re.compile(r"([0-9]+)(?:\.([0-9]*))?([BKMGTP]?)", re.IGNORECASE)
+
+# サイズ文字列の単位とバイト数の対応表
+_SIZE_UNITS = {
+    "B": 1,
+    "K": 1 << 10,
+    "M": 1 << 20,
+    "G": 1 << 30,
+    "T": 1 << 40,
+    "P": 1 << 50,
+}
+
+
+def _loads_json(output: Union[str, bytes]) -> Any:
+    """コマンドが出力したJSONを解析する（orjsonが利用可能な場合はそちらを使用する）
+
+    バイト列はデコードせずにそのまま渡し、文字列への変換とそのコピーを省く
+
+    Args:
+        output (Union[str, bytes]): JSON形式の出力
+
+    Returns:
+        Any: 解析結果
+    """
+    return orjson.loads(output) if orjson is not None else json.loads(output)
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_command(name: str) -> Optional[str]:
+    """コマンド名から実行ファイルの絶対パスを取得する（結果はキャッシュする）
+
+    Args:
+        name (str): コマンド名
+
+    Returns:
+        Optional[str]: 実行ファイルのパス。見つからない場合はNone
+    """
+    return shutil.which(name)
+
+
+def _spawn_options(name: str) -> Dict[str, Any]:
+    """外部コマンドをposix_spawnで起動させるためのsubprocessの引数を作成する
+
+    subprocessは実行ファイルが絶対パスで指定され、close_fdsがFalseの場合に
+    fork()の代わりにposix_spawn()で子プロセスを起動する。Pythonが開く
+    ファイルディスクリプタは既定で継承されないため、close_fdsは不要である
+
+    Args:
+        name (str): 実行するコマンド名
+
+    Returns:
+        Dict[str, Any]: subprocess.run・check_outputへ渡す追加の引数
+    """
+    return {"executable": _resolve_command(name), "close_fds": False}
 
 
 class Disk:
@@ -23,6 +128,8 @@ class Disk:
         health_status (str): ヘルスステータス
     """
 
+    __slots__ = ("device_path", "size", "filesystem", "mounted", "health_status")
+
     def __init__(
         self,
         device_path: str,
@@ -46,6 +153,8 @@ class FilesystemStatus:
         details (str): 状態詳細
     """
 
+    __slots__ = ("is_consistent", "details")
+
     def __init__(self, is_consistent: bool, details: str) -> None:
         self.is_consistent = is_consistent
         self.details = details
@@ -61,6 +170,8 @@ class DiskInfo:
         smart_status (Any): SMARTステータス情報
     """
 
+    __slots__ = ("model", "serial", "partition_table", "smart_status")
+
     def __init__(
         self, model: str, serial: str, partition_table: str, smart_status: Any
     ) -> None:
@@ -75,56 +186,111 @@ class DiskManager:
 
     Methods:
         detect_disks() -> List[Disk]: 内蔵ディスクの自動検出
+        refresh() -> List[Disk]: キャッシュを破棄してディスクを再検出
         mount_disk(disk: Disk) -> bool: ディスクのマウント
         unmount_disk(disk: Disk) -> bool: ディスクのアンマウント
         check_filesystem(disk: Disk) -> FilesystemStatus: ファイルシステムのチェック
-        get_disk_info(disk: Disk) -> DiskInfo: ディスク情報の取得
+        check_filesystems(disks: List[Disk]) -> Dict[str, FilesystemStatus]: 複数ディスクのチェック
+        get_disk_info(disk: Disk, refresh: bool = False) -> DiskInfo: ディスク情報の取得
+        detect_and_enrich() -> List[Tuple[Disk, DiskInfo]]: 検出と詳細情報の並行取得
+        refresh_lsblk_cache() -> Dict[str, Dict[str, Any]]: lsblkの全列出力の取得
+        refresh_smart_cache() -> Dict[str, Dict[str, Any]]: 全ディスクのSMART情報の先読み
+        is_rotational(path: str) -> bool: HDD上のパスかどうかの判定
     """
 
     def __init__(self):
-        self.logger = Logger()
+        self.logger = logger
+        # (検出時刻, /proc/partitionsの更新時刻, 検出結果)
+        self._disk_cache: Optional[Tuple[float, int, List[Disk]]] = None
+        # デバイスパス -> (取得時刻, sysfsのstatファイルの内容, ディスク詳細情報)
+        self._info_cache: Dict[str, Tuple[float, str, DiskInfo]] = {}
+        # デバイスパス -> lsblk -Oの1デバイス分の出力（マウント・アンマウントで破棄）
+        self._lsblk_cache: Optional[Dict[str, Dict[str, Any]]] = None
+        # デバイスパス -> 先読みしたsmartctlの出力（詳細情報の一括取得が終わると破棄）
+        self._smart_cache: Dict[str, Dict[str, Any]] = {}
 
     def detect_disks(self) -> List[Disk]:
         """内蔵ディスクの自動検出を行う
 
+        直近の検出結果は短時間キャッシュし、/proc/partitionsが更新されていなければ
+        lsblkを再実行せずに返す
+
         Returns:
             List[Disk]: 検出されたディスクのリスト
         """
-        disks = []
+        partitions_mtime = self._partitions_mtime()
+        now = time.monotonic()
+        if self._disk_cache is not None:
+            cached_at, cached_mtime, cached_disks = self._disk_cache
+            if now - cached_at < _DISK_CACHE_TTL and cached_mtime == partitions_mtime:
+                return list(cached_disks)
 
         # lsblkコマンドを実行してディスク情報を取得
+        # 出力は文字列へデコードせず、バイト列のままJSONとして解析する
         output = subprocess.check_output(
-            ["lsblk", "-J", "-o", "NAME,SIZE,FSTYPE,MOUNTPOINT,HEALTH"],
-            universal_newlines=True,
+            ["lsblk", "-J", "-b", "-o", "NAME,SIZE,FSTYPE,MOUNTPOINT,HEALTH"],
+            **_spawn_options("lsblk"),
         )
-        disk_info = json.loads(output)
-
-        for disk in disk_info["blockdevices"]:
+        disks = [
             # ディスク情報をDiskオブジェクトに変換
-            device_path = f"/dev/{disk['name']}"
-            size = self._parse_size(disk["size"])
-            filesystem = disk.get("fstype", "")
-            mounted = "mountpoint" in disk
-            health_status = disk.get("health", "")
+            Disk(
+                f"/dev/{disk['name']}",
+                self._parse_size(disk["size"]),
+                disk.get("fstype", ""),
+                "mountpoint" in disk,
+                disk.get("health", ""),
+            )
+            for disk in _loads_json(output)["blockdevices"]
+        ]
 
-            disk_obj = Disk(device_path, size, filesystem, mounted, health_status)
-            disks.append(disk_obj)
+        self._disk_cache = (now, partitions_mtime, disks)
+        return list(disks)
 
-        return disks
+    def refresh(self) -> List[Disk]:
+        """キャッシュを破棄してディスクを再検出する
+
+        Returns:
+            List[Disk]: 検出されたディスクのリスト
+        """
+        self._disk_cache = None
+        return self.detect_disks()
+
+    def _partitions_mtime(self) -> int:
+        """/proc/partitionsの更新時刻を取得する
+
+        Returns:
+            int: 更新時刻（ナノ秒）。取得できない場合は0
+        """
+        try:
+            return os.stat(_PARTITIONS_PATH).st_mtime_ns
+        except OSError:
+            return 0
 
-    def _parse_size(self, size_str: str) -> int:
+    def _parse_size(self, size_str: Union[str, int]) -> int:
         """ディスクサイズ文字列をバイト単位の整数に変換する
 
+        lsblk -bの出力（バイト数）と単位付きの文字列の両方に対応し、
+        小数を含むサイズ（例: "931.5G"）も整数演算のみで変換する
+
         Args:
-            size_str (str): ディスクサイズの文字列（例: "10G"）
+            size_str (Union[str, int]): ディスクサイズ（例: "10G"、1073741824）
 
         Returns:
-            int: バイト単位のディスクサイズ
+            int: バイト単位のディスクサイズ。解析できない場合は0
         """
-        units = {"K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
-        size = float(size_str[:-1])
-        unit = size_str[-1].upper()
-        return int(size * units[unit])
+        if isinstance(size_str, int):
+            return size_str
+
+        match = _SIZE_PATTERN.fullmatch(size_str.strip())
+        if match is None:
+            return 0
+
+        whole, fraction, unit = match.groups()
+        multiplier = _SIZE_UNITS[unit.upper()] if unit else 1
+        size = int(whole) * multiplier
+        if fraction:
+            size += int(fraction) * multiplier // 10 ** len(fraction)
+        return size
 
     def mount_disk(self, disk: Disk) -> bool:
         """指定されたディスクのマウントを実施する
@@ -142,13 +308,19 @@ class DiskManager:
             os.makedirs(mount_point, exist_ok=True)
 
             # マウントコマンドを実行
-            subprocess.run(["mount", disk.device_path, mount_point], check=True)
+            subprocess.run(
+                ["mount", disk.device_path, mount_point],
+                check=True,
+                **_spawn_options("mount"),
+            )
+            # マウント状態が変わったため、ディスク検出結果のキャッシュを破棄する
+            self._invalidate_device_caches(disk)
             return True
         except subprocess.CalledProcessError as e:
-            self.logger.log_error(f"ディスクのマウントに失敗しました: {e}")
-            self.logger.log_error(f"エラーコード: DISK_002")
-            self.logger.log_error(f"ディスク: {disk.device_path}")
-            self.logger.log_error(f"マウントポイント: {mount_point}")
+            self.logger.log_error("ディスクのマウントに失敗しました: %s", e)
+            self.logger.log_error("エラーコード: DISK_002")
+            self.logger.log_error("ディスク: %s", disk.device_path)
+            self.logger.log_error("マウントポイント: %s", mount_point)
             return False
 
     def unmount_disk(self, disk: Disk) -> bool:
@@ -162,126 +334,481 @@ class DiskManager:
         """
         try:
             # アンマウントコマンドを実行
-            subprocess.run(["umount", disk.device_path], check=True)
+            subprocess.run(
+                ["umount", disk.device_path],
+                check=True,
+                **_spawn_options("umount"),
+            )
+            # マウント状態が変わったため、ディスク検出結果のキャッシュを破棄する
+            self._invalidate_device_caches(disk)
             return True
         except subprocess.CalledProcessError as e:
-            self.logger.log_error(f"ディスクのアンマウントに失敗しました: {e}")
-            self.logger.log_error(f"エラーコード: DISK_003")
-            self.logger.log_error(f"ディスク: {disk.device_path}")
+            self.logger.log_error("ディスクのアンマウントに失敗しました: %s", e)
+            self.logger.log_error("エラーコード: DISK_003")
+            self.logger.log_error("ディスク: %s", disk.device_path)
             return False
 
+    def _invalidate_device_caches(self, disk: Disk) -> None:
+        """ディスクの状態が変わった時に、検出結果と詳細情報のキャッシュを破棄する
+
+        Args:
+            disk (Disk): 状態が変わったディスク
+        """
+        self._disk_cache = None
+        self._lsblk_cache = None
+        self._info_cache.pop(disk.device_path, None)
+
     def check_filesystem(self, disk: Disk) -> FilesystemStatus:
         """マウントされたディスクのファイルシステムの状態を検査する
 
+        実行するコマンドはファイルシステムの種類から_FSCK_COMMANDSで引く
+
         Args:
             disk (Disk): チェック対象のディスク
 
         Returns:
             FilesystemStatus: 検査結果
         """
-        if disk.filesystem == "ext4":
-            # ext4ファイルシステムの場合はfsck.ext4コマンドを実行
-            try:
-                output = subprocess.check_output(
-                    ["fsck.ext4", "-n", disk.device_path],
-                    stderr=subprocess.STDOUT,
-                    universal_newlines=True,
-                )
-                if "clean" in output:
-                    return FilesystemStatus(
-                        is_consistent=True,
-                        details="ファイルシステムは整合性が取れています",
-                    )
-                else:
-                    return FilesystemStatus(is_consistent=False, details=output)
-            except subprocess.CalledProcessError as e:
-                self.logger.log_error(
-                    f"ファイルシステムチェックに失敗しました: {e.output}"
-                )
-                self.logger.log_error(f"エラーコード: DISK_004")
-                self.logger.log_error(f"ディスク: {disk.device_path}")
-                return FilesystemStatus(is_consistent=False, details=e.output)
-
-        elif disk.filesystem == "ntfs":
-            # ntfsファイルシステムの場合はntfsfixコマンドを実行
-            try:
-                subprocess.check_output(
-                    ["ntfsfix", disk.device_path],
-                    stderr=subprocess.STDOUT,
-                    universal_newlines=True,
-                )
-                return FilesystemStatus(
-                    is_consistent=True, details="ファイルシステムは整合性が取れています"
-                )
-            except subprocess.CalledProcessError as e:
-                self.logger.log_error(
-                    f"ファイルシステムチェックに失敗しました: {e.output}"
-                )
-                self.logger.log_error(f"エラーコード: DISK_004")
-                self.logger.log_error(f"ディスク: {disk.device_path}")
-                return FilesystemStatus(is_consistent=False, details=e.output)
-
-        else:
-            self.logger.log_error(f"未対応のファイルシステムです: {disk.filesystem}")
-            self.logger.log_error(f"エラーコード: DISK_005")
-            self.logger.log_error(f"ディスク: {disk.device_path}")
+        check = _FSCK_COMMANDS.get(disk.filesystem)
+        if check is None:
+            self.logger.log_error("未対応のファイルシステムです: %s", disk.filesystem)
+            self.logger.log_error("エラーコード: DISK_005")
+            self.logger.log_error("ディスク: %s", disk.device_path)
             return FilesystemStatus(
                 is_consistent=False, details="未対応のファイルシステムです"
             )
 
-    def get_disk_info(self, disk: Disk) -> DiskInfo:
+        command, show_output = check
+        # 出力は必要な場合のみ文字列へデコードする
+        result = subprocess.run(
+            [*command, disk.device_path],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            **_spawn_options(command[0]),
+        )
+        if result.returncode == 0:
+            return FilesystemStatus(
+                is_consistent=True,
+                details=(
+                    result.stdout.decode(errors="replace")
+                    if show_output and result.stdout
+                    else "ファイルシステムは整合性が取れています"
+                ),
+            )
+
+        details = (
+            result.stdout.decode(errors="replace")
+            if result.stdout
+            else f"{command[0]}がエラーを検出しました（終了コード: {result.returncode}）"
+        )
+        self.logger.log_error("ファイルシステムチェックに失敗しました: %s", details)
+        self.logger.log_error("エラーコード: DISK_004")
+        self.logger.log_error("ディスク: %s", disk.device_path)
+        return FilesystemStatus(is_consistent=False, details=details)
+
+    def check_filesystems(self, disks: List[Disk]) -> Dict[str, FilesystemStatus]:
+        """複数ディスクのファイルシステムの状態を並行して検査する
+
+        検査コマンドは子プロセスで実行されるため、ディスク毎のチェックを
+        スレッドから同時に起動し、全体の所要時間を最も遅いディスク分に抑える
+
+        Args:
+            disks (List[Disk]): チェック対象のディスクリスト
+
+        Returns:
+            Dict[str, FilesystemStatus]: デバイスパスをキーとした検査結果
+        """
+        if not disks:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=len(disks)) as executor:
+            statuses = executor.map(self.check_filesystem, disks)
+            return {disk.device_path: status for disk, status in zip(disks, statuses)}
+
+    def is_rotational(self, path: str) -> bool:
+        """パスが置かれているブロックデバイスが回転型（HDD）かどうかを判定する
+
+        Args:
+            path (str): 判定するファイルまたはディレクトリのパス
+
+        Returns:
+            bool: HDDの場合はTrue。判定できない場合はFalse
+        """
+        try:
+            st_dev = os.stat(path).st_dev
+        except OSError:
+            return False
+        block_dir = os.path.realpath(
+            os.path.join(
+                _SYSFS_DEV_BLOCK_PATH, f"{os.major(st_dev)}:{os.minor(st_dev)}"
+            )
+        )
+        if os.path.exists(os.path.join(block_dir, "partition")):
+            block_dir = os.path.dirname(block_dir)
+        return self._read_sysfs_attribute(block_dir, "queue/rotational") == "1"
+
+    def get_disk_info(
+        self,
+        disk: Disk,
+        refresh: bool = False,
+        lsblk_cache: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> DiskInfo:
         """指定されたディスクの詳細情報を取得する
 
+        取得結果はデバイス毎に短時間キャッシュし、sysfsのstatファイルの内容
+        （I/O統計）が変わらない限りsmartctlなどのコマンドを再実行しない
+
         Args:
             disk (Disk): 対象のディスク
+            refresh (bool): キャッシュを使用せずに再取得するかどうか
+            lsblk_cache (Optional[Dict[str, Dict[str, Any]]]): refresh_lsblk_cacheで
+                取得済みのlsblkの出力。省略時は保持している出力を使用する
 
         Returns:
             DiskInfo: ディスクの詳細情報
         """
-        # lsblkコマンドを実行してモデル名とシリアル番号を取得
+        stat = self._read_sysfs_stat(disk.device_path)
+        now = time.monotonic()
+        cached = self._info_cache.get(disk.device_path)
+        if not refresh and cached is not None:
+            cached_at, cached_stat, cached_info = cached
+            if now - cached_at < _INFO_CACHE_TTL and cached_stat == stat:
+                return cached_info
+
+        disk_info = self._query_disk_info(disk, lsblk_cache)
+        self._info_cache[disk.device_path] = (now, stat, disk_info)
+        return disk_info
+
+    def detect_and_enrich(
+        self, max_workers: int = _INFO_MAX_WORKERS
+    ) -> List[Tuple[Disk, DiskInfo]]:
+        """ディスクを検出し、各ディスクの詳細情報を並行して取得する
+
+        lsblkの出力は1回だけ取得して全ディスクで共有し、smartctlは
+        refresh_smart_cacheで全ディスク分を同時に先読みする。
+        並行取得で失敗したディスクは順に再取得する
+
+        Args:
+            max_workers (int): 同時に取得するディスク数の上限
+
+        Returns:
+            List[Tuple[Disk, DiskInfo]]: 検出されたディスクと詳細情報の組
+        """
+        disks = self.detect_disks()
+        if not disks:
+            return []
+
+        try:
+            lsblk_cache: Optional[Dict[str, Dict[str, Any]]] = (
+                self.refresh_lsblk_cache()
+            )
+        except (subprocess.CalledProcessError, OSError, ValueError) as e:
+            self.logger.log_error("ディスク情報の取得に失敗しました: %s", e)
+            self.logger.log_error("エラーコード: DISK_006")
+            lsblk_cache = None
+        try:
+            self.refresh_smart_cache(max_workers)
+        except (OSError, ValueError) as e:
+            # 先読みできなかったディスクは詳細情報の取得時にsmartctlを実行する
+            self.logger.log_error("SMARTステータスの取得に失敗しました: %s", e)
+
+        def enrich(disk: Disk) -> Optional[DiskInfo]:
+            try:
+                return self.get_disk_info(disk, lsblk_cache=lsblk_cache)
+            except Exception as e:
+                self.logger.log_error(
+                    "ディスク情報の並行取得に失敗しました: %s: %s", disk.device_path, e
+                )
+                return None
+
+        try:
+            with ThreadPoolExecutor(
+                max_workers=max(1, min(max_workers, len(disks)))
+            ) as executor:
+                infos = list(executor.map(enrich, disks))
+        finally:
+            self._smart_cache = {}
+
+        results = []
+        for disk, disk_info in zip(disks, infos):
+            if disk_info is None:
+                try:
+                    disk_info = self.get_disk_info(disk, refresh=True)
+                except Exception as e:
+                    self.logger.log_error("ディスク情報の取得に失敗しました: %s", e)
+                    self.logger.log_error("エラーコード: DISK_006")
+                    self.logger.log_error("ディスク: %s", disk.device_path)
+                    disk_info = DiskInfo(_UNKNOWN, _UNKNOWN, _UNKNOWN, {})
+            results.append((disk, disk_info))
+        return results
+
+    def refresh_lsblk_cache(self) -> Dict[str, Dict[str, Any]]:
+        """全ブロックデバイスの全列をlsblkの1回の実行で取得して保持する
+
+        Returns:
+            Dict[str, Dict[str, Any]]: デバイスパスをキーとしたlsblkの出力
+        """
         output = subprocess.check_output(
-            ["lsblk", "-dno", "MODEL,SERIAL", disk.device_path],
-            universal_newlines=True,
+            _LSBLK_ALL_COLUMNS_COMMAND, **_spawn_options("lsblk")
+        )
+        lsblk_cache: Dict[str, Dict[str, Any]] = {}
+        self._index_lsblk_devices(
+            _loads_json(output).get("blockdevices", []), lsblk_cache
         )
-        model, serial = output.strip().split(" ")
+        self._lsblk_cache = lsblk_cache
+        return lsblk_cache
 
-        # blkidコマンドを実行してパーティションテーブルの種類を取得
-        output = subprocess.check_output(
-            ["blkid", "-o", "value", "-s", "PTTYPE", disk.device_path],
-            universal_newlines=True,
+    def refresh_smart_cache(
+        self, max_workers: int = _INFO_MAX_WORKERS
+    ) -> Dict[str, Dict[str, Any]]:
+        """smartctl --scan-openで列挙した全ディスクのSMART情報を並行して先読みする
+
+        列挙時に判明したデバイスの種類（USB変換アダプタのsatなど）を指定して
+        smartctlを実行する。先読みした出力はget_disk_infoで使用する
+
+        Args:
+            max_workers (int): 同時に実行するsmartctlの数の上限
+
+        Returns:
+            Dict[str, Dict[str, Any]]: デバイスパスをキーとしたsmartctlの出力
+        """
+        try:
+            output = subprocess.check_output(
+                _SMARTCTL_SCAN_COMMAND, **_spawn_options("smartctl")
+            )
+        except subprocess.CalledProcessError as e:
+            # 開けないデバイスがあると0以外で終了するが、列挙結果は出力される
+            output = e.output
+        scan = _loads_json(output) if output else {}
+        devices = [
+            (device["name"], device.get("type"))
+            for device in (scan.get("devices") or [])
+            if device.get("name")
+        ]
+        if not devices:
+            self._smart_cache = {}
+            return {}
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(devices)))
+        ) as executor:
+            reports = executor.map(
+                lambda device: self._query_smart_report(*device), devices
+            )
+            smart_cache = {
+                name: report for (name, _), report in zip(devices, reports) if report
+            }
+        self._smart_cache = smart_cache
+        return smart_cache
+
+    def _index_lsblk_devices(
+        self, devices: List[Dict[str, Any]], lsblk_cache: Dict[str, Dict[str, Any]]
+    ) -> None:
+        """lsblkの入れ子になったデバイス一覧をデバイスパスで引けるよう登録する
+
+        Args:
+            devices (List[Dict[str, Any]]): lsblkのデバイス一覧
+            lsblk_cache (Dict[str, Dict[str, Any]]): 登録先
+        """
+        for device in devices:
+            path = device.get("path") or f"/dev/{device.get('name', '')}"
+            lsblk_cache[path] = device
+            self._index_lsblk_devices(device.get("children", []), lsblk_cache)
+
+    def _lsblk_entry(
+        self, device_path: str, lsblk_cache: Optional[Dict[str, Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """デバイスのlsblkの出力を取得する
+
+        保持している出力にデバイスが含まれない場合はlsblkを再実行する
+
+        Args:
+            device_path (str): デバイスパス
+            lsblk_cache (Optional[Dict[str, Dict[str, Any]]]): 取得済みのlsblkの出力
+
+        Returns:
+            Dict[str, Any]: lsblkの出力。取得できない場合は空の辞書
+        """
+        if lsblk_cache is None:
+            lsblk_cache = self._lsblk_cache
+        if lsblk_cache is None or device_path not in lsblk_cache:
+            try:
+                lsblk_cache = self.refresh_lsblk_cache()
+            except (subprocess.CalledProcessError, OSError, ValueError) as e:
+                self.logger.log_error("ディスク情報の取得に失敗しました: %s", e)
+                self.logger.log_error("エラーコード: DISK_006")
+                return {}
+        return lsblk_cache.get(device_path, {})
+
+    def _query_disk_info(
+        self,
+        disk: Disk,
+        lsblk_cache: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> DiskInfo:
+        """lsblk・smartctlとsysfsからディスクの詳細情報を取得する
+
+        Args:
+            disk (Disk): 対象のディスク
+            lsblk_cache (Optional[Dict[str, Dict[str, Any]]]): 取得済みのlsblkの出力
+
+        Returns:
+            DiskInfo: ディスクの詳細情報
+        """
+        entry = self._lsblk_entry(disk.device_path, lsblk_cache)
+        # 先読みした出力があれば使用する（パーティションは親ディスクの出力を使用）
+        smart_report = self._smart_cache.get(disk.device_path)
+        if smart_report is None and entry.get("pkname"):
+            smart_report = self._smart_cache.get(f"/dev/{entry['pkname']}")
+        if smart_report is None:
+            smart_report = self._query_smart_report(disk.device_path)
+
+        # sysfsからモデル名とシリアル番号を取得し、取得できない場合はlsblkの出力、
+        # smartctlの出力の順に使用（パーティションのモデル名等は親ディスクの出力から取得する）
+        sysfs_info = self._read_sysfs_identity(disk.device_path)
+        if sysfs_info is not None:
+            model, serial = sysfs_info
+        else:
+            identity = entry
+            if not identity.get("model") and entry.get("pkname"):
+                identity = self._lsblk_entry(f"/dev/{entry['pkname']}", lsblk_cache)
+            model = identity.get("model") or smart_report.get("model_name") or _UNKNOWN
+            serial = (
+                identity.get("serial") or smart_report.get("serial_number") or _UNKNOWN
+            )
+
+        # パーティションテーブルの種類もlsblkの出力に含まれるためblkidは実行しない
+        partition_table = entry.get("pttype") or _UNKNOWN
+
+        return DiskInfo(
+            model, serial, partition_table, self._smart_status(disk, smart_report)
         )
-        partition_table = output.strip()
 
-        # smartctlコマンドを実行してSMARTステータス情報を取得
+    def _query_smart_report(
+        self, device_path: str, device_type: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """smartctlのJSON出力を取得する
+
+        smartctlは警告があると0以外で終了するが、その場合も出力を解析する
+
+        Args:
+            device_path (str): 対象のデバイスパス
+            device_type (Optional[str]): smartctlの-dに指定するデバイスの種類
+
+        Returns:
+            Dict[str, Any]: smartctlの出力。取得できない場合は空の辞書
+        """
+        command = ["smartctl", *_SMARTCTL_INFO_OPTIONS]
+        if device_type:
+            command += ["-d", device_type]
         try:
             output = subprocess.check_output(
-                ["smartctl", "-i", "-H", "-c", "-A", disk.device_path],
-                stderr=subprocess.STDOUT,
-                universal_newlines=True,
+                [*command, device_path], **_spawn_options("smartctl")
             )
-            smart_status = self._parse_smart_status(output)
         except subprocess.CalledProcessError as e:
-            self.logger.log_error(f"SMARTステータスの取得に失敗しました: {e.output}")
-            self.logger.log_error(f"エラーコード: DISK_006")
-            self.logger.log_error(f"ディスク: {disk.device_path}")
-            smart_status = {}
+            output = e.output
+        except OSError as e:
+            output = None
+            self.logger.log_error("SMARTステータスの取得に失敗しました: %s", e)
 
-        return DiskInfo(model, serial, partition_table, smart_status)
+        try:
+            report = _loads_json(output) if output else None
+        except ValueError:
+            report = None
+        return report if isinstance(report, dict) else {}
 
-    def _parse_smart_status(self, output: str) -> dict:
-        """smartctlコマンドの出力からSMARTステータス情報を解析する
+    def _smart_status(self, disk: Disk, smart_report: Dict[str, Any]) -> dict:
+        """smartctlの出力からSMARTステータス情報を作成する
+
+        総合判定（smart_status）に、ATA属性の表を属性名と生の値の対応として加える
 
         Args:
-            output (str): smartctlコマンドの出力
+            disk (Disk): 対象のディスク
+            smart_report (Dict[str, Any]): smartctlの出力
 
         Returns:
-            dict: SMARTステータス情報
+            dict: SMARTステータス情報。取得できない場合は空の辞書
         """
-        smart_status = {}
+        smart_status = smart_report.get("smart_status")
+        if not isinstance(smart_status, dict):
+            self.logger.log_error(
+                "SMARTステータスの取得に失敗しました: %s", smart_report or None
+            )
+            self.logger.log_error("エラーコード: DISK_006")
+            self.logger.log_error("ディスク: %s", disk.device_path)
+            return {}
+
+        table = (smart_report.get("ata_smart_attributes") or {}).get("table")
+        if not table:
+            return smart_status
+        return {
+            **smart_status,
+            "attributes": {
+                attribute["name"]: attribute.get("raw", {}).get("value")
+                for attribute in table
+                if "name" in attribute
+            },
+        }
+
+    def _read_sysfs_stat(self, device_path: str) -> str:
+        """sysfsのstatファイル（I/O統計）の内容を読み込む
+
+        statファイルの更新時刻は変化しないため、内容を比較に使用する
+
+        Args:
+            device_path (str): デバイスパス
+
+        Returns:
+            str: statファイルの内容。取得できない場合は空文字
+        """
+        try:
+            with open(
+                os.path.join(_SYSFS_BLOCK_PATH, os.path.basename(device_path), "stat")
+            ) as f:
+                return f.read()
+        except OSError:
+            return ""
+
+    def _read_sysfs_identity(self, device_path: str) -> Optional[Tuple[str, str]]:
+        """sysfsからディスクのモデル名とシリアル番号を読み込む
+
+        パーティションが指定された場合は親ディスクの属性を参照する
+
+        Args:
+            device_path (str): デバイスパス（例: "/dev/sda1"）
 
-        for line in output.split("\n"):
-            if ":" in line:
-                key, value = line.split(":", 1)
-                smart_status[key.strip()] = value.strip()
+        Returns:
+            Optional[Tuple[str, str]]: モデル名とシリアル番号。
+                どちらかが取得できない場合はNone
+        """
+        block_dir = os.path.realpath(
+            os.path.join(_SYSFS_BLOCK_PATH, os.path.basename(device_path))
+        )
+        if os.path.exists(os.path.join(block_dir, "partition")):
+            block_dir = os.path.dirname(block_dir)
+
+        model = self._read_sysfs_attribute(block_dir, "device/model")
+        if model is None:
+            return None
+
+        for attribute in _SYSFS_SERIAL_ATTRIBUTES:
+            serial = self._read_sysfs_attribute(block_dir, attribute)
+            if serial is not None:
+                return model, serial
+        return None
+
+    def _read_sysfs_attribute(self, block_dir: str, attribute: str) -> Optional[str]:
+        """sysfsの属性ファイルを1回の読み込みで取得する
 
-        return smart_status
+        Args:
+            block_dir (str): ブロックデバイスのsysfsディレクトリ
+            attribute (str): 属性ファイルの相対パス
+
+        Returns:
+            Optional[str]: 属性値。存在しないか空の場合はNone
+        """
+        try:
+            with open(os.path.join(block_dir, attribute), encoding="utf-8") as f:
+                value = f.read().strip()
+        except (OSError, UnicodeDecodeError):
+            return None
+        return value or None
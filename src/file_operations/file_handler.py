@@ -6,11 +6,40 @@ JSDoc: ファイル操作モジュール
 """
 
 import os
+import errno
+import functools
 import shutil
-from typing import List, Any
-from ..utils.logger import Logger
+import stat
+import hashlib
+import struct
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple
+from ..utils.logger import logger
 from datetime import datetime
 
+try:
+    import blake3
+except ImportError:  # blake3は任意依存のため、未導入時はSHA-256を使用する
+    blake3 = None
+
+try:
+    import xxhash
+except ImportError:  # xxhashは任意依存のため、未導入時はSHA-256を使用する
+    xxhash = None
+
+try:
+    import pwd
+except ImportError:  # Windowsではpwdが存在しないため、実行ユーザー名を使用する
+    pwd = None
+
+try:
+    import fcntl
+except ImportError:  # Windowsではfcntlが存在しないため、msvcrtでロックを確認する
+    fcntl = None
+
 
 class File:
     """ファイル情報を表すクラス
@@ -23,6 +52,8 @@ class File:
         is_corrupted (bool): 破損状態
     """
 
+    __slots__ = ("path", "size", "attributes", "status", "is_corrupted")
+
     def __init__(
         self, path: str, size: int, attributes: Any, status: str, is_corrupted: bool
     ) -> None:
@@ -44,6 +75,8 @@ class FileAttributes:
         is_hidden (bool): 隠しファイルかどうか
     """
 
+    __slots__ = ("creation_time", "modified_time", "permissions", "owner", "is_hidden")
+
     def __init__(
         self,
         creation_time: str,
@@ -67,6 +100,8 @@ class FileError:
         message (str): エラーメッセージ
     """
 
+    __slots__ = ("error_code", "message")
+
     def __init__(self, error_code: int, message: str) -> None:
         self.error_code = error_code
         self.message = message
@@ -80,115 +115,666 @@ FILE_004 = 4
 FILE_005 = 5
 FILE_006 = 6
 
+# Windows環境かどうか
+_IS_WINDOWS = os.name == "nt"
+
+# ディレクトリ走査に使用するスレッドの最大数
+_WALK_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# 同時に実行するファイルコピーの最大数
+_COPY_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# 破損チェックで同時に読み込むファイルの最大数
+_SCAN_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# 破損チェックで1回に読み込むバイト数
+_SCAN_CHUNK_SIZE = 1024 * 1024
+
+# 一般的なファイル形式のマジックナンバー
+# 登録済みの形式は先頭3バイトで一意に決まるため、先頭3バイトをキーとして
+# (ファイル形式, 照合するマジックナンバー) を引く
+_MAGIC_NUMBERS = {
+    b"\x89PN": ("PNG", b"\x89PNG\r\n\x1a\n"),
+    b"\xFF\xD8\xFF": ("JPEG", b"\xFF\xD8\xFF"),
+    b"GIF": ("GIF", (b"GIF87a", b"GIF89a")),
+    b"%PD": ("PDF", b"%PDF"),
+    b"PK\x03": ("ZIP", b"PK\x03\x04"),
+    b"PK\x05": ("ZIP", b"\x50\x4B\x05\x06"),
+    b"PK\x07": ("ZIP", b"\x50\x4B\x07\x08"),
+}
+
+# ファイル形式ごとに期待される拡張子
+_EXPECTED_EXTENSIONS = {
+    "PNG": ".png",
+    "JPEG": [".jpg", ".jpeg"],
+    "GIF": ".gif",
+    "PDF": ".pdf",
+    "ZIP": ".zip",
+}
+
+# アクセス日時を更新せずに開くためのフラグ（Linux以外では0）
+_O_NOATIME = getattr(os, "O_NOATIME", 0)
+
+# FS_IOC_FIEMAPによるエクステント取得の定義（linux/fiemap.h）
+_FS_IOC_FIEMAP = 0xC020660B
+_FIEMAP_HEADER = struct.Struct("=QQIIII")
+_FIEMAP_EXTENT = struct.Struct("=QQQ16xI12x")
+_FIEMAP_MAX_LENGTH = 0xFFFFFFFFFFFFFFFF
+_FIEMAP_MAX_EXTENTS = 64
+_FIEMAP_FLAG_SYNC = 0x1
+_FIEMAP_EXTENT_LAST = 0x1
+_FIEMAP_EXTENT_SHARED = 0x2000
+# 物理位置が確定していない、またはデータが変換されているエクステントのフラグ
+# （UNKNOWN、DELALLOC、ENCODED、NOT_ALIGNED、DATA_INLINE）
+_FIEMAP_EXTENT_UNSTABLE = 0x2 | 0x4 | 0x8 | 0x100 | 0x200
+
+# 進捗ログを記録するファイル数の間隔
+_LOG_BATCH_SIZE = 1000
+
+# 所有者名のキャッシュの最大件数
+_OWNER_CACHE_SIZE = 512
+
+# カーネル内コピー1回あたりの最大バイト数
+_KERNEL_COPY_CHUNK = 1 << 30
+
+# ファイル全体を共有エクステントとして複製するioctl（linux/fs.h）
+_FICLONE = 0x40049409
+
+# FICLONEが使用できない場合（別ファイルシステム、CoW非対応など）に通常のコピーへ切り替えるエラー番号
+_CLONE_FALLBACK_ERRNOS = (
+    errno.EXDEV,
+    errno.EOPNOTSUPP,
+    errno.EINVAL,
+    errno.ENOTTY,
+    errno.ENOSYS,
+)
+
+# copy_file_rangeが使用できない場合にsendfileへ切り替えるエラー番号
+_COPY_RANGE_FALLBACK_ERRNOS = (
+    errno.EXDEV,
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.EOPNOTSUPP,
+)
+
+# 拡張属性の複製で無視するエラー番号（コピー先が拡張属性に非対応の場合など）
+_XATTR_IGNORED_ERRNOS = (
+    errno.EPERM,
+    errno.EACCES,
+    errno.ENOTSUP,
+    errno.ENODATA,
+    errno.EINVAL,
+)
+
+# 走査結果を再利用するディレクトリの最小経過時間（ナノ秒）
+# （タイムスタンプの粒度内の変更を見逃さないよう、更新直後のディレクトリは保持しない）
+_SCAN_CACHE_MIN_AGE_NS = 1_000_000_000
+# 走査結果を保持するエントリ（ファイルとサブディレクトリ）の合計数の上限
+# （超えた分は古く保持したディレクトリから破棄する）
+_SCAN_CACHE_MAX_ENTRIES = 500_000
+
+# カーネル内コピーが使用できない場合にコピーへ使うバッファのバイト数
+_COPY_BUFFER_SIZE = 4 * 1024 * 1024
+
+# コピー検証に使用する既定のハッシュアルゴリズム
+_DEFAULT_HASH_ALGO = "blake3"
+# blake3・xxhashが未導入の場合に代わりに使用するハッシュアルゴリズム
+_FALLBACK_HASH_ALGO = "sha256"
+# ハッシュ値の計算でファイルを読み込み、ハッシュへ渡す1回あたりのバイト数
+_HASH_WINDOW_SIZE = 4 * 1024 * 1024
+
+# コピー検証の読み込み方法（"cached": ページキャッシュを使用、"ondisk": ディスクから再読み込み）
+_VERIFY_MODES = ("cached", "ondisk")
+
+# 簡易検証でファイルの先頭・末尾からそれぞれハッシュ値の計算に使うバイト数
+_VERIFY_SAMPLE_SIZE = 1024 * 1024
+
+
+@functools.lru_cache(maxsize=_OWNER_CACHE_SIZE)
+def _owner_name(uid: int) -> str:
+    """
+    ユーザーIDから所有者名を取得する（同じユーザーIDの問い合わせはキャッシュする）
+
+    Args:
+        uid (int): ユーザーID
+
+    Returns:
+        str: 所有者名。該当するユーザーが存在しない場合はユーザーID
+    """
+    if pwd is None:
+        import getpass
+
+        return getpass.getuser()
+    try:
+        return pwd.getpwuid(uid).pw_name
+    except KeyError:
+        # サルベージ対象のディスクでは、このシステムに存在しないユーザーIDが多い
+        return str(uid)
+
+
+def destination_paths(files: List[File], destination: str) -> List[str]:
+    """
+    コピー先ディレクトリ内での各ファイルのコピー先パスを決める
+
+    別々のディレクトリにある同名のファイルが同じパスへ書き込まれないよう、
+    2つ目以降は "名前 (1).拡張子" のように番号を付けた名前にする
+
+    Args:
+        files (List[File]): コピー対象のファイルリスト
+        destination (str): コピー先パス
+
+    Returns:
+        List[str]: filesと同じ順序のコピー先パス
+    """
+    used = {os.path.basename(file.path) for file in files}
+    assigned = set()
+    paths = []
+    for file in files:
+        filename = os.path.basename(file.path)
+        if filename in assigned:
+            stem, ext = os.path.splitext(filename)
+            number = 1
+            while f"{stem} ({number}){ext}" in used:
+                number += 1
+            filename = f"{stem} ({number}){ext}"
+            used.add(filename)
+        assigned.add(filename)
+        paths.append(os.path.join(destination, filename))
+    return paths
+
 
 class FileHandler:
     """ファイル操作を管理するクラス
 
     Methods:
         list_files(path: str) -> List[File]
+        clear_scan_cache() -> None
         copy_files(files: List[File], destination: str) -> bool
-        verify_copy(source: str, destination: str) -> bool
+        verify_copy(source: str, destination: str, strict: bool = True,
+                    verify_mode: str = "cached") -> bool
+        copy_and_verify(file: File, destination: str,
+                        dest_path: Optional[str] = None) -> bool
+        find_duplicates(files: List[File]) -> List[List[File]]
         get_file_attributes(file: File) -> FileAttributes
-        check_file_accessibility(file: File) -> bool
-        handle_corrupted_files(files: List[File]) -> List[FileError]
+        check_file_accessibility(file: File, strict: bool = False) -> bool
+        handle_corrupted_files(files: List[File], deep: bool = False) -> List[FileError]
     """
 
-    def __init__(self):
-        self.logger = Logger()
+    def __init__(self, hash_algo: str = _DEFAULT_HASH_ALGO) -> None:
+        """
+        Args:
+            hash_algo (str): コピー検証に使用するハッシュアルゴリズム。
+                "blake3"、非暗号学的ハッシュの"xxh3_128"の他、hashlibで利用可能な
+                名前（"md5"、"sha256"など）を指定できる。
+                blake3・xxhashが未導入の場合はSHA-256を使用する
+
+        Raises:
+            ValueError: 利用できないハッシュアルゴリズムが指定された場合
+        """
+        self.logger = logger
+        if (hash_algo == "blake3" and blake3 is None) or (
+            hash_algo == "xxh3_128" and xxhash is None
+        ):
+            hash_algo = _FALLBACK_HASH_ALGO
+        if (
+            hash_algo not in ("blake3", "xxh3_128")
+            and hash_algo not in hashlib.algorithms_available
+        ):
+            raise ValueError(f"利用できないハッシュアルゴリズムです: {hash_algo}")
+        self.hash_algo = hash_algo
+        # カーネルがcopy_file_rangeに非対応（ENOSYS）と分かった後は呼び出さない
+        self._use_copy_file_range = hasattr(os, "copy_file_range")
+        # スレッド毎に再利用するコピー用バッファ
+        self._local = threading.local()
+        # ディレクトリのパス -> ((デバイス番号, inode番号, 更新時刻), ファイルパス一覧, サブディレクトリ一覧)
+        self._scan_cache: Dict[
+            str, Tuple[Tuple[int, int, int], List[str], List[str]]
+        ] = {}
+        # 保持している走査結果のエントリ数の合計と、その更新を保護するロック
+        self._scan_cache_entries = 0
+        self._scan_cache_lock = threading.Lock()
+
+    def clear_scan_cache(self) -> None:
+        """
+        保持しているディレクトリの走査結果を全て破棄する
+
+        マウント・アンマウントでディレクトリの内容が入れ替わった時に呼び出し、
+        以前のディスクの走査結果をメモリに残さないようにする
+        """
+        with self._scan_cache_lock:
+            self._scan_cache.clear()
+            self._scan_cache_entries = 0
+
+    def _store_scan_result(
+        self,
+        path: str,
+        key: Tuple[int, int, int],
+        file_paths: List[str],
+        subdirs: List[str],
+    ) -> None:
+        """
+        ディレクトリの走査結果を保持し、上限を超えた分を古いものから破棄する
 
-    def list_files(self, path: str) -> List[File]:
+        Args:
+            path (str): 走査したディレクトリのパス
+            key (Tuple[int, int, int]): (デバイス番号, inode番号, 更新時刻)
+            file_paths (List[str]): ファイルパスの一覧
+            subdirs (List[str]): サブディレクトリの一覧
+        """
+        size = len(file_paths) + len(subdirs)
+        if size > _SCAN_CACHE_MAX_ENTRIES:
+            return
+        with self._scan_cache_lock:
+            previous = self._scan_cache.pop(path, None)
+            if previous is not None:
+                self._scan_cache_entries -= len(previous[1]) + len(previous[2])
+            self._scan_cache[path] = (key, file_paths, subdirs)
+            self._scan_cache_entries += size
+            while self._scan_cache_entries > _SCAN_CACHE_MAX_ENTRIES:
+                # dictは挿入順を保つため、先頭が最も古く保持した走査結果になる
+                _, old_file_paths, old_subdirs = self._scan_cache.pop(
+                    next(iter(self._scan_cache))
+                )
+                self._scan_cache_entries -= len(old_file_paths) + len(old_subdirs)
+
+    def list_files(self, path: str, parallel: bool = True) -> List[File]:
         """
         指定されたパスのファイル・ディレクトリ一覧を取得する
 
         Args:
             path (str): 対象パス
+            parallel (bool): サブディレクトリをスレッドプールで並行して走査するかどうか。
+                Falseの場合は呼び出し元のスレッドで順に走査する
 
         Returns:
             List[File]: ファイル情報の一覧
         """
         files = []
         try:
-            self.logger.log_info(f"{path} のファイル一覧を取得中...")
+            self.logger.log_info("%s のファイル一覧を取得中...", path)
 
             # パスの存在確認
             if not os.path.exists(path):
                 raise FileNotFoundError(f"指定されたパス {path} が見つかりません")
 
             # ファイル一覧を再帰的に取得
-            for root, _, filenames in os.walk(path):
-                for filename in filenames:
-                    file_path = os.path.join(root, filename)
-                    try:
-                        # ファイルの基本情報を取得
-                        file_size = os.path.getsize(file_path)
-
-                        # Fileオブジェクトを作成
-                        file = File(
-                            path=file_path,
-                            size=file_size,
-                            attributes=None,  # 属性は後で取得
-                            status="normal",
-                            is_corrupted=False,
-                        )
-                        files.append(file)
-
-                    except OSError as e:
-                        self.logger.log_warning(
-                            f"ファイル {file_path} の情報取得に失敗: {e}"
-                        )
-                        continue
+            append = files.append
+            for file_path, stat_info in self._walk(path, parallel):
+                # 走査時に取得したstat情報から属性も同時に作成する
+                append(
+                    File(
+                        path=file_path,
+                        size=stat_info.st_size,
+                        attributes=self._attributes_from_stat(file_path, stat_info),
+                        status="normal",
+                        is_corrupted=False,
+                    )
+                )
 
-            self.logger.log_info(f"{len(files)} 個のファイルを検出しました")
+            self.logger.log_info("%s 個のファイルを検出しました", len(files))
             return files
 
         except Exception as e:
-            self.logger.log_error(f"ファイル一覧の取得に失敗しました: {e}")
-            self.logger.log_error(f"エラーコード: FILE_001")
-            self.logger.log_error(f"パス: {path}")
+            self.logger.log_error("ファイル一覧の取得に失敗しました: %s", e)
+            self.logger.log_error("エラーコード: FILE_001")
+            self.logger.log_error("パス: %s", path)
             return []
 
-    def copy_files(self, files: List[File], destination: str) -> bool:
+    def _walk(
+        self, path: str, parallel: bool = True
+    ) -> Iterator[Tuple[str, os.stat_result]]:
+        """
+        ディレクトリを再帰的に走査し、ファイルのパスとstat情報を返す
+
+        サブディレクトリの走査はスレッドプールで並行して行う
+
+        Args:
+            path (str): 走査するディレクトリのパス
+            parallel (bool): 並行して走査するかどうか
+
+        Yields:
+            Tuple[str, os.stat_result]: ファイルパスとstat情報
+        """
+        if not parallel:
+            stack = [path]
+            while stack:
+                entries, subdirs = self._scan_dir(stack.pop())
+                stack.extend(subdirs)
+                yield from entries
+            return
+
+        with ThreadPoolExecutor(max_workers=_WALK_MAX_WORKERS) as executor:
+            pending = {executor.submit(self._scan_dir, path)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    entries, subdirs = future.result()
+                    for subdir in subdirs:
+                        pending.add(executor.submit(self._scan_dir, subdir))
+                    yield from entries
+
+    def _scan_dir(
+        self, path: str
+    ) -> Tuple[List[Tuple[str, os.stat_result]], List[str]]:
+        """
+        os.scandirで1つのディレクトリを走査する
+
+        DirEntryがキャッシュするファイル種別で分岐し、stat情報は通常ファイルのみ取得する。
+        シンボリックリンクやデバイス・FIFOなど通常ファイル以外は一覧に含めない。
+        ディレクトリの更新時刻が前回の走査から変わっていなければ、前回のファイル・
+        サブディレクトリの一覧を再利用し、ファイルのstat情報のみlstatで取得し直す
+        （ファイルの追加・削除・名前の変更はディレクトリの更新時刻を変えるが、
+        ファイルの内容の書き換えは変えないため、サイズや更新時刻は保持しない）
+
+        Args:
+            path (str): 走査するディレクトリのパス
+
+        Returns:
+            Tuple[List[Tuple[str, os.stat_result]], List[str]]:
+                (ファイルパス, stat情報)の一覧とサブディレクトリの一覧
+        """
+        entries = []
+        subdirs = []
+        complete = True
+        log_warning = self.logger.log_warning
+        try:
+            dir_stat = os.stat(path)
+            key = (dir_stat.st_dev, dir_stat.st_ino, dir_stat.st_mtime_ns)
+            cached = self._scan_cache.get(path)
+            if cached is not None and cached[0] == key:
+                return self._stat_files(cached[1]), cached[2]
+
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            entries.append(
+                                (entry.path, entry.stat(follow_symlinks=False))
+                            )
+                    except OSError as e:
+                        complete = False
+                        log_warning("ファイル %s の情報取得に失敗: %s", entry.path, e)
+        except OSError as e:
+            log_warning("ディレクトリ %s の走査に失敗: %s", path, e)
+            return entries, subdirs
+
+        # 一部の情報を取得できなかった場合は、次回の走査で再取得する
+        if complete and time.time_ns() - dir_stat.st_mtime_ns >= _SCAN_CACHE_MIN_AGE_NS:
+            self._store_scan_result(
+                path, key, [file_path for file_path, _ in entries], subdirs
+            )
+        return entries, subdirs
+
+    def _stat_files(self, file_paths: List[str]) -> List[Tuple[str, os.stat_result]]:
+        """
+        保持しているファイルパスのstat情報を取得し直す
+
+        取得できなかったファイルや通常ファイルでなくなったものは一覧に含めない
+
+        Args:
+            file_paths (List[str]): ファイルパスの一覧
+
+        Returns:
+            List[Tuple[str, os.stat_result]]: (ファイルパス, stat情報)の一覧
+        """
+        entries = []
+        for file_path in file_paths:
+            try:
+                stat_info = os.lstat(file_path)
+            except OSError as e:
+                self.logger.log_warning(
+                    "ファイル %s の情報取得に失敗: %s", file_path, e
+                )
+                continue
+            if stat.S_ISREG(stat_info.st_mode):
+                entries.append((file_path, stat_info))
+        return entries
+
+    def copy_files(
+        self,
+        files: List[File],
+        destination: str,
+        progress_cb: Optional[Callable[[File, Optional[Exception]], None]] = None,
+        max_workers: Optional[int] = None,
+    ) -> bool:
         """
         指定されたファイルを指定先にコピーする
 
         Args:
             files (List[File]): コピー対象のファイルリスト
             destination (str): コピー先パス
+            progress_cb (Optional[Callable[[File, Optional[Exception]], None]]):
+                ファイル毎のコピー完了時に、コピーを行ったワーカースレッドから
+                ファイルと発生した例外（成功時はNone）を渡して呼び出す関数
+            max_workers (Optional[int]): 同時にコピーするファイル数の上限
+
+        コピー先のファイル名はdestination_pathsで決め、同名のファイルには番号を付ける
 
         Returns:
             bool: コピー成功の有無
         """
         try:
-            for file in files:
-                # ファイル名を取得
-                filename = os.path.basename(file.path)
-                dest_path = os.path.join(destination, filename)
-
-                # ファイルをコピー
-                shutil.copy2(file.path, dest_path)
-            self.logger.log_info(f"{destination} へのファイルコピーが完了しました")
+            os.makedirs(destination, exist_ok=True)
+
+            # 複数ファイルのコピーを同時に実行し、ファイル毎の待ち時間を重ね合わせる
+            max_workers = max(
+                1, min(max_workers or _COPY_MAX_WORKERS, _COPY_MAX_WORKERS, len(files))
+            )
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(self._copy_one, file, dest_path, progress_cb)
+                    for file, dest_path in zip(
+                        files, destination_paths(files, destination)
+                    )
+                ]
+                errors = [future.exception() for future in futures]
+            error = next((e for e in errors if e is not None), None)
+            if error is not None:
+                raise error
+            self.logger.log_info("%s へのファイルコピーが完了しました", destination)
             return True
         except Exception as e:
-            self.logger.log_error(f"ファイルコピー中にエラーが発生しました: {e}")
-            self.logger.log_error(f"エラーコード: FILE_002")
-            self.logger.log_error(f"コピー元: {[file.path for file in files]}")
-            self.logger.log_error(f"コピー先: {destination}")
+            self.logger.log_error("ファイルコピー中にエラーが発生しました: %s", e)
+            self.logger.log_error("エラーコード: FILE_002")
+            self.logger.log_error("コピー元: %s", [file.path for file in files])
+            self.logger.log_error("コピー先: %s", destination)
             return False
 
-    def verify_copy(self, source: str, destination: str) -> bool:
+    def _copy_one(
+        self,
+        file: File,
+        dest_path: str,
+        progress_cb: Optional[Callable[[File, Optional[Exception]], None]] = None,
+    ) -> None:
+        """
+        1つのファイルをコピー先パスへコピーする
+
+        Args:
+            file (File): コピー対象のファイル
+            dest_path (str): コピー先ファイルのパス
+            progress_cb (Optional[Callable[[File, Optional[Exception]], None]]):
+                コピー完了時に呼び出す関数
+        """
+        try:
+            self._fast_copy(file.path, dest_path)
+        except Exception as e:
+            if progress_cb is not None:
+                progress_cb(file, e)
+            raise
+        if progress_cb is not None:
+            progress_cb(file, None)
+
+    def _fast_copy(self, src: str, dst: str) -> None:
+        """
+        カーネル内でデータを転送してファイルをコピーする
+
+        copy_file_range、sendfileの順に試し、どちらも使用できない場合は
+        スレッド毎に再利用するバッファを介してコピーする。メタデータはパスを
+        再解決せず、開いたままのファイルディスクリプタとfstatの結果から複製する
+
+        Args:
+            src (str): コピー元ファイルのパス
+            dst (str): コピー先ファイルのパス
+        """
+        if not hasattr(os, "sendfile"):
+            self._buffered_copy(src, dst)
+            return
+
+        try:
+            src_fd = os.open(src, os.O_RDONLY)
+            try:
+                src_stat = os.fstat(src_fd)
+                dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+                try:
+                    if src_stat.st_size:
+                        self._kernel_copy(src_fd, dst_fd, src_stat.st_size)
+                    self._copy_metadata(src_fd, dst_fd, src_stat)
+                finally:
+                    os.close(dst_fd)
+            finally:
+                os.close(src_fd)
+        except OSError as e:
+            self.logger.log_warning(
+                "カーネル内コピーに失敗したため通常のコピーを行います: %s", e
+            )
+            self._buffered_copy(src, dst)
+
+    def _buffered_copy(self, src: str, dst: str) -> None:
+        """
+        スレッド毎に再利用するバッファを介してファイルをコピーする
+
+        ファイル毎にバッファを確保せず、readintoで読み込んだ分をそのまま書き込む。
+        メタデータは開いたままのファイルディスクリプタから複製し、ファイル
+        ディスクリプタを指定できない環境ではshutil.copystatで複製する
+
+        Args:
+            src (str): コピー元ファイルのパス
+            dst (str): コピー先ファイルのパス
+        """
+        buffer = getattr(self._local, "copy_buffer", None)
+        if buffer is None:
+            buffer = self._local.copy_buffer = bytearray(_COPY_BUFFER_SIZE)
+        with memoryview(buffer) as view:
+            with open(src, "rb", buffering=0) as fsrc, open(dst, "wb") as fdst:
+                while True:
+                    read_size = fsrc.readinto(buffer)
+                    if not read_size:
+                        break
+                    fdst.write(view[:read_size])
+                if os.utime in os.supports_fd:
+                    # 更新日時が書き込みで上書きされないよう、書き込みを済ませてから複製する
+                    fdst.flush()
+                    self._copy_metadata(
+                        fsrc.fileno(), fdst.fileno(), os.fstat(fsrc.fileno())
+                    )
+                    return
+        shutil.copystat(src, dst)
+
+    def _kernel_copy(self, src_fd: int, dst_fd: int, size: int) -> None:
+        """
+        ファイルディスクリプタ間でカーネル内コピーを行う
+
+        btrfs・XFSなどCoW対応のファイルシステム内のコピーでは、まずFICLONEで
+        データを複製せずにエクステントを共有するクローンを作成する
+
+        Args:
+            src_fd (int): コピー元のファイルディスクリプタ
+            dst_fd (int): コピー先のファイルディスクリプタ
+            size (int): コピーするバイト数
+        """
+        if fcntl is not None:
+            try:
+                fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+                return
+            except OSError as e:
+                if e.errno not in _CLONE_FALLBACK_ERRNOS:
+                    raise
+
+        offset = 0
+        if self._use_copy_file_range:
+            try:
+                while offset < size:
+                    copied = os.copy_file_range(
+                        src_fd, dst_fd, _KERNEL_COPY_CHUNK, offset, offset
+                    )
+                    if copied == 0:
+                        break
+                    offset += copied
+                return
+            except OSError as e:
+                # 途中まで書き込んだ場合や想定外のエラーはそのまま通知する
+                if offset or e.errno not in _COPY_RANGE_FALLBACK_ERRNOS:
+                    raise
+                if e.errno == errno.ENOSYS:
+                    self._use_copy_file_range = False
+
+        # ファイルシステムをまたぐ場合などはsendfileで転送する
+        while offset < size:
+            sent = os.sendfile(dst_fd, src_fd, offset, _KERNEL_COPY_CHUNK)
+            if sent == 0:
+                break
+            offset += sent
+
+    def _copy_metadata(
+        self, src_fd: int, dst_fd: int, src_stat: os.stat_result
+    ) -> None:
+        """
+        shutil.copystatと同じく更新日時・拡張属性・パーミッションを複製する
+
+        Args:
+            src_fd (int): コピー元のファイルディスクリプタ
+            dst_fd (int): コピー先のファイルディスクリプタ
+            src_stat (os.stat_result): コピー元のfstatの結果
+        """
+        os.utime(dst_fd, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+        if hasattr(os, "listxattr"):
+            try:
+                names = os.listxattr(src_fd)
+            except OSError as e:
+                if e.errno not in _XATTR_IGNORED_ERRNOS:
+                    raise
+                names = []
+            for name in names:
+                try:
+                    os.setxattr(dst_fd, name, os.getxattr(src_fd, name))
+                except OSError as e:
+                    if e.errno not in _XATTR_IGNORED_ERRNOS:
+                        raise
+        os.chmod(dst_fd, stat.S_IMODE(src_stat.st_mode))
+
+    def verify_copy(
+        self,
+        source: str,
+        destination: str,
+        strict: bool = True,
+        verify_mode: str = "cached",
+    ) -> bool:
         """
         コピーされたファイルの検証を行う
 
         Args:
             source (str): コピー元パス
             destination (str): コピー先パス
+            strict (bool): Falseの場合はファイル全体ではなく、先頭と末尾の
+                一部のみのハッシュ値を比較する
+            verify_mode (str): "ondisk"の場合はコピー先をディスクへ書き出して
+                ページキャッシュから破棄し、ディスク上の内容を読み込んで検証する。
+                "cached"の場合はページキャッシュに残った内容をそのまま読み込む
 
         Returns:
             bool: コピー検証結果
+
+        Raises:
+            ValueError: 不明な検証方法が指定された場合
         """
+        if verify_mode not in _VERIFY_MODES:
+            raise ValueError(f"不明な検証方法です: {verify_mode}")
+
         try:
-            self.logger.log_info(
-                f"{source} から {destination} へのコピー検証を実施中..."
+            self.logger.log_debug(
+                "%s から %s へのコピー検証を実施中...", source, destination
             )
 
             # ファイルの存在確認
@@ -200,125 +786,448 @@ class FileHandler:
                 )
 
             # ファイルサイズの比較
-            source_size = os.path.getsize(source)
-            dest_size = os.path.getsize(destination)
+            source_stat = os.stat(source)
+            dest_stat = os.stat(destination)
+            source_size = source_stat.st_size
+            dest_size = dest_stat.st_size
 
             if source_size != dest_size:
-                self.logger.log_error(f"ファイルサイズが一致しません")
-                self.logger.log_error(f"コピー元: {source_size} bytes")
-                self.logger.log_error(f"コピー先: {dest_size} bytes")
+                self.logger.log_error("ファイルサイズが一致しません")
+                self.logger.log_error("コピー元: %s bytes", source_size)
+                self.logger.log_error("コピー先: %s bytes", dest_size)
                 return False
 
-            # ファイルのハッシュ値を計算して比較
-            import hashlib
+            # 同一ファイル、または同じ物理エクステントを共有するreflinkコピーは
+            # 内容が同一であるため、ハッシュ値の計算を省略する
+            if (source_stat.st_dev, source_stat.st_ino) == (
+                dest_stat.st_dev,
+                dest_stat.st_ino,
+            ) or self._shares_extents(source, destination):
+                self.logger.log_debug("ファイルの検証が完了しました")
+                return True
+
+            # コピー元とコピー先のハッシュ値を並行して計算して比較
+            hash_func = self._hash_file if strict else self._hash_sample
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                source_future = executor.submit(hash_func, source)
+                dest_future = executor.submit(
+                    hash_func, destination, drop_cache=verify_mode == "ondisk"
+                )
+                source_hash = source_future.result()
+                dest_hash = dest_future.result()
+
+            if source_hash != dest_hash:
+                self.logger.log_error("ファイルのハッシュ値が一致しません")
+                self.logger.log_error("コピー元: %s", source_hash)
+                self.logger.log_error("コピー先: %s", dest_hash)
+                return False
+
+            self.logger.log_debug("ファイルの検証が完了しました")
+            return True
+
+        except Exception as e:
+            self.logger.log_error("コピー検証に失敗しました: %s", e)
+            self.logger.log_error("エラーコード: FILE_003")
+            self.logger.log_error("コピー元: %s", source)
+            self.logger.log_error("コピー先: %s", destination)
+            return False
 
-            def calculate_md5(file_path: str) -> str:
-                md5_hash = hashlib.md5()
-                with open(file_path, "rb") as f:
-                    # ファイルを1MBずつ読み込んでハッシュ値を計算
-                    for chunk in iter(lambda: f.read(1024 * 1024), b""):
-                        md5_hash.update(chunk)
-                return md5_hash.hexdigest()
+    def copy_and_verify(
+        self, file: File, destination: str, dest_path: Optional[str] = None
+    ) -> bool:
+        """
+        ファイルをコピーしながらコピー元のハッシュ値を計算し、コピー先と比較する
 
-            source_hash = calculate_md5(source)
-            dest_hash = calculate_md5(destination)
+        コピー元の読み込みは1回のみで、読み込んだデータのハッシュ値の計算は
+        別スレッドで行い、コピー先への書き込みと重ねる。
+        2つのバッファを交互に使い、ハッシュ値の計算中のバッファには読み込まない。
+        コピー先はページキャッシュから破棄し、ディスク上の内容を読み込んで比較する。
+        コピーの途中で失敗した場合は、書き込み途中のコピー先を削除する
+
+        Args:
+            file (File): コピー対象のファイル
+            destination (str): コピー先パス
+            dest_path (Optional[str]): コピー先ファイルのパス。複数のファイルを
+                コピーする場合はdestination_pathsで決めたパスを渡す。
+                省略時はdestination直下のコピー元と同じ名前のパス
+
+        Returns:
+            bool: コピーと検証の成功の有無
+        """
+        if dest_path is None:
+            dest_path = destination_paths([file], destination)[0]
+        partial = False
+        try:
+            os.makedirs(destination, exist_ok=True)
+
+            hasher = self._new_hasher()
+            buffers = [bytearray(_COPY_BUFFER_SIZE) for _ in range(2)]
+            pending: List[Any] = [None, None]
+            with open(self._open_noatime(file.path), "rb", buffering=0) as fsrc, open(
+                dest_path, "wb"
+            ) as fdst, ThreadPoolExecutor(max_workers=1) as executor:
+                partial = True
+                index = 0
+                while True:
+                    if pending[index] is not None:
+                        pending[index].result()
+                    read_size = fsrc.readinto(buffers[index])
+                    if not read_size:
+                        break
+                    chunk = memoryview(buffers[index])[:read_size]
+                    pending[index] = executor.submit(hasher.update, chunk)
+                    fdst.write(chunk)
+                    index ^= 1
+                for future in pending:
+                    if future is not None:
+                        future.result()
+                # 書き込み後に更新日時が変わらないよう、先に書き出してから複製する
+                fdst.flush()
+                self._copy_metadata(
+                    fsrc.fileno(), fdst.fileno(), os.fstat(fsrc.fileno())
+                )
+            partial = False
 
+            source_hash = hasher.hexdigest()
+            dest_hash = self._hash_file(dest_path, drop_cache=True)
             if source_hash != dest_hash:
-                self.logger.log_error(f"ファイルのハッシュ値が一致しません")
-                self.logger.log_error(f"コピー元: {source_hash}")
-                self.logger.log_error(f"コピー先: {dest_hash}")
+                self.logger.log_error("ファイルのハッシュ値が一致しません")
+                self.logger.log_error("コピー元: %s", source_hash)
+                self.logger.log_error("コピー先: %s", dest_hash)
                 return False
 
-            self.logger.log_info(f"ファイルの検証が完了しました")
+            self.logger.log_debug("%s のコピーと検証が完了しました", file.path)
             return True
 
         except Exception as e:
-            self.logger.log_error(f"コピー検証に失敗しました: {e}")
-            self.logger.log_error(f"エラーコード: FILE_003")
-            self.logger.log_error(f"コピー元: {source}")
-            self.logger.log_error(f"コピー先: {destination}")
+            self.logger.log_error("コピーと検証に失敗しました: %s", e)
+            self.logger.log_error("エラーコード: FILE_003")
+            self.logger.log_error("コピー元: %s", file.path)
+            self.logger.log_error("コピー先: %s", dest_path)
+            if partial:
+                # 書き込み途中のコピー先を正常なファイルとして残さない
+                try:
+                    os.remove(dest_path)
+                except OSError as remove_error:
+                    self.logger.log_warning(
+                        "コピー先 %s の削除に失敗: %s", dest_path, remove_error
+                    )
             return False
 
-    def get_file_attributes(self, file: File) -> FileAttributes:
+    def _shares_extents(self, source: str, destination: str) -> bool:
         """
-        ファイルの属性情報を取得する
+        2つのファイルが同じ物理エクステントを共有しているかを確認する
+
+        FS_IOC_FIEMAPでエクステントの一覧を取得し、すべてのエクステントが
+        共有フラグ付きで論理・物理位置まで一致する場合にTrueを返す
 
         Args:
-            file (File): 対象ファイル
+            source (str): コピー元ファイルのパス
+            destination (str): コピー先ファイルのパス
 
         Returns:
-            FileAttributes: 取得された属性情報
+            bool: エクステントを共有している場合はTrue
         """
-        try:
-            self.logger.log_info(f"{file.path} の属性を取得中...")
+        source_extents = self._read_extents(source)
+        if not source_extents:
+            return False
+        if source_extents != self._read_extents(destination):
+            return False
+        return all(
+            flags & _FIEMAP_EXTENT_SHARED and not flags & _FIEMAP_EXTENT_UNSTABLE
+            for _, _, _, flags in source_extents
+        )
+
+    def _read_extents(
+        self, file_path: str
+    ) -> Optional[List[Tuple[int, int, int, int]]]:
+        """
+        FS_IOC_FIEMAPでファイルのエクステント一覧を取得する
 
-            # ファイルの存在確認
-            if not os.path.exists(file.path):
-                raise FileNotFoundError(f"ファイル {file.path} が見つかりません")
+        Args:
+            file_path (str): 対象ファイルのパス
 
-            # ファイルの作成日時と更新日時を取得
-            stat_info = os.stat(file.path)
-            creation_time = datetime.fromtimestamp(stat_info.st_ctime).strftime(
-                "%Y-%m-%d %H:%M:%S"
-            )
-            modified_time = datetime.fromtimestamp(stat_info.st_mtime).strftime(
-                "%Y-%m-%d %H:%M:%S"
+        Returns:
+            Optional[List[Tuple[int, int, int, int]]]: (論理位置, 物理位置, 長さ, フラグ)
+                の一覧。取得できない場合やエクステントが多すぎる場合はNone
+        """
+        if fcntl is None:
+            return None
+
+        request = bytearray(
+            _FIEMAP_HEADER.size + _FIEMAP_EXTENT.size * _FIEMAP_MAX_EXTENTS
+        )
+        _FIEMAP_HEADER.pack_into(
+            request,
+            0,
+            0,
+            _FIEMAP_MAX_LENGTH,
+            _FIEMAP_FLAG_SYNC,
+            0,
+            _FIEMAP_MAX_EXTENTS,
+            0,
+        )
+        try:
+            with open(file_path, "rb") as f:
+                fcntl.ioctl(f.fileno(), _FS_IOC_FIEMAP, request)
+        except OSError:
+            return None
+
+        mapped = _FIEMAP_HEADER.unpack_from(request, 0)[3]
+        extents = []
+        for index in range(mapped):
+            extents.append(
+                _FIEMAP_EXTENT.unpack_from(
+                    request, _FIEMAP_HEADER.size + _FIEMAP_EXTENT.size * index
+                )
             )
 
-            # ファイルのパーミッションを8進数で取得
-            permissions = oct(stat_info.st_mode & 0o777)
+        # 最後のエクステントまで取得できていない場合は判定しない
+        if not extents or not extents[-1][3] & _FIEMAP_EXTENT_LAST:
+            return None
+        return extents
+
+    def _new_hasher(self, threaded: bool = False) -> Any:
+        """
+        hash_algoに応じたハッシュオブジェクトを作成する
 
-            # ファイルの所有者を取得
+        Args:
+            threaded (bool): blake3の場合に複数スレッドで計算させるか
+
+        Returns:
+            Any: update/hexdigestを持つハッシュオブジェクト
+        """
+        if self.hash_algo == "blake3":
+            if threaded:
+                return blake3.blake3(max_threads=blake3.blake3.AUTO)
+            return blake3.blake3()
+        if self.hash_algo == "xxh3_128":
+            return xxhash.xxh3_128()
+        return hashlib.new(self.hash_algo)
+
+    def _hash_file(self, file_path: str, drop_cache: bool = False) -> str:
+        """
+        ファイルのハッシュ値を計算する
+
+        hash_algoが"blake3"の場合はマルチスレッドのBLAKE3を、"xxh3_128"の場合はXXH3を、
+        それ以外の場合はhashlibの指定のアルゴリズムを使用する。
+        ファイルは1つのバッファへ一定サイズ毎にreadintoで読み込んでハッシュへ渡し、
+        読み込みの度にbytesオブジェクトを作らない。
+        mmapは読み取り不能なセクタや読み込み中の切り詰めでSIGBUSとなり
+        プロセスが終了するため使用せず、読み込みエラーはOSErrorとして送出する
+
+        Args:
+            file_path (str): 対象ファイルのパス
+            drop_cache (bool): 読み込む前にファイルのページキャッシュを破棄するか
+
+        Returns:
+            str: ハッシュ値（16進数文字列）
+        """
+        hasher = self._new_hasher(threaded=True)
+
+        with open(file_path, "rb", buffering=0) as f:
+            if drop_cache:
+                self._drop_page_cache(f.fileno())
+            # 連続読み込みであることをカーネルに伝え、先読みを深くして
+            # 複数の読み込み要求が常に発行された状態にする
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+            # 一定サイズ毎に同じバッファへ読み込んで渡し、計算中はGILを解放させる
+            view = memoryview(bytearray(_HASH_WINDOW_SIZE))
             try:
-                import pwd
+                while True:
+                    read_size = f.readinto(view)
+                    if not read_size:
+                        break
+                    hasher.update(view[:read_size])
+            finally:
+                view.release()
+            return hasher.hexdigest()
+
+    def _drop_page_cache(self, fd: int) -> None:
+        """
+        ファイルの内容をディスクへ書き出し、ページキャッシュから破棄する
+
+        未書き出しのページは破棄されないため、先にfsyncで書き出す。
+        posix_fadviseが使用できない環境では何もしない
 
-                owner = pwd.getpwuid(stat_info.st_uid).pw_name
-            except ImportError:
-                # Windowsの場合はimport pwdが失敗するため
-                import getpass
+        Args:
+            fd (int): 対象ファイルのファイルディスクリプタ
+        """
+        if not hasattr(os, "posix_fadvise"):
+            return
+        os.fsync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
 
-                owner = getpass.getuser()
+    def _hash_sample(self, file_path: str, drop_cache: bool = False) -> str:
+        """
+        ファイルの先頭と末尾のみからハッシュ値を計算する
 
-            # 隠しファイルかどうかを判定
-            is_hidden = os.path.basename(file.path).startswith(".")
-            if os.name == "nt":  # Windowsの場合
-                import ctypes
+        ファイルサイズが先頭と末尾の読み込み量の合計以下の場合は
+        ファイル全体のハッシュ値を計算する
 
-                try:
-                    attrs = ctypes.windll.kernel32.GetFileAttributesW(file.path)
-                    is_hidden = bool(attrs & 2)  # FILE_ATTRIBUTE_HIDDEN
-                except AttributeError:
-                    pass
-
-            attributes = FileAttributes(
-                creation_time=creation_time,
-                modified_time=modified_time,
-                permissions=permissions,
-                owner=owner,
-                is_hidden=is_hidden,
+        Args:
+            file_path (str): 対象ファイルのパス
+            drop_cache (bool): 読み込む前にファイルのページキャッシュを破棄するか
+
+        Returns:
+            str: ハッシュ値（16進数文字列）
+        """
+        with open(file_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size <= _VERIFY_SAMPLE_SIZE * 2:
+                return self._hash_file(file_path, drop_cache)
+
+            if drop_cache:
+                self._drop_page_cache(f.fileno())
+            hasher = self._new_hasher()
+            hasher.update(os.pread(f.fileno(), _VERIFY_SAMPLE_SIZE, 0))
+            hasher.update(
+                os.pread(f.fileno(), _VERIFY_SAMPLE_SIZE, size - _VERIFY_SAMPLE_SIZE)
             )
+            return hasher.hexdigest()
 
-            self.logger.log_info(f"ファイル属性の取得が完了しました")
+    def find_duplicates(self, files: List[File]) -> List[List[File]]:
+        """
+        内容が同一のファイルをグループにまとめる
+
+        ファイルサイズで振り分けた後、サイズが同じファイルが複数ある場合のみ
+        ハッシュ値を計算し、ハッシュ値毎のグループにまとめる
+
+        Args:
+            files (List[File]): 対象のファイルリスト
+
+        Returns:
+            List[List[File]]: 2件以上のファイルを含むグループの一覧
+        """
+        by_size: Dict[int, List[File]] = defaultdict(list)
+        for file in files:
+            by_size[file.size].append(file)
+        candidates = [
+            file for group in by_size.values() if len(group) > 1 for file in group
+        ]
+        if not candidates:
+            return []
+
+        by_hash: Dict[str, List[File]] = defaultdict(list)
+        max_workers = max(1, min(_SCAN_MAX_WORKERS, len(candidates)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for file, digest in zip(
+                candidates, executor.map(self._try_hash_file, candidates)
+            ):
+                if digest is not None:
+                    # サイズの異なるファイルが同じグループにならないようサイズも含める
+                    by_hash[f"{file.size}:{digest}"].append(file)
+        return [group for group in by_hash.values() if len(group) > 1]
+
+    def _try_hash_file(self, file: File) -> Optional[str]:
+        """
+        ファイルのハッシュ値を計算する（読み込めない場合はエラーを記録してNoneを返す）
+
+        Args:
+            file (File): 対象のファイル
+
+        Returns:
+            Optional[str]: ハッシュ値。読み込めない場合はNone
+        """
+        try:
+            return self._hash_file(file.path)
+        except OSError as e:
+            self.logger.log_error("ハッシュ値の計算に失敗しました: %s", e)
+            return None
+
+    def get_file_attributes(self, file: File) -> FileAttributes:
+        """
+        ファイルの属性情報を取得する
+
+        Args:
+            file (File): 対象ファイル
+
+        Returns:
+            FileAttributes: 取得された属性情報
+        """
+        try:
+            self.logger.log_debug("%s の属性を取得中...", file.path)
+
+            # ファイルの存在確認を兼ねて1回のstatで属性を取得する
+            try:
+                stat_info = os.stat(file.path)
+            except FileNotFoundError:
+                raise FileNotFoundError(
+                    f"ファイル {file.path} が見つかりません"
+                ) from None
+
+            attributes = self._attributes_from_stat(file.path, stat_info)
+
+            self.logger.log_debug("ファイル属性の取得が完了しました")
             return attributes
 
         except Exception as e:
-            self.logger.log_error(f"ファイル属性の取得に失敗しました: {e}")
-            self.logger.log_error(f"エラーコード: FILE_004")
-            self.logger.log_error(f"ファイル: {file.path}")
+            self.logger.log_error("ファイル属性の取得に失敗しました: %s", e)
+            self.logger.log_error("エラーコード: FILE_004")
+            self.logger.log_error("ファイル: %s", file.path)
             return FileAttributes("不明", "不明", "不明", "不明", False)
 
-    def check_file_accessibility(self, file: File) -> bool:
+    def _attributes_from_stat(
+        self, path: str, stat_info: os.stat_result
+    ) -> FileAttributes:
+        """
+        取得済みのstat情報からファイル属性を作成する
+
+        Args:
+            path (str): ファイルパス
+            stat_info (os.stat_result): ファイルのstat情報
+
+        Returns:
+            FileAttributes: ファイル属性
+        """
+        # ファイルの作成日時と更新日時を取得
+        creation_time = datetime.fromtimestamp(stat_info.st_ctime).isoformat(
+            sep=" ", timespec="seconds"
+        )
+        modified_time = datetime.fromtimestamp(stat_info.st_mtime).isoformat(
+            sep=" ", timespec="seconds"
+        )
+
+        # ファイルのパーミッションを8進数で取得
+        permissions = oct(stat_info.st_mode & 0o777)
+
+        # 隠しファイルかどうかを判定
+        is_hidden = os.path.basename(path).startswith(".")
+        if os.name == "nt":  # Windowsの場合
+            import ctypes
+
+            try:
+                attrs = ctypes.windll.kernel32.GetFileAttributesW(path)
+                is_hidden = bool(attrs & 2)  # FILE_ATTRIBUTE_HIDDEN
+            except AttributeError:
+                pass
+
+        return FileAttributes(
+            creation_time=creation_time,
+            modified_time=modified_time,
+            permissions=permissions,
+            owner=_owner_name(stat_info.st_uid),
+            is_hidden=is_hidden,
+        )
+
+    def check_file_accessibility(self, file: File, strict: bool = False) -> bool:
         """
         ファイルのアクセス可能性を確認する
 
+        通常は存在と読み取り権限のみを確認する。strict=Trueの場合は、
+        他のプロセスによってロックされていないかも確認する
+
         Args:
             file (File): 対象ファイル
+            strict (bool): ロック状態も確認するかどうか
 
         Returns:
             bool: アクセス可能かどうか
         """
         try:
-            self.logger.log_info(f"{file.path} のアクセス性を確認中...")
+            self.logger.log_debug("%s のアクセス性を確認中...", file.path)
 
             # ファイルの存在確認
             if not os.path.exists(file.path):
@@ -327,53 +1236,64 @@ class FileHandler:
             # 読み取り権限の確認
             if not os.access(file.path, os.R_OK):
                 self.logger.log_error(
-                    f"ファイル {file.path} に読み取り権限がありません"
+                    "ファイル %s に読み取り権限がありません", file.path
                 )
                 return False
 
             # ファイルのロック状態を確認
-            try:
-                with open(file.path, "rb") as f:
-                    # ファイルをロックしてみる
-                    import msvcrt
-
-                    try:
-                        msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
-                        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
-                    except (IOError, PermissionError):
-                        self.logger.log_error(
-                            f"ファイル {file.path} は他のプロセスによってロックされています"
-                        )
-                        return False
-            except ImportError:
-                # Windowsでない場合はfcntlを使用
-                try:
-                    import fcntl
-
-                    with open(file.path, "rb") as f:
-                        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-                        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
-                except (ImportError, IOError):
-                    self.logger.log_error(
-                        f"ファイル {file.path} は他のプロセスによってロックされています"
-                    )
-                    return False
+            if strict and self._is_locked(file.path):
+                self.logger.log_error(
+                    "ファイル %s は他のプロセスによってロックされています", file.path
+                )
+                return False
 
-            self.logger.log_info(f"ファイル {file.path} はアクセス可能です")
+            self.logger.log_debug("ファイル %s はアクセス可能です", file.path)
             return True
 
         except Exception as e:
-            self.logger.log_error(f"ファイルアクセス確認に失敗しました: {e}")
-            self.logger.log_error(f"エラーコード: FILE_005")
-            self.logger.log_error(f"ファイル: {file.path}")
+            self.logger.log_error("ファイルアクセス確認に失敗しました: %s", e)
+            self.logger.log_error("エラーコード: FILE_005")
+            self.logger.log_error("ファイル: %s", file.path)
             return False
 
-    def handle_corrupted_files(self, files: List[File]) -> List[FileError]:
+    def _is_locked(self, path: str) -> bool:
+        """
+        ファイルが他のプロセスによってロックされているかを確認する
+
+        Args:
+            path (str): 対象ファイルのパス
+
+        Returns:
+            bool: ロックされている場合はTrue
+        """
+        with open(path, "rb") as f:
+            try:
+                if _IS_WINDOWS:
+                    import msvcrt
+
+                    msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+                elif fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            except OSError:
+                return True
+        return False
+
+    def handle_corrupted_files(
+        self, files: List[File], deep: bool = False
+    ) -> List[FileError]:
         """
         破損ファイルのハンドリングを行う
 
+        通常はヘッダーと末尾1バイトのみを読み込み、切り詰めや読み取り不能な
+        末尾セクタを検出する。deep=Trueの場合はファイル全体を読み込んで検査する。
+        既に破損と判定済みのファイルは、不良セクタの再読み込みを避けるため
+        読み込まずにエラー情報を作成する
+
         Args:
             files (List[File]): チェック対象のファイルリスト
+            deep (bool): ファイル全体を読み込んで整合性を確認するかどうか
 
         Returns:
             List[FileError]: 発見されたエラー情報のリスト
@@ -382,107 +1302,152 @@ class FileHandler:
         try:
             self.logger.log_info("破損ファイルのチェックを実施中...")
 
-            for file in files:
-                try:
-                    # ファイルの存在確認
-                    if not os.path.exists(file.path):
-                        raise FileNotFoundError(
-                            f"ファイル {file.path} が見つかりません"
+            errors = [
+                FileError(FILE_006, f"ファイル {file.path} は破損しています")
+                for file in files
+                if file.is_corrupted
+            ]
+            pending = [file for file in files if not file.is_corrupted]
+
+            # 複数ファイルの読み込みを同時に発行し、デバイスのキューを深く保つ
+            max_workers = max(1, min(_SCAN_MAX_WORKERS, len(pending)))
+            total = len(pending)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for checked, file_errors in enumerate(
+                    executor.map(self._check_file, pending, [deep] * total), 1
+                ):
+                    errors.extend(file_errors)
+                    # 進捗はファイル毎ではなく一定件数毎にまとめて記録する
+                    if checked % _LOG_BATCH_SIZE == 0:
+                        self.logger.log_info(
+                            "破損ファイルのチェック中... (%s/%s)", checked, total
                         )
 
-                    # ファイルが空でないことを確認
-                    if os.path.getsize(file.path) == 0:
-                        error = FileError(
-                            FILE_006, f"ファイル {file.path} は空ファイルです"
-                        )
-                        errors.append(error)
-                        file.is_corrupted = True
-                        continue
-
-                    # ファイルヘッダーの確認
-                    with open(file.path, "rb") as f:
-                        header = f.read(8)  # 最初の8バイトを読み込む
-
-                    # 一般的なファイル形式のマジックナンバーをチェック
-                    magic_numbers = {
-                        b"\x89PNG\r\n\x1a\n": "PNG",
-                        b"\xFF\xD8\xFF": "JPEG",
-                        b"GIF87a": "GIF",
-                        b"GIF89a": "GIF",
-                        b"%PDF": "PDF",
-                        b"PK\x03\x04": "ZIP",
-                        b"\x50\x4B\x05\x06": "ZIP",
-                        b"\x50\x4B\x07\x08": "ZIP",
-                    }
-
-                    file_type = None
-                    for magic, ftype in magic_numbers.items():
-                        if header.startswith(magic):
-                            file_type = ftype
-                            break
-
-                    # ファイル拡張子とヘッダーの整合性チェック
-                    if file_type:
-                        ext = os.path.splitext(file.path)[1].lower()
-                        expected_extensions = {
-                            "PNG": ".png",
-                            "JPEG": [".jpg", ".jpeg"],
-                            "GIF": ".gif",
-                            "PDF": ".pdf",
-                            "ZIP": ".zip",
-                        }
-
-                        if file_type in expected_extensions:
-                            expected = expected_extensions[file_type]
-                            if isinstance(expected, list):
-                                if ext not in expected:
-                                    error = FileError(
-                                        FILE_006,
-                                        f"ファイル {file.path} の拡張子が不正です（期待: {expected}, 実際: {ext}）",
-                                    )
-                                    errors.append(error)
-                                    file.is_corrupted = True
-                            else:
-                                if ext != expected:
-                                    error = FileError(
-                                        FILE_006,
-                                        f"ファイル {file.path} の拡張子が不正です（期待: {expected}, 実際: {ext}）",
-                                    )
-                                    errors.append(error)
-                                    file.is_corrupted = True
-
-                    # ファイルの整合性チェック
-                    try:
-                        with open(file.path, "rb") as f:
-                            while True:
-                                chunk = f.read(1024 * 1024)  # 1MBずつ読み込む
-                                if not chunk:
-                                    break
-                    except (IOError, OSError) as e:
+            self.logger.log_info(
+                "破損ファイルのチェックが完了しました（検出: %s件）", len(errors)
+            )
+            return errors
+
+        except Exception as e:
+            self.logger.log_error(
+                "破損ファイルのチェック中にエラーが発生しました: %s", e
+            )
+            self.logger.log_error("エラーコード: FILE_006")
+            errors.append(FileError(FILE_006, str(e)))
+            return errors
+
+    def _check_file(self, file: File, deep: bool = False) -> List[FileError]:
+        """
+        1つのファイルの破損チェックを行う
+
+        通常はヘッダーと末尾1バイトをpreadで読み込む。deep=Trueの場合は
+        先頭チャンクからヘッダーを取得した後、残りを同じバッファへ読み込む。
+        mmapは読み取り不能なセクタでSIGBUSとなるため使用しない
+
+        Args:
+            file (File): チェック対象のファイル
+            deep (bool): ファイル全体を読み込んで整合性を確認するかどうか
+
+        Returns:
+            List[FileError]: 発見されたエラー情報のリスト
+        """
+        errors = []
+        try:
+            # ファイルの存在確認
+            if not os.path.exists(file.path):
+                raise FileNotFoundError(f"ファイル {file.path} が見つかりません")
+
+            # ファイルが空でないことを確認
+            size = os.path.getsize(file.path)
+            if size == 0:
+                error = FileError(FILE_006, f"ファイル {file.path} は空ファイルです")
+                errors.append(error)
+                file.is_corrupted = True
+                return errors
+
+            with open(self._open_noatime(file.path), "rb", buffering=0) as f:
+                if deep:
+                    # 連続読み込みであることをカーネルに伝え、先読みを深くする
+                    if hasattr(os, "posix_fadvise"):
+                        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+                    buffer = bytearray(_SCAN_CHUNK_SIZE)
+                    read_size = f.readinto(buffer)
+
+                    # ファイルヘッダーの確認（最初の8バイト）
+                    header = bytes(buffer[: min(read_size, 8)])
+                else:
+                    # ファイルヘッダーの確認（最初の8バイト）
+                    header = os.pread(f.fileno(), 8, 0)
+
+                # 先頭3バイトで候補を1回の辞書参照で絞り込み、マジックナンバーを照合
+                file_type = None
+                candidate = _MAGIC_NUMBERS.get(header[:3])
+                if candidate and header.startswith(candidate[1]):
+                    file_type = candidate[0]
+
+                # ファイル拡張子とヘッダーの整合性チェック
+                if file_type:
+                    ext = os.path.splitext(file.path)[1].lower()
+                    expected = _EXPECTED_EXTENSIONS[file_type]
+                    if isinstance(expected, list):
+                        is_valid = ext in expected
+                    else:
+                        is_valid = ext == expected
+                    if not is_valid:
                         error = FileError(
                             FILE_006,
-                            f"ファイル {file.path} の読み込み中にエラーが発生しました: {e}",
+                            f"ファイル {file.path} の拡張子が不正です（期待: {expected}, 実際: {ext}）",
                         )
                         errors.append(error)
                         file.is_corrupted = True
 
-                except Exception as e:
+                # ファイルの整合性チェック
+                try:
+                    if deep:
+                        # 残りを同じバッファへ読み込む
+                        while f.readinto(buffer):
+                            pass
+                    else:
+                        # 末尾1バイトを読み込み、切り詰めや読み取り不能な末尾を検出する
+                        if not os.pread(f.fileno(), 1, size - 1):
+                            raise IOError(
+                                f"ファイル {file.path} の末尾を読み込めません"
+                            )
+                except (IOError, OSError) as e:
                     error = FileError(
                         FILE_006,
-                        f"ファイル {file.path} のチェック中にエラーが発生しました: {e}",
+                        f"ファイル {file.path} の読み込み中にエラーが発生しました: {e}",
                     )
                     errors.append(error)
                     file.is_corrupted = True
 
-            self.logger.log_info(
-                f"破損ファイルのチェックが完了しました（検出: {len(errors)}件）"
-            )
-            return errors
-
         except Exception as e:
-            self.logger.log_error(
-                f"破損ファイルのチェック中にエラーが発生しました: {e}"
+            error = FileError(
+                FILE_006,
+                f"ファイル {file.path} のチェック中にエラーが発生しました: {e}",
             )
-            self.logger.log_error(f"エラーコード: FILE_006")
-            errors.append(FileError(FILE_006, str(e)))
-            return errors
+            errors.append(error)
+            file.is_corrupted = True
+
+        return errors
+
+    def _open_noatime(self, path: str) -> int:
+        """
+        アクセス日時を更新せずにファイルを読み取り専用で開く
+
+        サルベージ対象のディスクへの書き込みを避けるためO_NOATIMEを指定する。
+        ファイルの所有者でない場合など、O_NOATIMEが拒否された場合は指定せずに開く
+
+        Args:
+            path (str): 対象ファイルのパス
+
+        Returns:
+            int: ファイルディスクリプタ
+        """
+        if _O_NOATIME:
+            try:
+                return os.open(path, os.O_RDONLY | _O_NOATIME)
+            except PermissionError:
+                pass
+        return os.open(path, os.O_RDONLY)
@@ -9,7 +9,71 @@ from typing import List, Any, Optional, Dict
 import PySimpleGUI as sg
 from ..disk_operations.disk_manager import Disk, FilesystemStatus
 from ..file_operations.file_handler import File
-import os
+import functools
+import time
+
+# プログレス表示を更新する最短間隔（秒）
+_PROGRESS_UPDATE_INTERVAL = 0.05
+
+# 未展開のディレクトリに追加する仮の子ノードのキーの接尾辞
+_PLACEHOLDER_SUFFIX = "/\0placeholder"
+
+# エラー表示のタイトル（メッセージの接頭辞にも使用する）
+_ERROR_TITLE = "エラー"
+
+# ヘルプ表示のタイトルと本文
+_HELP_TITLE = "ヘルプ"
+_HELP_TEXT = """
+データサルベージプログラムのヘルプ
+
+1. ディスクの選択
+   - 検出されたディスク一覧から対象のディスクを選択してください
+   - マウントボタンをクリックしてディスクをマウントします
+
+2. ファイルの選択
+   - ファイル一覧から復旧したいファイルを選択してください
+   - 「選択」または「すべて選択」ボタンで選択できます
+
+3. コピー先の指定
+   - 「参照」ボタンをクリックして保存先を指定してください
+   - 十分な空き容量があることを確認してください
+
+4. コピーの実行
+   - 「コピー開始」ボタンをクリックしてコピーを開始します
+   - プログレスバーで進捗状況を確認できます
+
+注意事項:
+- 破損マークのついたファイルは、正常にコピーできない可能性があります
+- コピー中はプログラムを終了しないでください
+- エラーが発生した場合は、エラーメッセージを確認してください
+"""
+
+# ファイルシステムに問題がない場合のディスク状態の表示
+_STATUS_OK_TEXT = "正常"
+
+# ディスクサイズの表示に使う1GBのバイト数
+_GIB = 1 << 30
+
+# ファイルサイズの表示単位（1024倍ごと）
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+# 整形済みファイルサイズのキャッシュ件数
+_FORMAT_SIZE_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=_FORMAT_SIZE_CACHE_SIZE)
+def _format_size(size: int) -> str:
+    """ファイルサイズを読みやすい形式に変換する
+
+    単位はビット長から直接求める（1024 = 2**10 のため）
+
+    Args:
+        size (int): バイト単位のサイズ
+
+    Returns:
+        str: 変換後のサイズ文字列
+    """
+    unit_index = min(max(size.bit_length() - 1, 0) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size / (1 << (unit_index * 10)):.1f}{_SIZE_UNITS[unit_index]}"
 
 
 class MainWindow:
@@ -27,6 +91,19 @@ class MainWindow:
         self.window: Optional[sg.Window] = None
         self.current_disk: Optional[Disk] = None
         self.selected_files: List[File] = []
+        self._last_progress_update = float("-inf")
+        self._last_progress_value = -1
+        self._all_files: List[File] = []
+        self._files_by_parent: Dict[str, List[File]] = {}
+        # ファイル一覧ツリーの表示データ（再構築の度に中身を入れ替えて使う）
+        self._treedata = sg.TreeData()
+        # 直近に表示したディスク状態（同じ内容の再描画を省くために保持する）
+        self._last_status_text = ""
+        # 直近に表示したディスク一覧（同じ内容の再描画を省くために保持する）
+        self._last_disk_list: List[str] = []
+        # 表示待ちのエラーメッセージと、まとめて表示するイベントの発行状態
+        self._error_buffer: List[str] = []
+        self._error_flush_pending = False
 
     def create_layout(self) -> List[List[Any]]:
         """GUIレイアウトの作成
@@ -38,13 +115,10 @@ class MainWindow:
         disk_section = [
             [sg.Text("検出されたディスク", font=("", 12))],
             [
-                sg.Tree(
-                    data=sg.TreeData(),
-                    headings=["サイズ", "状態"],
-                    auto_size_columns=True,
-                    num_rows=10,
-                    col0_width=30,
-                    key="-DISK_TREE-",
+                sg.Listbox(
+                    values=[],
+                    size=(50, 10),
+                    key="-DISK_LIST-",
                     enable_events=True,
                 )
             ],
@@ -118,130 +192,244 @@ class MainWindow:
             finalize=True,
             resizable=True,
         )
+        self._last_status_text = ""
+        self._last_disk_list = []
+        # ディレクトリの展開を"-FILE_TREE-_OPEN"イベントとして受け取る
+        self.window["-FILE_TREE-"].bind("<<TreeviewOpen>>", "_OPEN")
 
     def update_disk_list(self, disks: List[Disk]) -> None:
         """ディスク一覧を更新する
 
+        表示内容が前回と同じ場合はウィジェットを更新しない
+
         Args:
             disks (List[Disk]): 更新するディスクリスト
         """
         if self.window:
             disk_list = [
-                f"{disk.device_path} ({disk.size / (1024**3):.1f}GB, {disk.filesystem})"
+                f"{disk.device_path} ({disk.size / _GIB:.1f}GB, {disk.filesystem})"
                 for disk in disks
             ]
+            if disk_list == self._last_disk_list:
+                return
+            self._last_disk_list = disk_list
             self.window["-DISK_LIST-"].update(values=disk_list)
 
     def update_file_tree(self, files: List[File]) -> None:
         """ファイル一覧ツリーを更新する
 
+        ファイルは親ディレクトリ毎に保持し、ツリーにはディレクトリと仮の子ノードのみを
+        追加する。ディレクトリの中身は展開された時にexpand_nodeで追加する
+
         Args:
             files (List[File]): 更新するファイルリスト
         """
         if self.window:
-            treedata = sg.TreeData()
+            # ファイルを親ディレクトリ毎にまとめる
+            files_by_parent: Dict[str, List[File]] = {}
+            for file in files:
+                # dirnameとbasenameを別々に呼ばず、1回の走査で親ディレクトリを得る
+                parent = file.path.rpartition("/")[0] or "/"
+                files_by_parent.setdefault(parent, []).append(file)
 
-            # ルートディレクトリを追加
-            treedata.Insert("", "/", "ルート", ["", ""])
+            self._all_files = files
+            self._files_by_parent = files_by_parent
+            self._refresh_file_tree()
 
-            # ファイルをツリーに追加
-            for file in files:
-                # ファイルサイズを適切な単位に変換
-                size = self._format_size(file.size)
-                # ファイルの状態を日本語で表示
-                status = "正常" if not file.is_corrupted else "破損"
-                # ファイルパスから親ディレクトリを取得
-                parent = os.path.dirname(file.path)
-                if not parent:
-                    parent = "/"
-                # 親ディレクトリが存在しない場合は作成
-                if parent not in treedata.tree_dict:
-                    treedata.Insert("/", parent, parent, ["", ""])
-                # ファイル名を取得
-                filename = os.path.basename(file.path)
-                # ツリーにデータを追加
-                treedata.Insert(parent, file.path, filename, [size, status])
-
-            self.window["-FILE_TREE-"].update(values=treedata)
-
-    def _format_size(self, size: int) -> str:
-        """ファイルサイズを読みやすい形式に変換する
+    def expand_node(self, parent_key: str) -> None:
+        """展開されたディレクトリの中身をファイル一覧ツリーに追加する
+
+        ツリー全体は再構築せず、仮の子ノードを展開されたディレクトリの中身に置き換える
+
+        Args:
+            parent_key (str): 展開されたディレクトリのキー
+        """
+        if not self.window:
+            return
+        # 仮の子ノードが残っているディレクトリのみ未展開として扱う
+        placeholder_key = f"{parent_key}{_PLACEHOLDER_SUFFIX}"
+        if placeholder_key not in self._treedata.tree_dict:
+            return
+
+        self._replace_tree_node(
+            self.window["-FILE_TREE-"], placeholder_key, self._insert_files(parent_key)
+        )
+
+    def _replace_tree_node(self, tree: Any, key: str, nodes: List[Any]) -> None:
+        """ツリー全体を再構築せずに、ノードを同じ親の下に追加したノードで置き換え、
+        親ノードを展開する
+
+        PySimpleGUIにはノードを個別に追加・削除する公開APIがないため、PySimpleGUI 6.3の
+        内部属性（TreeData.tree_dict・Tree.KeyToID・IdToKey・add_treeview_data）を
+        直接操作する。PySimpleGUIを更新する場合はこのメソッドの動作を確認すること
 
         Args:
-            size (int): バイト単位のサイズ
+            tree (Any): ファイル一覧ツリーの要素（sg.Tree）
+            key (str): 置き換える子ノードを持たないノードのキー
+            nodes (List[Any]): 表示データに追加済みの、新たに表示するノード（TreeData.Node）
+        """
+        # TreeData.Nodeのparentは親ノードではなく親ノードのキー
+        node = self._treedata.tree_dict.pop(key)
+        self._treedata.tree_dict[node.parent].children.remove(node)
+        node_id = tree.KeyToID.pop(key, None)
+        if node_id is not None:
+            del tree.IdToKey[node_id]
+            tree.Widget.delete(node_id)
+
+        for new_node in nodes:
+            tree.add_treeview_data(new_node)
+        tree.Widget.item(tree.KeyToID[node.parent], open=True)
+
+    def get_focused_tree_key(self) -> Optional[str]:
+        """ファイル一覧ツリーでフォーカスされているノードのキーを取得する
 
         Returns:
-            str: 変換後のサイズ文字列
+            Optional[str]: ノードのキー。フォーカスされたノードがない場合はNone
         """
-        for unit in ["B", "KB", "MB", "GB", "TB"]:
-            if size < 1024:
-                return f"{size:.1f}{unit}"
-            size /= 1024
-        return f"{size:.1f}PB"
+        if not self.window:
+            return None
+        tree = self.window["-FILE_TREE-"]
+        return tree.IdToKey.get(tree.Widget.focus())
+
+    def _refresh_file_tree(self) -> None:
+        """保持しているファイル一覧から表示するツリーを構築する"""
+        # TreeDataは作り直さず、ルート以外のノードを破棄して再利用する
+        treedata = self._treedata
+        treedata.tree_dict.clear()
+        treedata.root_node.children.clear()
+        treedata.tree_dict[""] = treedata.root_node
+
+        # ルートディレクトリを追加
+        treedata.Insert("", "/", "ルート", ["", ""])
+
+        # 親ディレクトリを1度だけ追加し、中身は展開された時に追加する
+        for parent in self._files_by_parent:
+            if parent == "/":
+                self._insert_files(parent)
+                continue
+            treedata.Insert("/", parent, parent, ["", ""])
+            # 展開可能にするための仮の子ノード
+            treedata.Insert(
+                parent, parent + _PLACEHOLDER_SUFFIX, "読み込み中...", ["", ""]
+            )
+
+        self.window["-FILE_TREE-"].update(values=treedata)
+
+    def _insert_files(self, parent: str) -> List[Any]:
+        """ディレクトリ直下のファイルをツリーの表示データに追加する
+
+        Args:
+            parent (str): 親ディレクトリのキー
+
+        Returns:
+            List[Any]: 追加したノードのリスト
+        """
+        treedata = self._treedata
+        children = treedata.tree_dict[parent].children
+        start = len(children)
+        for file in self._files_by_parent[parent]:
+            # ファイルサイズを適切な単位に変換
+            size = _format_size(file.size)
+            # ファイルの状態を日本語で表示
+            status = "正常" if not file.is_corrupted else "破損"
+            # ツリーにデータを追加
+            treedata.Insert(
+                parent, file.path, file.path.rpartition("/")[2], [size, status]
+            )
+        return children[start:]
 
     def update_progress(self, value: int, message: str) -> None:
         """プログレスバーとステータスメッセージを更新する
 
+        更新は最大で毎秒20回に間引き、開始（0）と完了（100）は必ず表示する。
+        進捗値が前回と同じ場合はメッセージのみ更新する
+
         Args:
             value (int): 進捗値（0-100）
             message (str): 表示するメッセージ
         """
         if self.window:
-            self.window["-PROGRESS-"].update(current_count=value)
+            now = time.monotonic()
+            if (
+                0 < value < 100
+                and now - self._last_progress_update < _PROGRESS_UPDATE_INTERVAL
+            ):
+                return
+            self._last_progress_update = now
+
+            # 進捗値が変わらない場合はプログレスバーを更新しない
+            if value != self._last_progress_value:
+                self._last_progress_value = value
+                self.window["-PROGRESS-"].update(current_count=value)
             self.window["-STATUS-"].update(value=message)
+            # イベントループに戻らずに処理が続くため、ここで画面を再描画する
+            self.window.refresh()
 
     def show_error(self, message: str) -> None:
         """エラーメッセージを表示する
 
+        ウィンドウの表示中はメッセージを溜めて"-FLUSH_ERRORS-"イベントを発行し、
+        続けて発生したエラーをflush_errorsでまとめて1つのポップアップに表示する
+
         Args:
             message (str): エラーメッセージ
         """
-        sg.popup_error(f"エラー: {message}", title="エラー")
+        if not self.window:
+            sg.popup_error(f"{_ERROR_TITLE}: {message}", title=_ERROR_TITLE)
+            return
+
+        self._error_buffer.append(message)
+        if not self._error_flush_pending:
+            self._error_flush_pending = True
+            self.window.write_event_value("-FLUSH_ERRORS-", None)
+
+    def flush_errors(self) -> None:
+        """溜まっているエラーメッセージをまとめて表示する"""
+        errors = self._error_buffer
+        self._error_buffer = []
+        self._error_flush_pending = False
+        if len(errors) == 1:
+            sg.popup_error(f"{_ERROR_TITLE}: {errors[0]}", title=_ERROR_TITLE)
+        elif errors:
+            sg.popup_scrolled("\n".join(errors), title=_ERROR_TITLE, size=(60, 20))
 
     def show_help(self) -> None:
         """ヘルプ情報を表示する"""
-        help_text = """
-データサルベージプログラムのヘルプ
-
-1. ディスクの選択
-   - 検出されたディスク一覧から対象のディスクを選択してください
-   - マウントボタンをクリックしてディスクをマウントします
-
-2. ファイルの選択
-   - ファイル一覧から復旧したいファイルを選択してください
-   - 「選択」または「すべて選択」ボタンで選択できます
-
-3. コピー先の指定
-   - 「参照」ボタンをクリックして保存先を指定してください
-   - 十分な空き容量があることを確認してください
-
-4. コピーの実行
-   - 「コピー開始」ボタンをクリックしてコピーを開始します
-   - プログレスバーで進捗状況を確認できます
-
-注意事項:
-- 破損マークのついたファイルは、正常にコピーできない可能性があります
-- コピー中はプログラムを終了しないでください
-- エラーが発生した場合は、エラーメッセージを確認してください
-"""
-        sg.popup_scrolled(
-            help_text,
-            title="ヘルプ",
-            size=(60, 20),
-        )
+        sg.popup_scrolled(_HELP_TEXT, title=_HELP_TITLE, size=(60, 20))
 
     def display_disk_status(self, status: FilesystemStatus) -> None:
         """ディスクの状態を表示する
 
+        表示内容が前回と同じ場合はウィジェットを更新しない
+
         Args:
             status (FilesystemStatus): ディスクの状態情報
         """
         if self.window:
             status_text = (
-                "正常" if status.is_consistent else f"問題あり: {status.details}"
+                _STATUS_OK_TEXT
+                if status.is_consistent
+                else f"問題あり: {status.details}"
             )
+            if status_text == self._last_status_text:
+                return
+            self._last_status_text = status_text
             self.window["-DISK_STATUS-"].update(status_text)
 
+    def select_files(self, keys: List[Any]) -> None:
+        """ファイル一覧ツリーで選択されたノードを選択中のファイルとして保持する
+
+        未展開のディレクトリに追加した仮の子ノードは、コピー対象に含めないよう除外する
+
+        Args:
+            keys (List[Any]): 選択されたノードのキー
+        """
+        self.selected_files = [
+            key
+            for key in keys
+            if not (isinstance(key, str) and key.endswith(_PLACEHOLDER_SUFFIX))
+        ]
+
     def handle_file_selection(self, event: str, values: Dict[str, Any]) -> None:
         """ファイル選択イベントを処理する
 
@@ -253,10 +441,10 @@ class MainWindow:
             return
 
         if event == "-SELECT-" and values.get("-FILE_TREE-"):
-            self.selected_files = values["-FILE_TREE-"]
+            self.select_files(values["-FILE_TREE-"])
         elif event == "-SELECT_ALL-":
             if self.window["-FILE_TREE-"].get_children:
-                self.selected_files = self.window["-FILE_TREE-"].get_children()
+                self.select_files(self.window["-FILE_TREE-"].get_children())
             else:
                 self.selected_files = []
         elif event == "-DESELECT-":
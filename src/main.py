@@ -7,15 +7,52 @@ JSDoc: プロジェクトのエントリーポイント
 
 import sys
 import os
+import queue
 import subprocess
-from typing import Optional, Tuple, List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple, List
 import PySimpleGUI as sg
 
 from .gui.main_window import MainWindow
 from .disk_operations.disk_manager import DiskManager, Disk
-from .file_operations.file_handler import FileHandler, File
+from .file_operations.file_handler import FileHandler, File, destination_paths
 from .utils.logger import Logger
 
+# UIスレッドを塞がないようにディスクI/Oを実行するワーカー数
+_BACKGROUND_MAX_WORKERS = 2
+# ログファイルのパス
+_LOG_FILE = "salvage_program.log"
+# ファイル一覧の再読み込みをまとめる待ち時間（ミリ秒）
+_FILE_REFRESH_DELAY_MS = 150
+# ディスク一覧の表示を更新する最小間隔（ミリ秒）
+_DISK_LIST_FLUSH_MS = 200
+# ファイルのコピーと検証を並行して行うワーカー数の上限
+_COPY_PIPELINE_MAX_WORKERS = 4
+# コピー進捗を通知する最小間隔（秒）
+_COPY_PROGRESS_INTERVAL = 0.05
+# root以外で実行されている場合に必要なケーパビリティ
+# （CAP_DAC_OVERRIDE: デバイスファイルの読み込み、CAP_SYS_ADMIN: マウント）
+_REQUIRED_CAPABILITIES = (1 << 1) | (1 << 21)
+
+
+def _has_required_capabilities() -> bool:
+    """プロセスの実効ケーパビリティに必要なケーパビリティが全て含まれるか確認する
+
+    Returns:
+        bool: 必要なケーパビリティを全て持つ場合はTrue。確認できない場合はFalse
+    """
+    try:
+        with open("/proc/self/status", "rb") as f:
+            for line in f:
+                if line.startswith(b"CapEff:"):
+                    effective = int(line.split()[1], 16)
+                    return effective & _REQUIRED_CAPABILITIES == _REQUIRED_CAPABILITIES
+    except (OSError, ValueError, IndexError):
+        pass
+    return False
+
 
 class Application:
     """アプリケーションのメインクラス
@@ -32,26 +69,94 @@ class Application:
         self.window = MainWindow()
         self.disk_manager = DiskManager()
         self.file_handler = FileHandler()
-        self.logger = Logger()
+        self.logger = Logger(log_path=_LOG_FILE)
+        # 直近に検出したディスク（デバイスパス -> Disk）
+        self._disks_by_path: Dict[str, Disk] = {}
+        # サブプロセスやファイル走査をUIスレッドから切り離すワーカー
+        self._executor = ThreadPoolExecutor(max_workers=_BACKGROUND_MAX_WORKERS)
+        # 予約中のファイル一覧の再読み込み（Tkのafterの識別子）
+        self._pending_refresh_id: Optional[str] = None
+        # 表示待ちのディスク検出結果と、表示の予約（Tkのafterの識別子）
+        self._pending_disks: Any = None
+        self._disk_flush_id: Optional[str] = None
+
+    def check_sudo_privileges(self, force_sudo_prompt: bool = False) -> bool:
+        """root権限で実行されているかチェックする
+
+        通常はプロセスの実効UIDを確認し、root以外の場合は必要なケーパビリティを
+        付与されているかを/proc/self/statusから確認する。force_sudo_promptがTrueの
+        場合はsudoを実行し、認証情報を問い合わせずに権限を得られるかを確認する
 
-    def check_sudo_privileges(self) -> bool:
-        """sudo権限があるかチェックする
+        Args:
+            force_sudo_prompt (bool): sudoを実行して確認するかどうか
 
         Returns:
-            bool: sudo権限がある場合はTrue、ない場合はFalse
+            bool: root権限がある場合はTrue、ない場合はFalse
         """
         try:
-            subprocess.run(["sudo", "-n", "true"])
-            return True
+            if force_sudo_prompt:
+                privileged = subprocess.run(["sudo", "-n", "true"]).returncode == 0
+            else:
+                privileged = os.geteuid() == 0 or _has_required_capabilities()
         except Exception as e:
-            self.logger.log_error(f"sudo権限の取得に失敗しました: {e}")
+            self.logger.log_error(f"sudo権限の確認に失敗しました: {e}")
             self.logger.log_error("エラーコード: SYS_001")
             return False
 
+        if privileged:
+            self.logger.log_info("sudo権限の確認に成功しました")
+        else:
+            self.logger.log_error("sudo権限がありません")
+            self.logger.log_error("エラーコード: SYS_001")
+        return privileged
+
+    @staticmethod
+    def _capture(func: Callable[..., Any], *args: Any) -> Any:
+        """関数を実行し、発生した例外は送出せずに戻り値として返す
+
+        Args:
+            func (Callable[..., Any]): 実行する関数
+            *args (Any): 関数に渡す引数
+
+        Returns:
+            Any: 関数の戻り値、または発生した例外
+        """
+        try:
+            return func(*args)
+        except Exception as e:
+            return e
+
+    def _run_in_background(
+        self, event: str, func: Callable[..., Any], *args: Any
+    ) -> None:
+        """関数をワーカースレッドで実行し、結果をイベントとしてUIスレッドへ通知する
+
+        Args:
+            event (str): 完了時に発行するイベントキー
+            func (Callable[..., Any]): 実行する関数
+            *args (Any): 関数に渡す引数（結果と共にイベント値として渡される）
+        """
+        window = self.window.window
+
+        def task() -> None:
+            window.write_event_value(event, (args, self._capture(func, *args)))
+
+        self._executor.submit(task)
+
     def detect_and_update_disks(self) -> None:
         """ディスクを検出してGUIを更新する"""
+        self._show_detected_disks(self._capture(self.disk_manager.detect_disks))
+
+    def _show_detected_disks(self, disks: Any) -> None:
+        """検出結果をGUIに反映する
+
+        Args:
+            disks (Any): 検出されたディスクのリスト、または検出時の例外
+        """
         try:
-            disks = self.disk_manager.detect_disks()
+            if isinstance(disks, Exception):
+                raise disks
+            self._remember_disks(disks)
             self.window.update_disk_list(disks)
             self.logger.log_info(f"{len(disks)}台のディスクを検出しました")
         except Exception as e:
@@ -59,6 +164,57 @@ class Application:
             self.logger.log_error("エラーコード: DISK_001")
             self.window.show_error("ディスクの検出に失敗しました")
 
+    def _queue_detected_disks(self, disks: Any) -> None:
+        """検出結果のGUIへの反映を予約する
+
+        予約から反映までの間に届いた検出結果は最新のものだけを反映し、
+        続けて検出が行われてもディスク一覧の更新は一定間隔に1回にまとめる。
+        選択時に参照するディスクは反映を待たずに更新する
+
+        Args:
+            disks (Any): 検出されたディスクのリスト、または検出時の例外
+        """
+        if not isinstance(disks, Exception):
+            self._remember_disks(disks)
+        self._pending_disks = disks
+        if self._disk_flush_id is None:
+            self._disk_flush_id = self.window.window.TKroot.after(
+                _DISK_LIST_FLUSH_MS, self._flush_detected_disks
+            )
+
+    def _flush_detected_disks(self) -> None:
+        """予約された検出結果をGUIに反映する"""
+        self._disk_flush_id = None
+        disks, self._pending_disks = self._pending_disks, None
+        self._show_detected_disks(disks)
+
+    def _load_disks(self) -> List[Disk]:
+        """ディスクを検出し、選択時に参照できるよう保持する
+
+        Returns:
+            List[Disk]: 検出されたディスクのリスト
+        """
+        disks = self.disk_manager.detect_disks()
+        self._remember_disks(disks)
+        return disks
+
+    def _remember_disks(self, disks: List[Disk]) -> None:
+        """検出したディスクをデバイスパスで引けるよう保持する
+
+        Args:
+            disks (List[Disk]): 検出されたディスクのリスト
+        """
+        self._disks_by_path = {disk.device_path: disk for disk in disks}
+
+    def _refresh_disks_in_background(self) -> None:
+        """ディスクをワーカースレッドで再検出する
+
+        結果は"-DISKS_READY-"イベントで受け取り、ディスク一覧の表示と
+        選択時に参照するディスクの両方に同じ検出結果を使用する。
+        表示は_queue_detected_disksで一定間隔毎にまとめて行う
+        """
+        self._run_in_background("-DISKS_READY-", self.disk_manager.detect_disks)
+
     def handle_disk_selection(self, selected_disk: str) -> Optional[Disk]:
         """ディスク選択を処理する
 
@@ -70,12 +226,11 @@ class Application:
         """
         try:
             # 文字列からデバイスパスを抽出
-            device_path = selected_disk.split(" ")[0]
-            # 選択されたデバイスパスに一致するディスクを検索
-            disks = self.disk_manager.detect_disks()
-            for disk in disks:
-                if disk.device_path == device_path:
-                    return disk
+            device_path = selected_disk.split(" ", 1)[0]
+            # 検出済みのディスクから選択されたデバイスパスのディスクを取得
+            if not self._disks_by_path:
+                self._load_disks()
+            return self._disks_by_path.get(device_path)
         except Exception as e:
             self.logger.log_error(f"ディスクの選択に失敗しました: {e}")
             self.window.show_error("ディスクの選択に失敗しました")
@@ -87,11 +242,30 @@ class Application:
         Args:
             disk (Disk): マウント対象のディスク
 
+        Returns:
+            bool: マウントに成功した場合はTrue
+        """
+        return self._show_mount_result(
+            disk, self._capture(self.disk_manager.mount_disk, disk)
+        )
+
+    def _show_mount_result(self, disk: Disk, mounted: Any) -> bool:
+        """マウントの結果をGUIに反映する
+
+        Args:
+            disk (Disk): マウント対象のディスク
+            mounted (Any): マウントの成否、またはマウント時の例外
+
         Returns:
             bool: マウントに成功した場合はTrue
         """
         try:
-            if self.disk_manager.mount_disk(disk):
+            if isinstance(mounted, Exception):
+                raise mounted
+            if mounted:
+                # マウント状態が変わったため、保持しているディスクと走査結果を破棄する
+                self._disks_by_path = {}
+                self.file_handler.clear_scan_cache()
                 self.logger.log_info(f"{disk.device_path} をマウントしました")
                 return True
             else:
@@ -108,11 +282,30 @@ class Application:
         Args:
             disk (Disk): アンマウント対象のディスク
 
+        Returns:
+            bool: アンマウントに成功した場合はTrue
+        """
+        return self._show_unmount_result(
+            disk, self._capture(self.disk_manager.unmount_disk, disk)
+        )
+
+    def _show_unmount_result(self, disk: Disk, unmounted: Any) -> bool:
+        """アンマウントの結果をGUIに反映する
+
+        Args:
+            disk (Disk): アンマウント対象のディスク
+            unmounted (Any): アンマウントの成否、またはアンマウント時の例外
+
         Returns:
             bool: アンマウントに成功した場合はTrue
         """
         try:
-            if self.disk_manager.unmount_disk(disk):
+            if isinstance(unmounted, Exception):
+                raise unmounted
+            if unmounted:
+                # マウント状態が変わったため、保持しているディスクと走査結果を破棄する
+                self._disks_by_path = {}
+                self.file_handler.clear_scan_cache()
                 self.logger.log_info(f"{disk.device_path} をアンマウントしました")
                 return True
             else:
@@ -131,8 +324,20 @@ class Application:
         Args:
             disk (Disk): チェック対象のディスク
         """
+        self._show_disk_status(
+            disk, self._capture(self.disk_manager.check_filesystem, disk)
+        )
+
+    def _show_disk_status(self, disk: Disk, status: Any) -> None:
+        """ディスク状態のチェック結果をGUIに反映する
+
+        Args:
+            disk (Disk): チェック対象のディスク
+            status (Any): チェック結果、またはチェック時の例外
+        """
         try:
-            status = self.disk_manager.check_filesystem(disk)
+            if isinstance(status, Exception):
+                raise status
             self.window.display_disk_status(status)
             self.logger.log_info(f"{disk.device_path} の状態チェックが完了しました")
         except Exception as e:
@@ -145,49 +350,193 @@ class Application:
         Args:
             disk (Disk): 対象のディスク
         """
+        self._show_file_list(
+            self._capture(self.file_handler.list_files, self._mount_point(disk))
+        )
+
+    @staticmethod
+    def _mount_point(disk: Disk) -> str:
+        """ディスクのマウントポイントを返す
+
+        Args:
+            disk (Disk): 対象のディスク
+
+        Returns:
+            str: マウントポイントのパス
+        """
+        return f"/mnt/{disk.device_path.split('/')[-1]}"
+
+    def _show_file_list(self, files: Any) -> None:
+        """ファイル一覧の取得結果をGUIに反映する
+
+        Args:
+            files (Any): 取得したファイルのリスト、または取得時の例外
+        """
         try:
-            mount_point = f"/mnt/{disk.device_path.split('/')[-1]}"
-            files = self.file_handler.list_files(mount_point)
+            if isinstance(files, Exception):
+                raise files
             self.window.update_file_tree(files)
             self.logger.log_info(f"{len(files)}個のファイルを検出しました")
         except Exception as e:
             self.logger.log_error(f"ファイル一覧の更新に失敗しました: {e}")
             self.window.show_error("ファイル一覧の更新に失敗しました")
 
+    def _schedule_file_refresh(self, disk: Disk) -> None:
+        """ファイル一覧の再読み込みを予約する
+
+        短時間に続けて呼び出された場合は予約済みの読み込みを取り消し、
+        最後の呼び出しの分だけをワーカースレッドで読み込む
+
+        Args:
+            disk (Disk): 対象のディスク
+        """
+        root = self.window.window.TKroot
+        if self._pending_refresh_id is not None:
+            root.after_cancel(self._pending_refresh_id)
+
+        def refresh() -> None:
+            self._pending_refresh_id = None
+            self._run_in_background(
+                "-FILES_READY-", self.file_handler.list_files, self._mount_point(disk)
+            )
+
+        self._pending_refresh_id = root.after(_FILE_REFRESH_DELAY_MS, refresh)
+
     def copy_files(self, files: List[File], destination: str) -> None:
-        """ファイルをコピーする
+        """ファイルをコピーし、完了するまで待つ
+
+        コピーの通知はFileHandlerのワーカースレッドから行われるため、キューを介して
+        受け取り、GUIへの反映は呼び出し元のスレッドで行う
 
         Args:
             files (List[File]): コピー対象のファイル
             destination (str): コピー先のパス
         """
+        events: "queue.Queue[Optional[Tuple[str, Any]]]" = queue.Queue()
+        future = self._executor.submit(
+            self._copy_files,
+            files,
+            destination,
+            lambda event, value: events.put((event, value)),
+        )
+        # 全ての通知がキューに入った後にNoneを入れ、受け取りを終える
+        future.add_done_callback(lambda _: events.put(None))
+        for event, value in iter(events.get, None):
+            self._apply_copy_event(event, value)
+        future.result()
+
+    def _copy_files(
+        self,
+        files: List[File],
+        destination: str,
+        notify: Callable[[str, Any], None],
+    ) -> None:
+        """ファイルをコピーし、進捗とエラーを通知する
+
+        ファイルはまとめてFileHandlerに渡し、コピーが完了したファイルから順に
+        検証と進捗の通知を行う。
+        GUIを直接操作しないため、ワーカースレッドからも呼び出せる。
+
+        Args:
+            files (List[File]): コピー対象のファイル
+            destination (str): コピー先のパス
+            notify (Callable[[str, Any], None]): イベントキーと値を受け取る通知先
+        """
         try:
             total_files = len(files)
-            for i, file in enumerate(files, 1):
-                progress = int((i / total_files) * 100)
-                self.window.update_progress(
-                    progress, f"{file.path} をコピー中... ({i}/{total_files})"
-                )
+            # HDDへの並列書き込みはシークが増えて遅くなるため1ファイルずつ処理する
+            if self.disk_manager.is_rotational(destination):
+                max_workers = 1
+            else:
+                max_workers = _COPY_PIPELINE_MAX_WORKERS
 
-                if self.file_handler.copy_files([file], destination):
-                    if self.file_handler.verify_copy(
-                        file.path,
-                        os.path.join(destination, os.path.basename(file.path)),
-                    ):
-                        self.logger.log_info(f"{file.path} のコピーが完了しました")
-                    else:
-                        self.logger.log_error(f"{file.path} のコピー検証に失敗しました")
-                        self.window.show_error(
-                            f"{file.path} のコピー検証に失敗しました"
-                        )
-                else:
-                    self.logger.log_error(f"{file.path} のコピーに失敗しました")
-                    self.window.show_error(f"{file.path} のコピーに失敗しました")
-
-            self.window.update_progress(100, "すべてのファイルのコピーが完了しました")
+            # FileHandlerと同じ規則でコピー先を決め、同名のファイルも個別に検証する
+            dest_paths = dict(
+                zip(
+                    (file.path for file in files),
+                    destination_paths(files, destination),
+                )
+            )
+            lock = threading.Lock()
+            done = 0
+            last_progress = -1
+            last_update = float("-inf")
+
+            def on_copied(file: File, error: Optional[Exception]) -> None:
+                nonlocal done, last_progress, last_update
+                # 検証はコピーを行ったワーカースレッドで続けて行い、他のファイルのコピーと重ねる
+                message = self._verify_copied(file, dest_paths[file.path], error)
+                if message:
+                    notify("-COPY_ERROR-", message)
+
+                with lock:
+                    done += 1
+                    # 進捗の通知は値が変わった時に一定間隔で間引いて行い、
+                    # 最後のファイルは必ず通知する
+                    progress = done * 100 // total_files
+                    if done != total_files:
+                        if progress == last_progress:
+                            return
+                        now = time.monotonic()
+                        if now - last_update < _COPY_PROGRESS_INTERVAL:
+                            return
+                        last_update = now
+                    last_progress = progress
+                    notify(
+                        "-COPY_PROGRESS-",
+                        (
+                            progress,
+                            f"{file.path} をコピーしました ({done}/{total_files})",
+                        ),
+                    )
+
+            self.file_handler.copy_files(
+                files, destination, progress_cb=on_copied, max_workers=max_workers
+            )
+            notify("-COPY_DONE-", (100, "すべてのファイルのコピーが完了しました"))
         except Exception as e:
             self.logger.log_error(f"ファイルコピー中にエラーが発生しました: {e}")
-            self.window.show_error("ファイルコピー中にエラーが発生しました")
+            notify("-COPY_ERROR-", "ファイルコピー中にエラーが発生しました")
+
+    def _verify_copied(
+        self, file: File, dest_path: str, error: Optional[Exception]
+    ) -> Optional[str]:
+        """コピーが完了したファイルを検証する
+
+        Args:
+            file (File): コピー対象のファイル
+            dest_path (str): コピー先ファイルのパス
+            error (Optional[Exception]): コピー時に発生した例外
+
+        Returns:
+            Optional[str]: 失敗した場合はエラーメッセージ、成功した場合はNone
+        """
+        if error is not None:
+            self.logger.log_error(f"{file.path} のコピーに失敗しました")
+            return f"{file.path} のコピーに失敗しました"
+
+        # 読み込み不良のディスクからの復旧のため、ページキャッシュではなく
+        # コピー先のディスクに書き込まれた内容を検証する
+        if not self.file_handler.verify_copy(
+            file.path, dest_path, verify_mode="ondisk"
+        ):
+            self.logger.log_error(f"{file.path} のコピー検証に失敗しました")
+            return f"{file.path} のコピー検証に失敗しました"
+
+        self.logger.log_info(f"{file.path} のコピーが完了しました")
+        return None
+
+    def _apply_copy_event(self, event: str, value: Any) -> None:
+        """コピー処理からの通知をGUIに反映する
+
+        Args:
+            event (str): イベントキー
+            value (Any): イベントの値
+        """
+        if event in ("-COPY_PROGRESS-", "-COPY_DONE-"):
+            self.window.update_progress(*value)
+        elif event == "-COPY_ERROR-":
+            self.window.show_error(value)
 
     def run(self) -> None:
         """アプリケーションのメインループを実行する"""
@@ -196,7 +545,7 @@ class Application:
             return
 
         self.window.create_window()
-        self.detect_and_update_disks()
+        self._refresh_disks_in_background()
 
         while True:
             if not self.window.window:
@@ -210,30 +559,70 @@ class Application:
             elif event == "-HELP-":
                 self.window.show_help()
 
+            elif event == "-FLUSH_ERRORS-":
+                self.window.flush_errors()
+
             elif event == "-DISK_LIST-" and values["-DISK_LIST-"]:
                 disk = self.handle_disk_selection(values["-DISK_LIST-"][0])
                 if disk:
                     self.window.current_disk = disk
-                    self.check_disk_status(disk)
+                    self._run_in_background(
+                        "-DISK_STATUS_READY-", self.disk_manager.check_filesystem, disk
+                    )
+
+            elif event == "-DISKS_READY-":
+                _, disks = values[event]
+                self._queue_detected_disks(disks)
+
+            elif event == "-DISK_STATUS_READY-":
+                (disk,), status = values[event]
+                self._show_disk_status(disk, status)
 
             elif event == "-MOUNT-":
+                # mountは故障したディスクで長時間応答しないことがあるため、
+                # ワーカースレッドで実行し、結果は"-MOUNT_READY-"で受け取る
                 if self.window.current_disk:
-                    if self.mount_disk(self.window.current_disk):
-                        self.update_file_list(self.window.current_disk)
+                    self._run_in_background(
+                        "-MOUNT_READY-",
+                        self.disk_manager.mount_disk,
+                        self.window.current_disk,
+                    )
+
+            elif event == "-MOUNT_READY-":
+                (disk,), mounted = values[event]
+                if self._show_mount_result(disk, mounted):
+                    self._refresh_disks_in_background()
+                    self._schedule_file_refresh(disk)
+
+            elif event == "-FILES_READY-":
+                _, files = values[event]
+                self._show_file_list(files)
 
             elif event == "-UNMOUNT-":
                 if self.window.current_disk:
-                    self.unmount_disk(self.window.current_disk)
+                    self._run_in_background(
+                        "-UNMOUNT_READY-",
+                        self.disk_manager.unmount_disk,
+                        self.window.current_disk,
+                    )
+
+            elif event == "-UNMOUNT_READY-":
+                (disk,), unmounted = values[event]
+                if self._show_unmount_result(disk, unmounted):
+                    self._refresh_disks_in_background()
+
+            elif event == "-FILE_TREE-_OPEN":
+                self.window.expand_node(self.window.get_focused_tree_key())
 
             elif event == "-FILE_TREE-":
                 if values["-FILE_TREE-"]:
-                    self.window.selected_files = values["-FILE_TREE-"]
+                    self.window.select_files(values["-FILE_TREE-"])
 
             elif event == "-SELECT_ALL-":
                 if self.window.window["-FILE_TREE-"].get_children():
-                    self.window.selected_files = self.window.window[
-                        "-FILE_TREE-"
-                    ].get_children()
+                    self.window.select_files(
+                        self.window.window["-FILE_TREE-"].get_children()
+                    )
 
             elif event == "-DESELECT-":
                 self.window.selected_files = []
@@ -247,10 +636,19 @@ class Application:
                     self.window.show_error("コピー先を指定してください")
                     continue
 
-                self.copy_files(self.window.selected_files, values["-DEST_PATH-"])
+                self._executor.submit(
+                    self._copy_files,
+                    self.window.selected_files,
+                    values["-DEST_PATH-"],
+                    self.window.window.write_event_value,
+                )
+
+            elif event in ("-COPY_PROGRESS-", "-COPY_DONE-", "-COPY_ERROR-"):
+                self._apply_copy_event(event, values[event])
 
+        self._executor.shutdown(wait=False)
         self.window.close()
-        self.logger.save_logs("salvage_program.log")
+        self.logger.close()
 
 
 def main() -> None:
@@ -5,54 +5,286 @@ JSDoc: ユーティリティモジュール - ログ機能
 制限: Linux環境（LubuntuまたはUbuntuベース）での動作を前提とする
 """
 
-from typing import Optional
-import datetime
+from collections import deque
+from logging.handlers import MemoryHandler, RotatingFileHandler
+from typing import Any, Deque, List, Optional, Tuple
+import atexit
+import functools
+import logging
+import queue
+import sys
+import threading
+import time
+
+# ログレベル（ログエントリの先頭要素）
+LEVEL_DEBUG = 0
+LEVEL_INFO = 1
+LEVEL_ERROR = 2
+LEVEL_WARNING = 3
+# ログレベルの表示名（ログレベルの値で参照する）
+_LEVEL_NAMES = ("DEBUG", "INFO", "ERROR", "WARNING")
+# ログレベルに対応する標準loggingのレベル
+_STDLIB_LEVELS = (logging.DEBUG, logging.INFO, logging.ERROR, logging.WARNING)
+
+# メモリ上に保持するログエントリの上限（超えた分は古いものから破棄する）
+_MAX_LOG_ENTRIES = 10000
+# ログファイルへ書き出すまでにメモリ上でバッファするレコード数
+_FILE_BUFFER_CAPACITY = 1024
+# バッファ中のログをログファイルへ書き出す間隔（秒）
+_FILE_FLUSH_INTERVAL = 0.5
+# ログファイルをローテーションするサイズ（バイト）と保持する世代数
+_LOG_FILE_MAX_BYTES = 10_000_000
+_LOG_FILE_BACKUP_COUNT = 3
+# 標準出力へまとめて書き出す間隔（秒）と最大件数
+_ECHO_FLUSH_INTERVAL = 0.1
+_ECHO_BATCH_SIZE = 64
+
+# 秒単位の時刻文字列をキャッシュする件数
+_TIMESTAMP_CACHE_SIZE = 64
+
+# ログエントリ: (ログレベル, 記録時刻[ns], メッセージ, 書式に埋め込む値)
+LogEntry = Tuple[int, int, str, Tuple[Any, ...]]
+
+
+@functools.lru_cache(maxsize=_TIMESTAMP_CACHE_SIZE)
+def _format_seconds(seconds: int) -> str:
+    """秒単位の時刻を文字列に整形する（同じ秒の整形はキャッシュする）
+
+    Args:
+        seconds (int): UNIX時刻（秒）
+
+    Returns:
+        str: "YYYY-MM-DD HH:MM:SS"形式の時刻
+    """
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(seconds))
+
+
+def _format(entry: LogEntry) -> str:
+    """ログエントリを1行の文字列に整形する
+
+    Args:
+        entry (LogEntry): 整形するログエントリ
+
+    Returns:
+        str: 整形されたログ
+    """
+    level, timestamp_ns, message, args = entry
+    if args:
+        message = message % args
+    seconds, nanoseconds = divmod(timestamp_ns, 1_000_000_000)
+    timestamp = _format_seconds(seconds)
+    # datetimeの文字列表現と同じく、マイクロ秒が0の場合は省略する
+    microseconds = nanoseconds // 1000
+    if microseconds:
+        timestamp = f"{timestamp}.{microseconds:06d}"
+    return f"{_LEVEL_NAMES[level]} [{timestamp}]: {message}"
 
 
 class Logger:
     """
     ログ管理を行うクラス
 
+    ログは記録時にはエントリとして保持するだけで、文字列への整形は
+    保存・エクスポート時（verboseの場合は標準出力への表示時）にのみ行う。
+    標準出力への表示はバックグラウンドのスレッドがまとめて行う。
+    メモリ上には直近のエントリのみを保持し、log_pathを指定した場合は
+    全てのログをバッファ経由でローテーションするログファイルへ書き出す。
+    ログファイルへの書き出しはバッファが一杯になった時と一定間隔毎に
+    バックグラウンドのスレッドがまとめて行い、終了時にも書き出す
+
+    Attributes:
+        logs (Deque[LogEntry]): 記録された直近のログエントリ
+        debug_enabled (bool): デバッグログを記録するかどうか
+        verbose (bool): 記録したログを標準出力にも表示するかどうか
+
     Methods:
-        log_info(message: str) -> None: 情報ログの記録
-        log_error(message: str) -> None: エラーログの記録
-        log_warning(message: str) -> None: 警告ログの記録
+        log_debug(message: str, *args: Any) -> None: デバッグログの記録
+        log_info(message: str, *args: Any) -> None: 情報ログの記録
+        log_error(message: str, *args: Any) -> None: エラーログの記録
+        log_warning(message: str, *args: Any) -> None: 警告ログの記録
         save_logs(path: str) -> bool: ログファイル保存
         export_operation_history() -> str: 操作履歴のエクスポート
+        flush() -> None: 標準出力への表示の完了を待つ
+        close() -> None: ログファイルへの書き出しを完了する
     """
 
-    def __init__(self) -> None:
-        self.logs = []
+    def __init__(self, verbose: bool = False, log_path: Optional[str] = None) -> None:
+        self.logs: Deque[LogEntry] = deque(maxlen=_MAX_LOG_ENTRIES)
+        self.debug_enabled = False
+        self.verbose = verbose
+        self._file_logger: Optional[logging.Logger] = None
+        self._echo_queue: Optional["queue.Queue[Optional[LogEntry]]"] = None
+        self._echo_lock = threading.Lock()
+        self._file_flush_stop: Optional[threading.Event] = None
+        if log_path:
+            self._file_logger = self._open_log_file(log_path)
+            self._file_flush_stop = threading.Event()
+            threading.Thread(
+                target=self._flush_file_periodically,
+                args=(self._file_logger, self._file_flush_stop),
+                daemon=True,
+            ).start()
+            # close()が呼ばれずに終了した場合もバッファ中のログを失わないようにする
+            atexit.register(self.close)
 
-    def log_info(self, message: str) -> None:
-        """情報ログを記録する
+    @staticmethod
+    def _open_log_file(path: str) -> logging.Logger:
+        """ログファイルへ書き出す標準loggingのロガーを作成する
+
+        Args:
+            path (str): ログファイルのパス
+
+        Returns:
+            logging.Logger: ログファイルへ書き出すロガー
+        """
+        file_handler = RotatingFileHandler(
+            path,
+            maxBytes=_LOG_FILE_MAX_BYTES,
+            backupCount=_LOG_FILE_BACKUP_COUNT,
+            encoding="utf-8",
+            delay=True,
+        )
+        file_handler.setFormatter(
+            logging.Formatter("%(levelname)s [%(asctime)s]: %(message)s")
+        )
+        file_logger = logging.getLogger(f"salvage.{path}")
+        file_logger.setLevel(logging.DEBUG)
+        file_logger.propagate = False
+        for handler in list(file_logger.handlers):
+            file_logger.removeHandler(handler)
+            handler.close()
+        # エラーログ毎の書き出しは行わず、書き出しは一定間隔のフラッシュに任せる
+        file_logger.addHandler(
+            MemoryHandler(
+                _FILE_BUFFER_CAPACITY,
+                flushLevel=logging.CRITICAL + 1,
+                target=file_handler,
+            )
+        )
+        return file_logger
+
+    @staticmethod
+    def _flush_file_periodically(
+        file_logger: logging.Logger, stop: threading.Event
+    ) -> None:
+        """停止されるまで一定間隔毎にバッファ中のログをログファイルへ書き出す
 
         Args:
+            file_logger (logging.Logger): ログファイルへ書き出すロガー
+            stop (threading.Event): 書き出しを停止するイベント
+        """
+        while not stop.wait(_FILE_FLUSH_INTERVAL):
+            for handler in list(file_logger.handlers):
+                try:
+                    handler.flush()
+                except Exception:
+                    # 書き出しの失敗でログの記録を止めないよう、次の間隔で再試行する
+                    pass
+
+    def _record(self, level: int, message: str, args: Tuple[Any, ...]) -> None:
+        """ログエントリを記録する
+
+        Args:
+            level (int): ログレベル
             message (str): 記録するメッセージ
+            args (Tuple[Any, ...]): 書式に埋め込む値
+        """
+        entry = (level, time.time_ns(), message, args)
+        self.logs.append(entry)
+        if self._file_logger is not None:
+            self._file_logger.log(_STDLIB_LEVELS[level], message, *args)
+        if self.verbose:
+            if self._echo_queue is None:
+                self._start_echo()
+            self._echo_queue.put_nowait(entry)
+
+    def _start_echo(self) -> None:
+        """標準出力へ書き出すスレッドを開始する"""
+        with self._echo_lock:
+            if self._echo_queue is not None:
+                return
+            echo_queue: "queue.Queue[Optional[LogEntry]]" = queue.Queue()
+            threading.Thread(
+                target=self._drain_echo, args=(echo_queue,), daemon=True
+            ).start()
+            self._echo_queue = echo_queue
+
+    @staticmethod
+    def _drain_echo(echo_queue: "queue.Queue[Optional[LogEntry]]") -> None:
+        """キューのログエントリを一定間隔・一定件数毎にまとめて標準出力へ書き出す
+
+        Noneを受け取った場合は書き出しを要求されたものとして、間隔を待たずに
+        それまでのログエントリを書き出す
+
+        Args:
+            echo_queue (queue.Queue[Optional[LogEntry]]): 表示するログエントリのキュー
+        """
+        while True:
+            entry = echo_queue.get()
+            received = 1
+            batch: List[LogEntry] = [] if entry is None else [entry]
+            deadline = time.monotonic() + _ECHO_FLUSH_INTERVAL
+            while entry is not None and len(batch) < _ECHO_BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = echo_queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                received += 1
+                if entry is not None:
+                    batch.append(entry)
+            try:
+                if batch:
+                    sys.stdout.write("".join(_format(entry) + "\n" for entry in batch))
+                    sys.stdout.flush()
+            except Exception:
+                # 表示の失敗でログの記録を止めないよう、表示できなかった分は破棄する
+                pass
+            finally:
+                for _ in range(received):
+                    echo_queue.task_done()
+
+    def log_debug(self, message: str, *args: Any) -> None:
+        """デバッグログを記録する
+
+        ファイル毎の詳細など件数の多いログに使用し、debug_enabledがFalseの場合は
+        記録せずに破棄する
+
+        Args:
+            message (str): 記録するメッセージ（%形式の書式を指定可能）
+            *args (Any): 書式に埋め込む値
+        """
+        if self.debug_enabled:
+            self._record(LEVEL_DEBUG, message, args)
+
+    def log_info(self, message: str, *args: Any) -> None:
+        """情報ログを記録する
+
+        Args:
+            message (str): 記録するメッセージ（%形式の書式を指定可能）
+            *args (Any): 書式に埋め込む値
         """
-        log_entry = f"INFO [{datetime.datetime.now()}]: {message}"
-        self.logs.append(log_entry)
-        print(log_entry)
+        self._record(LEVEL_INFO, message, args)
 
-    def log_error(self, message: str) -> None:
+    def log_error(self, message: str, *args: Any) -> None:
         """エラーログを記録する
 
         Args:
-            message (str): 記録するエラーメッセージ
+            message (str): 記録するエラーメッセージ（%形式の書式を指定可能）
+            *args (Any): 書式に埋め込む値
         """
-        log_entry = f"ERROR [{datetime.datetime.now()}]: {message}"
-        self.logs.append(log_entry)
-        print(log_entry)
+        self._record(LEVEL_ERROR, message, args)
 
-    def log_warning(self, message: str) -> None:
+    def log_warning(self, message: str, *args: Any) -> None:
         """警告ログを記録する
 
         Args:
-            message (str): 記録する警告メッセージ
+            message (str): 記録する警告メッセージ（%形式の書式を指定可能）
+            *args (Any): 書式に埋め込む値
         """
-        log_entry = f"WARNING [{datetime.datetime.now()}]: {message}"
-        self.logs.append(log_entry)
-        print(log_entry)
+        self._record(LEVEL_WARNING, message, args)
 
     def save_logs(self, path: str) -> bool:
         """ログファイルを指定のパスに保存する
@@ -66,7 +298,7 @@ class Logger:
         try:
             with open(path, "w", encoding="utf-8") as f:
                 for entry in self.logs:
-                    f.write(entry + "\n")
+                    f.write(_format(entry) + "\n")
             return True
         except Exception as e:
             self.log_error(f"ログの保存に失敗しました: {e}")
@@ -79,4 +311,33 @@ class Logger:
             str: エクスポートされた操作履歴
         """
         # TODO: 必要に応じて操作履歴の形式を整形して返す
-        return "\n".join(self.logs)
+        return "\n".join(_format(entry) for entry in self.logs)
+
+    def flush(self) -> None:
+        """標準出力への表示待ちのログが全て書き出されるまで待つ
+
+        表示用のスレッドへ書き出しを要求し、まとめる間隔の経過を待たずに書き出させる
+        """
+        if self._echo_queue is not None:
+            self._echo_queue.put_nowait(None)
+            self._echo_queue.join()
+
+    def close(self) -> None:
+        """バッファ中のログをログファイルへ書き出して閉じる"""
+        self.flush()
+        if self._file_flush_stop is not None:
+            self._file_flush_stop.set()
+        if self._file_logger is None:
+            return
+        for handler in list(self._file_logger.handlers):
+            self._file_logger.removeHandler(handler)
+            target = getattr(handler, "target", None)
+            # MemoryHandlerはclose時にバッファを書き出し先へフラッシュする
+            handler.close()
+            if target is not None:
+                target.close()
+        self._file_logger = None
+
+
+# モジュール全体で共有するロガー
+logger = Logger()
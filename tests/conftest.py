@@ -2,12 +2,41 @@
 
 import sys
 import pytest
+from unittest.mock import MagicMock
+from src.main import Application
 
+# 実行環境と一致しない場合にスキップするマーカーとスキップ理由
+_PLATFORM_MARKERS = {
+    "linux_only": ("linux", "このテストはLinux環境でのみ実行されます"),
+    "windows_only": ("win32", "このテストはWindows環境でのみ実行されます"),
+}
 
-def pytest_runtest_setup(item):
-    """テスト実行前の環境チェック"""
-    for marker in item.iter_markers():
-        if marker.name == "linux_only" and sys.platform != "linux":
-            pytest.skip("このテストはLinux環境でのみ実行されます")
-        elif marker.name == "windows_only" and sys.platform != "win32":
-            pytest.skip("このテストはWindows環境でのみ実行されます")
+
+# Applicationのフィクスチャでモックに差し替えるsrc.mainの依存クラス
+_APPLICATION_DEPENDENCIES = ("MainWindow", "DiskManager", "FileHandler", "Logger")
+
+
+@pytest.fixture
+def app(monkeypatch):
+    """GUI・ディスク操作・ファイル操作・ログをモックにしたアプリケーションのフィクスチャ"""
+    for name in _APPLICATION_DEPENDENCIES:
+        monkeypatch.setattr(f"src.main.{name}", MagicMock())
+    return Application()
+
+
+def pytest_collection_modifyitems(config, items):
+    """収集したテストのうち、実行環境と一致しないものにスキップを設定する
+
+    実行環境の判定は収集時に1回だけ行い、テスト毎には行わない
+    """
+    skips = {
+        name: pytest.mark.skip(reason=reason)
+        for name, (platform, reason) in _PLATFORM_MARKERS.items()
+        if sys.platform != platform
+    }
+    if not skips:
+        return
+    for item in items:
+        for name, skip in skips.items():
+            if name in item.keywords:
+                item.add_marker(skip)
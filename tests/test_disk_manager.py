@@ -5,15 +5,18 @@ DiskManagerクラスのテストモジュール
 """
 
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 from src.disk_operations.disk_manager import (
     DiskManager,
     Disk,
     FilesystemStatus,
     DiskInfo,
+    _spawn_options,
+    _INFO_CACHE_TTL,
 )
 import subprocess
 import os
+import sys
 import json
 
 
@@ -63,6 +66,22 @@ def test_detect_disks(mock_check_output, disk_manager):
     assert disks[0].health_status == "PASSED"
 
 
+@pytest.mark.linux_only
+@patch("subprocess.check_output")
+def test_detect_disks_cached(mock_check_output, disk_manager):
+    """ディスク検出結果のキャッシュのテスト（Linux環境専用）"""
+    lsblk_output = {"blockdevices": [{"name": "sda", "size": "10G"}]}
+    mock_check_output.return_value = json.dumps(lsblk_output).encode()
+
+    first = disk_manager.detect_disks()
+    second = disk_manager.detect_disks()
+    assert mock_check_output.call_count == 1
+    assert [d.device_path for d in first] == [d.device_path for d in second]
+
+    disk_manager.refresh()
+    assert mock_check_output.call_count == 2
+
+
 @pytest.mark.linux_only
 @patch("subprocess.check_output")
 def test_detect_disks_error(mock_check_output, disk_manager):
@@ -108,21 +127,24 @@ def test_unmount_disk_failure(mock_run, disk_manager, mock_disk):
 
 
 @pytest.mark.linux_only
-@patch("subprocess.check_output")
-def test_check_filesystem_ext4_success(mock_check_output, disk_manager, mock_disk):
+@patch("subprocess.run")
+def test_check_filesystem_ext4_success(mock_run, disk_manager, mock_disk):
     """ext4ファイルシステムチェックの成功テスト（Linux環境専用）"""
-    mock_check_output.return_value = b"Pass 1: Checking inodes, blocks, and sizes"
+    mock_run.return_value.returncode = 0
+    mock_run.return_value.stdout = b"Pass 1: Checking inodes, blocks, and sizes"
     status = disk_manager.check_filesystem(mock_disk)
 
     assert status.is_consistent is True
     assert "Pass 1" in status.details
+    assert mock_run.call_args.args[0] == ["fsck.ext4", "-n", mock_disk.device_path]
 
 
 @pytest.mark.linux_only
-@patch("subprocess.check_output")
-def test_check_filesystem_ext4_failure(mock_check_output, disk_manager, mock_disk):
+@patch("subprocess.run")
+def test_check_filesystem_ext4_failure(mock_run, disk_manager, mock_disk):
     """ext4ファイルシステムチェックの失敗テスト（Linux環境専用）"""
-    mock_check_output.side_effect = subprocess.CalledProcessError(1, "fsck.ext4")
+    mock_run.return_value.returncode = 4
+    mock_run.return_value.stdout = b""
     status = disk_manager.check_filesystem(mock_disk)
 
     assert status.is_consistent is False
@@ -130,28 +152,51 @@ def test_check_filesystem_ext4_failure(mock_check_output, disk_manager, mock_dis
 
 
 @pytest.mark.linux_only
-@patch("subprocess.check_output")
-def test_check_filesystem_ntfs_success(mock_check_output, disk_manager):
+@patch("subprocess.run")
+def test_check_filesystem_ntfs_success(mock_run, disk_manager):
     """ntfsファイルシステムチェックの成功テスト（Linux環境専用）"""
     ntfs_disk = Disk("/dev/sdb1", 500 * 1024 * 1024 * 1024, "ntfs", False, "PASSED")
-    mock_check_output.return_value = b"NTFS volume version 3.1"
+    mock_run.return_value.returncode = 0
+    mock_run.return_value.stdout = b"NTFS volume version 3.1"
     status = disk_manager.check_filesystem(ntfs_disk)
 
     assert status.is_consistent is True
-    assert "NTFS" in status.details
+    assert "整合性" in status.details
 
 
 @pytest.mark.linux_only
-@patch("subprocess.check_output")
-def test_check_filesystem_ntfs_failure(mock_check_output, disk_manager):
+@patch("subprocess.run")
+def test_check_filesystem_ntfs_failure(mock_run, disk_manager):
     """ntfsファイルシステムチェックの失敗テスト（Linux環境専用）"""
     ntfs_disk = Disk("/dev/sdb1", 500 * 1024 * 1024 * 1024, "ntfs", False, "PASSED")
-    mock_check_output.side_effect = subprocess.CalledProcessError(1, "ntfsfix")
+    mock_run.return_value.returncode = 1
+    mock_run.return_value.stdout = b""
     status = disk_manager.check_filesystem(ntfs_disk)
 
     assert status.is_consistent is False
     assert "エラー" in status.details
 
+    mock_run.return_value.stdout = b"NTFS signature is missing."
+    status = disk_manager.check_filesystem(ntfs_disk)
+    assert status.details == "NTFS signature is missing."
+
+
+@pytest.mark.linux_only
+@patch("subprocess.run")
+def test_check_filesystems(mock_run, disk_manager, mock_disk):
+    """複数ディスクのファイルシステムチェックのテスト（Linux環境専用）"""
+    mock_run.return_value.returncode = 0
+    mock_run.return_value.stdout = b"/dev/sda1: clean, 11/65536 files"
+    unsupported_disk = Disk(
+        "/dev/sdb1", 500 * 1024 * 1024 * 1024, "hfs+", False, "PASSED"
+    )
+
+    statuses = disk_manager.check_filesystems([mock_disk, unsupported_disk])
+
+    assert statuses["/dev/sda1"].is_consistent is True
+    assert statuses["/dev/sdb1"].is_consistent is False
+    assert disk_manager.check_filesystems([]) == {}
+
 
 @pytest.mark.linux_only
 def test_check_filesystem_unsupported(disk_manager):
@@ -169,21 +214,258 @@ def test_check_filesystem_unsupported(disk_manager):
 @patch("subprocess.check_output")
 def test_get_disk_info_success(mock_check_output, disk_manager, mock_disk):
     """ディスク情報取得の成功テスト（Linux環境専用）"""
-    # テスト用のコマンド出力を用意
+    # テスト用のコマンド出力を用意（lsblkの全列出力とsmartctlのJSON出力）
     mock_check_output.side_effect = [
         json.dumps(
-            {"model": "Samsung SSD 860 EVO", "serial": "S3YJNB0K500001"}
+            {
+                "blockdevices": [
+                    {
+                        "name": "sda",
+                        "path": "/dev/sda",
+                        "model": "Samsung SSD 860 EVO",
+                        "serial": "S3YJNB0K500001",
+                        "pttype": "gpt",
+                        "children": [
+                            {
+                                "name": "sda1",
+                                "path": "/dev/sda1",
+                                "pkname": "sda",
+                                "model": None,
+                                "serial": None,
+                                "pttype": "gpt",
+                            }
+                        ],
+                    }
+                ]
+            }
         ).encode(),
-        b'TYPE="gpt"',
         json.dumps({"smart_status": {"passed": True}}).encode(),
     ]
 
-    disk_info = disk_manager.get_disk_info(mock_disk)
+    with patch.object(disk_manager, "_read_sysfs_identity", return_value=None):
+        disk_info = disk_manager.get_disk_info(mock_disk)
 
     assert disk_info.model == "Samsung SSD 860 EVO"
     assert disk_info.serial == "S3YJNB0K500001"
     assert disk_info.partition_table == "gpt"
     assert disk_info.smart_status["passed"] is True
+    assert mock_check_output.call_count == 2
+
+
+@pytest.mark.linux_only
+@patch("subprocess.check_output")
+def test_get_disk_info_shared_lsblk_cache(mock_check_output, disk_manager):
+    """取得済みのlsblkの出力を複数ディスクで共有するテスト（Linux環境専用）"""
+    lsblk_cache = {
+        f"/dev/sd{name}": {"model": f"Disk {name}", "serial": name, "pttype": "gpt"}
+        for name in "ab"
+    }
+    mock_check_output.return_value = json.dumps({"smart_status": {"passed": True}})
+
+    with patch.object(disk_manager, "_read_sysfs_identity", return_value=None):
+        for name in "ab":
+            disk = Disk(f"/dev/sd{name}", 0, "ext4", False, "")
+            disk_info = disk_manager.get_disk_info(disk, lsblk_cache=lsblk_cache)
+            assert disk_info.model == f"Disk {name}"
+
+    # smartctlのみがディスク毎に実行される
+    assert mock_check_output.call_count == 2
+    assert all(c.args[0][0] == "smartctl" for c in mock_check_output.call_args_list)
+
+
+@pytest.mark.linux_only
+@patch("subprocess.run")
+@patch("subprocess.check_output")
+def test_lsblk_cache_hit_skips_subprocess(
+    mock_check_output, mock_run, disk_manager, mock_disk
+):
+    """lsblkの出力をマウントまで再利用するテスト（Linux環境専用）"""
+    lsblk_output = json.dumps(
+        {"blockdevices": [{"name": "sda1", "path": "/dev/sda1", "pttype": "gpt"}]}
+    )
+    smart_output = json.dumps({"smart_status": {"passed": True}})
+    mock_check_output.side_effect = lambda command, **kwargs: (
+        lsblk_output if command[0] == "lsblk" else smart_output
+    )
+
+    with patch.object(disk_manager, "_read_sysfs_identity", return_value=None):
+        disk_manager.get_disk_info(mock_disk, refresh=True)
+        disk_manager.get_disk_info(mock_disk, refresh=True)
+        lsblk_calls = [
+            c for c in mock_check_output.call_args_list if c.args[0][0] == "lsblk"
+        ]
+        assert len(lsblk_calls) == 1
+
+        # マウントするとキャッシュを破棄して再取得する
+        with patch("os.makedirs"):
+            assert disk_manager.mount_disk(mock_disk) is True
+        disk_manager.get_disk_info(mock_disk)
+        lsblk_calls = [
+            c for c in mock_check_output.call_args_list if c.args[0][0] == "lsblk"
+        ]
+        assert len(lsblk_calls) == 2
+
+
+@pytest.mark.linux_only
+def test_detect_and_enrich_many_disks(disk_manager):
+    """100台のディスクの詳細情報を並行して取得するテスト（Linux環境専用）"""
+    disks = [Disk(f"/dev/sd{i}", 0, "ext4", False, "") for i in range(100)]
+    lsblk_cache = {disk.device_path: {} for disk in disks}
+    attempts = {}
+
+    def get_disk_info(disk, refresh=False, lsblk_cache=None):
+        attempts[disk.device_path] = attempts.get(disk.device_path, 0) + 1
+        # 1台だけ並行取得に失敗し、順次の再取得で成功する
+        if disk.device_path == "/dev/sd7" and attempts[disk.device_path] == 1:
+            raise RuntimeError("一時的な失敗")
+        return DiskInfo(disk.device_path, "", "gpt", {})
+
+    with patch.object(disk_manager, "detect_disks", return_value=disks), patch.object(
+        disk_manager, "refresh_lsblk_cache", return_value=lsblk_cache
+    ) as mock_refresh, patch.object(
+        disk_manager, "refresh_smart_cache", return_value={}
+    ), patch.object(
+        disk_manager, "get_disk_info", side_effect=get_disk_info
+    ):
+        results = disk_manager.detect_and_enrich()
+
+    mock_refresh.assert_called_once()
+    assert [disk for disk, _ in results] == disks
+    assert all(info.model == disk.device_path for disk, info in results)
+    assert attempts["/dev/sd7"] == 2
+
+
+@pytest.mark.linux_only
+@patch("subprocess.check_output")
+def test_refresh_smart_cache(mock_check_output, disk_manager):
+    """smartctlの列挙結果から全ディスクのSMART情報を先読みするテスト（Linux環境専用）"""
+    scan_output = {
+        "devices": [
+            {"name": "/dev/sda", "type": "sat"},
+            {"name": "/dev/nvme0", "type": "nvme"},
+        ]
+    }
+    reports = {
+        "/dev/sda": {"smart_status": {"passed": True}},
+        "/dev/nvme0": {"smart_status": {"passed": False}},
+    }
+    mock_check_output.side_effect = lambda command, **kwargs: json.dumps(
+        scan_output if "--scan-open" in command else reports[command[-1]]
+    ).encode()
+
+    smart_cache = disk_manager.refresh_smart_cache()
+
+    assert smart_cache == reports
+    assert mock_check_output.call_count == 3
+    # 列挙時に判明したデバイスの種類を指定して実行する
+    sda_command = next(
+        c.args[0]
+        for c in mock_check_output.call_args_list
+        if c.args[0][-1] == "/dev/sda"
+    )
+    assert sda_command[-3:] == ["-d", "sat", "/dev/sda"]
+
+    # パーティションは親ディスクの先読み結果を使用し、smartctlを再実行しない
+    disk_manager._lsblk_cache = {"/dev/sda": {}, "/dev/sda1": {"pkname": "sda"}}
+    partition = Disk("/dev/sda1", 0, "ext4", False, "")
+    with patch.object(disk_manager, "_read_sysfs_identity", return_value=None):
+        disk_info = disk_manager.get_disk_info(partition)
+    assert disk_info.smart_status == {"passed": True}
+    assert mock_check_output.call_count == 3
+
+
+@pytest.mark.linux_only
+def test_get_disk_info_cached(disk_manager, mock_disk):
+    """ディスク詳細情報のキャッシュのテスト（Linux環境専用）"""
+    disk_info = DiskInfo("Samsung SSD 860 EVO", "S3YJNB0K500001", "gpt", {})
+    with patch.object(
+        disk_manager, "_query_disk_info", return_value=disk_info
+    ) as mock_query:
+        assert disk_manager.get_disk_info(mock_disk) is disk_info
+        assert disk_manager.get_disk_info(mock_disk) is disk_info
+        assert mock_query.call_count == 1
+
+        disk_manager.get_disk_info(mock_disk, refresh=True)
+        assert mock_query.call_count == 2
+
+
+@pytest.mark.linux_only
+def test_get_disk_info_cache_expires(disk_manager, mock_disk):
+    """I/O統計の変化と時間経過でディスク詳細情報を再取得するテスト（Linux環境専用）"""
+    disk_info = DiskInfo("Samsung SSD 860 EVO", "S3YJNB0K500001", "gpt", {})
+    with patch.object(
+        disk_manager, "_query_disk_info", return_value=disk_info
+    ) as mock_query, patch.object(
+        disk_manager, "_read_sysfs_stat", return_value="1 0 8 0"
+    ) as mock_stat, patch(
+        "time.monotonic", return_value=100.0
+    ) as mock_monotonic:
+        disk_manager.get_disk_info(mock_disk)
+        disk_manager.get_disk_info(mock_disk)
+        assert mock_query.call_count == 1
+
+        # I/O統計が変わると再取得する
+        mock_stat.return_value = "2 0 16 0"
+        disk_manager.get_disk_info(mock_disk)
+        assert mock_query.call_count == 2
+
+        # I/O統計が変わらなくても、キャッシュの有効期限が切れると再取得する
+        mock_monotonic.return_value = 100.0 + _INFO_CACHE_TTL
+        disk_manager.get_disk_info(mock_disk)
+        assert mock_query.call_count == 3
+
+
+@pytest.mark.linux_only
+def test_read_sysfs_identity(disk_manager, tmp_path):
+    """sysfsからのモデル名・シリアル番号取得のテスト（Linux環境専用）"""
+    disk_dir = tmp_path / "sda"
+    (disk_dir / "device").mkdir(parents=True)
+    (disk_dir / "device" / "model").write_text("Samsung SSD 860 EVO\n")
+    (disk_dir / "device" / "serial").write_text("S3YJNB0K500001\n")
+    (disk_dir / "sda1").mkdir()
+    (disk_dir / "sda1" / "partition").write_text("1\n")
+    (tmp_path / "sda1").symlink_to(disk_dir / "sda1")
+
+    with patch("src.disk_operations.disk_manager._SYSFS_BLOCK_PATH", str(tmp_path)):
+        assert disk_manager._read_sysfs_identity("/dev/sda1") == (
+            "Samsung SSD 860 EVO",
+            "S3YJNB0K500001",
+        )
+        assert disk_manager._read_sysfs_identity("/dev/sdz") is None
+
+
+@pytest.mark.linux_only
+@patch("subprocess.check_output")
+def test_get_disk_info_smartctl_report(mock_check_output, disk_manager, mock_disk):
+    """smartctlの出力からモデル名・SMART属性を取得するテスト（Linux環境専用）"""
+    smart_report = {
+        "model_name": "ST1000DM010-2EP102",
+        "serial_number": "Z9A1B2C3",
+        "smart_status": {"passed": False},
+        "ata_smart_attributes": {
+            "table": [
+                {"id": 5, "name": "Reallocated_Sector_Ct", "raw": {"value": 8}},
+                {"id": 197, "name": "Current_Pending_Sector", "raw": {"value": 16}},
+            ]
+        },
+    }
+    mock_check_output.side_effect = [
+        json.dumps({"blockdevices": [{"name": "sda1", "path": "/dev/sda1"}]}).encode(),
+        # 警告がある場合、smartctlは0以外で終了する
+        subprocess.CalledProcessError(
+            8, "smartctl", output=json.dumps(smart_report).encode()
+        ),
+    ]
+
+    with patch.object(disk_manager, "_read_sysfs_identity", return_value=None):
+        disk_info = disk_manager.get_disk_info(mock_disk)
+
+    assert disk_info.model == "ST1000DM010-2EP102"
+    assert disk_info.serial == "Z9A1B2C3"
+    assert disk_info.smart_status == {
+        "passed": False,
+        "attributes": {"Reallocated_Sector_Ct": 8, "Current_Pending_Sector": 16},
+    }
 
 
 @pytest.mark.linux_only
@@ -205,9 +487,41 @@ def test_get_disk_info_failure(mock_check_output, disk_manager, mock_disk):
         ("10G", 10 * 1024 * 1024 * 1024),
         ("500M", 500 * 1024 * 1024),
         ("1T", 1024 * 1024 * 1024 * 1024),
+        ("931.5g", 931 * 1024**3 + 1024**3 // 2),
+        ("4096", 4096),
         ("invalid", 0),
+        ("²G", 0),
     ],
 )
 def test_parse_size(size_str, expected, disk_manager):
     """サイズ文字列のパース処理テスト"""
     assert disk_manager._parse_size(size_str) == expected
+
+
+@pytest.mark.linux_only
+def test_is_rotational_missing_path(disk_manager, tmp_path):
+    """存在しないパスがHDDと判定されないかのテスト（Linux環境専用）"""
+    assert disk_manager.is_rotational(str(tmp_path / "missing")) is False
+
+
+@pytest.mark.linux_only
+def test_spawn_options():
+    """外部コマンドを絶対パスで起動する引数が作成されるかのテスト（Linux環境専用）"""
+    options = _spawn_options("echo")
+    assert os.path.isabs(options["executable"])
+    assert options["close_fds"] is False
+    assert subprocess.check_output(["echo", "ok"], **options) == b"ok\n"
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        Disk("/dev/sda1", 1000000000, "ext4", False, "正常"),
+        FilesystemStatus(True, "正常"),
+        DiskInfo("model", "serial", "gpt", {}),
+    ],
+)
+def test_value_objects_slotted(obj):
+    """情報クラスがインスタンス辞書を持たないかのテスト"""
+    assert not hasattr(obj, "__dict__")
+    assert sys.getsizeof(obj) <= 200
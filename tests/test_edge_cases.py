@@ -5,22 +5,11 @@
 """
 
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import MagicMock
 import os
 import hashlib
-from src.main import Application
 from src.disk_operations.disk_manager import Disk, FilesystemStatus
-from src.file_operations.file_handler import File, FileError
-from src.gui.main_window import MainWindow
-
-
-@pytest.fixture
-def app():
-    """アプリケーションのフィクスチャ"""
-    with patch("src.main.MainWindow"), patch("src.main.DiskManager"), patch(
-        "src.main.FileHandler"
-    ), patch("src.main.Logger"):
-        return Application()
+from src.file_operations.file_handler import File, FileHandler
 
 
 @pytest.mark.linux_only
@@ -108,21 +97,24 @@ def test_invalid_disk_selection(app):
 
 
 @pytest.mark.linux_only
-def test_duplicate_files(app):
+def test_duplicate_files(tmp_path):
     """重複ファイルのテスト（Linux環境専用）"""
-    mock_files = [
-        File("/test/file1.txt", 1000, "same_hash", "正常", False),
-        File("/test/file2.txt", 1000, "same_hash", "正常", False),
-    ]
-    app.file_handler.list_files.return_value = mock_files
+    contents = {
+        "file1.txt": b"same",
+        "file2.txt": b"same",
+        "file3.txt": b"diff",
+        "file4.txt": b"unique size",
+    }
+    mock_files = []
+    for name, data in contents.items():
+        (tmp_path / name).write_bytes(data)
+        mock_files.append(File(str(tmp_path / name), len(data), None, "正常", False))
 
     # 重複ファイルの検出
-    duplicates = [
-        f
-        for f in mock_files
-        if any(f2.hash == f.hash and f2.path != f.path for f2 in mock_files)
+    duplicates = FileHandler().find_duplicates(mock_files)
+    assert [[os.path.basename(f.path) for f in group] for group in duplicates] == [
+        ["file1.txt", "file2.txt"]
     ]
-    assert len(duplicates) == 2
 
 
 @pytest.mark.linux_only
@@ -4,15 +4,19 @@ FileHandlerクラスのテストモジュール
 このモジュールは、ファイル操作の機能をテストします。
 """
 
+import io
 import os
+import errno
 import pytest
 from unittest.mock import patch, MagicMock
 import hashlib
+import sys
 from src.file_operations.file_handler import (
     FileHandler,
     File,
     FileAttributes,
     FileError,
+    destination_paths,
 )
 
 
@@ -42,35 +46,170 @@ def test_file_obj(test_file):
     return File(
         path=str(test_file["path"]),
         size=test_file["size"],
-        hash=test_file["hash"],
+        attributes=None,
         status="正常",
         is_corrupted=False,
     )
 
 
+def _dir_entry(path, kind, size=0):
+    """os.scandirが返すDirEntryのモックを作成する"""
+    entry = MagicMock()
+    entry.name = os.path.basename(path)
+    entry.path = path
+    entry.is_dir.return_value = kind == "dir"
+    entry.is_file.return_value = kind == "file"
+    entry.stat.return_value = os.stat_result((0o100644, 0, 0, 1, 0, 0, size, 0, 0, 0))
+    return entry
+
+
+def _scandir_result(entries):
+    """with文で使用できるos.scandirの戻り値のモックを作成する"""
+    result = MagicMock()
+    result.__enter__.return_value = iter(entries)
+    return result
+
+
 @pytest.mark.linux_only
-@patch("os.walk")
-def test_list_files(mock_walk, file_handler, tmp_path):
+def test_list_files(file_handler, tmp_path):
     """ファイル一覧取得のテスト（Linux環境専用）"""
-    mock_walk.return_value = [
-        (str(tmp_path), ["dir1"], ["file1.txt", "file2.txt"]),
-        (str(tmp_path / "dir1"), [], ["file3.txt"]),
+    root = str(tmp_path)
+    dir1 = os.path.join(root, "dir1")
+    os.mkdir(dir1)
+    listing = {
+        root: [
+            _dir_entry(os.path.join(root, "file1.txt"), "file", 1000),
+            _dir_entry(os.path.join(root, "file2.txt"), "file", 1000),
+            _dir_entry(dir1, "dir"),
+            # シンボリックリンクやFIFOなど通常ファイル以外は一覧に含めない
+            _dir_entry(os.path.join(root, "fifo"), "other"),
+        ],
+        dir1: [_dir_entry(os.path.join(dir1, "file3.txt"), "file", 1000)],
+    }
+
+    with patch(
+        "os.scandir", side_effect=lambda path: _scandir_result(listing[path])
+    ) as mock_scandir:
+        files = file_handler.list_files(root, parallel=False)
+
+    assert sorted(os.path.basename(f.path) for f in files) == [
+        "file1.txt",
+        "file2.txt",
+        "file3.txt",
     ]
+    assert all(isinstance(f, File) for f in files)
+    assert all(f.size == 1000 for f in files)
+    assert all(not f.is_corrupted for f in files)
+    assert mock_scandir.call_count == 2
+    # stat情報は通常ファイルのみ参照する
+    for entry in listing[root][2:]:
+        entry.stat.assert_not_called()
+
 
-    with patch("os.path.getsize") as mock_size, patch(
-        "os.path.isfile"
-    ) as mock_isfile, patch("hashlib.md5") as mock_md5:
-        mock_size.return_value = 1000
-        mock_isfile.return_value = True
-        mock_md5.return_value.hexdigest.return_value = "test_hash"
+@pytest.mark.linux_only
+def test_list_files_nested(file_handler, tmp_path):
+    """ネストしたディレクトリのファイル一覧取得テスト（Linux環境専用）"""
+    (tmp_path / "dir1" / "dir2").mkdir(parents=True)
+    (tmp_path / "a.txt").write_bytes(b"a")
+    (tmp_path / "dir1" / "b.txt").write_bytes(b"bb")
+    (tmp_path / "dir1" / "dir2" / "c.txt").write_bytes(b"ccc")
+
+    expected = {
+        "a.txt": 1,
+        os.path.join("dir1", "b.txt"): 2,
+        os.path.join("dir1", "dir2", "c.txt"): 3,
+    }
 
+    # 並行走査と順次走査で同じ結果になる
+    for parallel in (True, False):
+        files = file_handler.list_files(str(tmp_path), parallel=parallel)
+        sizes = {os.path.relpath(f.path, tmp_path): f.size for f in files}
+        assert sizes == expected
+
+
+@pytest.mark.linux_only
+def test_list_files_reuses_unchanged_dirs(file_handler, tmp_path):
+    """更新されていないディレクトリを再走査しないかのテスト（Linux環境専用）"""
+    subdir = tmp_path / "dir1"
+    subdir.mkdir()
+    (tmp_path / "file1.txt").write_text("1")
+    (subdir / "file2.txt").write_text("2")
+    # 更新直後のディレクトリは再利用しないため、更新時刻を過去にする
+    for path in (tmp_path, subdir):
+        os.utime(path, (1_000_000_000, 1_000_000_000))
+
+    assert len(file_handler.list_files(str(tmp_path))) == 2
+    with patch("os.scandir", wraps=os.scandir) as mock_scandir:
+        assert len(file_handler.list_files(str(tmp_path))) == 2
+        mock_scandir.assert_not_called()
+
+        # ファイルを追加したディレクトリのみ再走査する
+        (subdir / "file3.txt").write_text("3")
         files = file_handler.list_files(str(tmp_path))
+    assert len(files) == 3
+    assert [c.args[0] for c in mock_scandir.call_args_list] == [str(subdir)]
 
-        assert len(files) == 3
-        assert all(isinstance(f, File) for f in files)
-        assert all(f.size == 1000 for f in files)
-        assert all(f.hash == "test_hash" for f in files)
-        assert all(not f.is_corrupted for f in files)
+
+@pytest.mark.linux_only
+def test_list_files_restats_cached_files(file_handler, tmp_path):
+    """再利用したディレクトリのファイルの書き換えを反映するかのテスト（Linux環境専用）"""
+    file_path = tmp_path / "file1.txt"
+    file_path.write_text("1")
+    os.utime(tmp_path, (1_000_000_000, 1_000_000_000))
+    before = file_handler.list_files(str(tmp_path))
+    assert [f.size for f in before] == [1]
+
+    # 既存ファイルの内容の書き換えはディレクトリの更新時刻を変えない
+    file_path.write_text("12345")
+    os.utime(file_path, (2_000_000_000, 2_000_000_000))
+    with patch("os.scandir", wraps=os.scandir) as mock_scandir:
+        files = file_handler.list_files(str(tmp_path))
+        mock_scandir.assert_not_called()
+    assert [f.size for f in files] == [5]
+    assert files[0].attributes.modified_time != before[0].attributes.modified_time
+
+
+@pytest.mark.linux_only
+def test_scan_cache_bounded(file_handler, tmp_path):
+    """走査結果の保持が上限件数で古いものから破棄されるかのテスト（Linux環境専用）"""
+    for name in ("dir1", "dir2", "dir3"):
+        subdir = tmp_path / name
+        subdir.mkdir()
+        (subdir / "file.txt").write_text(name)
+        os.utime(subdir, (1_000_000_000, 1_000_000_000))
+
+    with patch("src.file_operations.file_handler._SCAN_CACHE_MAX_ENTRIES", 2):
+        for name in ("dir1", "dir2", "dir3"):
+            file_handler.list_files(str(tmp_path / name))
+
+    assert list(file_handler._scan_cache) == [
+        str(tmp_path / "dir2"),
+        str(tmp_path / "dir3"),
+    ]
+    assert file_handler._scan_cache_entries == 2
+
+    file_handler.clear_scan_cache()
+    assert file_handler._scan_cache == {}
+    assert file_handler._scan_cache_entries == 0
+
+
+@pytest.mark.linux_only
+def test_list_files_attributes(file_handler, tmp_path):
+    """ファイル一覧取得時の属性設定のテスト（Linux環境専用）"""
+    (tmp_path / ".hidden").write_bytes(b"a")
+    (tmp_path / "visible.txt").write_bytes(b"b")
+    os.chmod(tmp_path / "visible.txt", 0o640)
+
+    files = {
+        os.path.basename(f.path): f for f in file_handler.list_files(str(tmp_path))
+    }
+
+    assert files[".hidden"].attributes.is_hidden is True
+    assert files["visible.txt"].attributes.is_hidden is False
+    assert files["visible.txt"].attributes.permissions == oct(0o640)
+    assert files["visible.txt"].attributes.modified_time == (
+        file_handler.get_file_attributes(files["visible.txt"]).modified_time
+    )
 
 
 @pytest.mark.linux_only
@@ -84,23 +223,21 @@ def test_list_files_error(mock_walk, file_handler, tmp_path):
 
 
 @pytest.mark.linux_only
-@patch("shutil.copy2")
-@patch("os.path.exists")
+@patch.object(FileHandler, "_fast_copy")
 @patch("os.makedirs")
-def test_copy_files(
-    mock_makedirs, mock_exists, mock_copy, file_handler, test_file_obj, tmp_path
-):
+def test_copy_files(mock_makedirs, mock_copy, file_handler, test_file_obj, tmp_path):
     """ファイルコピーのテスト（Linux環境専用）"""
     dest_dir = tmp_path / "dest"
-    mock_exists.return_value = False
 
     assert file_handler.copy_files([test_file_obj], str(dest_dir)) is True
     mock_makedirs.assert_called_once_with(str(dest_dir), exist_ok=True)
-    mock_copy.assert_called_once()
+    mock_copy.assert_called_once_with(
+        test_file_obj.path, str(dest_dir / os.path.basename(test_file_obj.path))
+    )
 
 
 @pytest.mark.linux_only
-@patch("shutil.copy2")
+@patch.object(FileHandler, "_fast_copy")
 def test_copy_files_error(mock_copy, file_handler, test_file_obj, tmp_path):
     """ファイルコピーエラーのテスト（Linux環境専用）"""
     mock_copy.side_effect = IOError("コピーエラー")
@@ -108,26 +245,385 @@ def test_copy_files_error(mock_copy, file_handler, test_file_obj, tmp_path):
 
 
 @pytest.mark.linux_only
-@patch("hashlib.md5")
-def test_verify_copy(mock_md5, file_handler, test_file):
-    """コピー検証のテスト（Linux環境専用）"""
-    mock_md5.return_value.hexdigest.return_value = test_file["hash"]
+@patch("os.sendfile", side_effect=OSError(errno.EINVAL, "Invalid argument"))
+@patch("os.copy_file_range", side_effect=OSError(errno.EXDEV, "Cross-device link"))
+def test_copy_files_buffered_fallback(
+    mock_copy_range, mock_sendfile, file_handler, tmp_path
+):
+    """カーネル内コピー失敗時にバッファを介してコピーするテスト（Linux環境専用）"""
+    dest_dir = tmp_path / "dest"
+    files = []
+    for i in range(2):
+        path = tmp_path / f"file{i}.bin"
+        path.write_bytes(os.urandom(10000))
+        files.append(File(str(path), 10000, None, "normal", False))
+
+    with patch("src.file_operations.file_handler._COPY_BUFFER_SIZE", 4096):
+        assert file_handler.copy_files(files, str(dest_dir), max_workers=1) is True
+    for i in range(2):
+        assert (dest_dir / f"file{i}.bin").read_bytes() == (
+            tmp_path / f"file{i}.bin"
+        ).read_bytes()
+        assert (dest_dir / f"file{i}.bin").stat().st_mtime_ns == (
+            tmp_path / f"file{i}.bin"
+        ).stat().st_mtime_ns
+
+
+@pytest.mark.linux_only
+def test_copy_files_multiple(file_handler, tmp_path):
+    """複数ファイルの同時コピーのテスト（Linux環境専用）"""
+    src_dir = tmp_path / "src"
+    dest_dir = tmp_path / "dest"
+    src_dir.mkdir()
+    dest_dir.mkdir()
+    files = []
+    for i in range(10):
+        path = src_dir / f"file{i}.txt"
+        path.write_text(f"データ{i}")
+        files.append(File(str(path), path.stat().st_size, None, "normal", False))
+
+    assert file_handler.copy_files(files, str(dest_dir)) is True
+    for i in range(10):
+        assert (dest_dir / f"file{i}.txt").read_text() == f"データ{i}"
+
+
+@pytest.mark.linux_only
+def test_copy_files_progress_cb(file_handler, tmp_path):
+    """ファイル毎のコピー完了が通知されるかのテスト（Linux環境専用）"""
+    source = tmp_path / "source.txt"
+    source.write_text("データ")
+    dest_dir = tmp_path / "dest"
+    dest_dir.mkdir()
+    files = [
+        File(str(source), source.stat().st_size, None, "normal", False),
+        File(str(tmp_path / "missing.txt"), 0, None, "normal", False),
+    ]
+    progress_cb = MagicMock()
+
     assert (
-        file_handler.verify_copy(str(test_file["path"]), str(test_file["path"])) is True
+        file_handler.copy_files(files, str(dest_dir), progress_cb=progress_cb) is False
     )
+    results = {call.args[0].path: call.args[1] for call in progress_cb.call_args_list}
+    assert results[str(source)] is None
+    assert isinstance(results[str(tmp_path / "missing.txt")], OSError)
+
+
+@pytest.mark.linux_only
+@patch("os.copy_file_range", side_effect=OSError(errno.EXDEV, "Cross-device link"))
+def test_copy_files_sendfile_fallback(mock_copy_range, file_handler, tmp_path):
+    """copy_file_range失敗時にsendfileでコピーするテスト（Linux環境専用）"""
+    source = tmp_path / "source.bin"
+    source.write_bytes(os.urandom(8192))
+    dest_dir = tmp_path / "dest"
+    dest_dir.mkdir()
+    file = File(str(source), 8192, None, "normal", False)
+
+    assert file_handler.copy_files([file], str(dest_dir)) is True
+    mock_copy_range.assert_called_once()
+    assert (dest_dir / "source.bin").read_bytes() == source.read_bytes()
+
+
+@pytest.mark.linux_only
+@patch("fcntl.ioctl", side_effect=OSError(errno.EOPNOTSUPP, "Not supported"))
+@patch("os.copy_file_range", side_effect=OSError(errno.ENOSYS, "Not implemented"))
+def test_copy_files_copy_file_range_unsupported(
+    mock_copy_range, mock_ioctl, file_handler, tmp_path
+):
+    """copy_file_range非対応の場合に以降の呼び出しを省略するテスト（Linux環境専用）"""
+    dest_dir = tmp_path / "dest"
+    dest_dir.mkdir()
+    files = []
+    for i in range(3):
+        path = tmp_path / f"file{i}.bin"
+        path.write_bytes(os.urandom(4096))
+        files.append(File(str(path), 4096, None, "normal", False))
+
+    assert file_handler.copy_files(files, str(dest_dir), max_workers=1) is True
+    mock_copy_range.assert_called_once()
+    for i in range(3):
+        assert (dest_dir / f"file{i}.bin").read_bytes() == (
+            tmp_path / f"file{i}.bin"
+        ).read_bytes()
+
+
+@pytest.mark.linux_only
+@patch("os.copy_file_range")
+@patch("fcntl.ioctl")
+def test_copy_files_reflink(mock_ioctl, mock_copy_range, file_handler, tmp_path):
+    """FICLONEでクローンを作成できた場合はデータを転送しないテスト（Linux環境専用）"""
+    source = tmp_path / "source.bin"
+    source.write_bytes(os.urandom(4096))
+    dest_dir = tmp_path / "dest"
+    file = File(str(source), 4096, None, "normal", False)
+
+    assert file_handler.copy_files([file], str(dest_dir)) is True
+    mock_ioctl.assert_called_once()
+    assert mock_ioctl.call_args.args[1] == 0x40049409
+    mock_copy_range.assert_not_called()
+
+
+@pytest.mark.linux_only
+def test_copy_files_same_name(file_handler, tmp_path):
+    """別ディレクトリの同名ファイルが互いに上書きされずにコピーされるかのテスト（Linux環境専用）"""
+    files = []
+    for name in ("a", "b"):
+        path = tmp_path / name / "x.txt"
+        path.parent.mkdir()
+        path.write_bytes(os.urandom(4096))
+        files.append(File(str(path), 4096, None, "normal", False))
+    dest_dir = tmp_path / "dest"
+
+    assert file_handler.copy_files(files, str(dest_dir)) is True
+    assert (dest_dir / "x.txt").read_bytes() == (tmp_path / "a" / "x.txt").read_bytes()
+    assert (dest_dir / "x (1).txt").read_bytes() == (
+        tmp_path / "b" / "x.txt"
+    ).read_bytes()
+
+
+def test_destination_paths():
+    """同名ファイルのコピー先に既存の名前と重ならない番号を付けるかのテスト"""
+    files = [
+        File(path, 0, None, "normal", False)
+        for path in ("/a/x.txt", "/b/x.txt", "/c/x (1).txt", "/d/x.txt", "/e/y")
+    ]
+
+    assert destination_paths(files, "/dest") == [
+        "/dest/x.txt",
+        "/dest/x (2).txt",
+        "/dest/x (1).txt",
+        "/dest/x (3).txt",
+        "/dest/y",
+    ]
+
+
+@pytest.mark.linux_only
+def test_copy_files_metadata(file_handler, tmp_path):
+    """コピー先に更新日時とパーミッションが複製されるかのテスト（Linux環境専用）"""
+    source = tmp_path / "source.txt"
+    source.write_text("データ")
+    os.chmod(source, 0o640)
+    os.utime(source, ns=(1_000_000_000, 2_000_000_000))
+    dest_dir = tmp_path / "dest"
+    dest_dir.mkdir()
+    file = File(str(source), source.stat().st_size, None, "normal", False)
+
+    assert file_handler.copy_files([file], str(dest_dir)) is True
+    dest_stat = (dest_dir / "source.txt").stat()
+    assert dest_stat.st_mtime_ns == 2_000_000_000
+    assert dest_stat.st_mode & 0o777 == 0o640
+
+
+@pytest.mark.linux_only
+def test_verify_copy(file_handler, test_file):
+    """コピー検証のテスト（Linux環境専用）"""
+    with patch.object(file_handler, "_hash_file", return_value=test_file["hash"]):
+        assert (
+            file_handler.verify_copy(str(test_file["path"]), str(test_file["path"]))
+            is True
+        )
+
+
+@pytest.mark.linux_only
+@pytest.mark.parametrize("hash_algo", ["blake3", "xxh3_128", "sha256", "md5"])
+def test_verify_copy_hash_algo(hash_algo, test_file, tmp_path):
+    """ハッシュアルゴリズムを切り替えたコピー検証のテスト（Linux環境専用）"""
+    file_handler = FileHandler(hash_algo=hash_algo)
+    dest = tmp_path / "dest.txt"
+    dest.write_text(test_file["data"])
+
+    assert file_handler.verify_copy(str(test_file["path"]), str(dest)) is True
+    if hash_algo == "md5":
+        assert file_handler._hash_file(str(dest)) == test_file["hash"]
 
 
 @pytest.mark.linux_only
-@patch("hashlib.md5")
-def test_verify_copy_error(mock_md5, file_handler, test_file, tmp_path):
+def test_hash_file_windows(tmp_path):
+    """ファイルを一定サイズ毎に読み込んでハッシュへ渡すかのテスト（Linux環境専用）"""
+    data = os.urandom(10000)
+    source = tmp_path / "source.bin"
+    source.write_bytes(data)
+    file_handler = FileHandler(hash_algo="md5")
+
+    with patch("src.file_operations.file_handler._HASH_WINDOW_SIZE", 4096):
+        assert file_handler._hash_file(str(source)) == hashlib.md5(data).hexdigest()
+
+
+@pytest.mark.linux_only
+def test_verify_copy_read_error(file_handler, test_file, tmp_path):
+    """ハッシュ値の計算中の読み込みエラーで検証が失敗するかのテスト（Linux環境専用）"""
+    dest = tmp_path / "dest.txt"
+    dest.write_text(test_file["data"])
+
+    class FailingFileIO(io.FileIO):
+        def readinto(self, buffer):
+            raise OSError(errno.EIO, "Input/output error")
+
+    with patch(
+        "src.file_operations.file_handler.open",
+        lambda path, *args, **kwargs: FailingFileIO(path),
+        create=True,
+    ):
+        assert file_handler.verify_copy(str(test_file["path"]), str(dest)) is False
+
+
+@pytest.mark.parametrize(
+    "hash_algo,module", [("blake3", "blake3"), ("xxh3_128", "xxhash")]
+)
+def test_hash_algo_fallback(hash_algo, module):
+    """任意依存のハッシュが未導入の場合にSHA-256を使用するかのテスト"""
+    with patch(f"src.file_operations.file_handler.{module}", None):
+        assert FileHandler(hash_algo=hash_algo).hash_algo == "sha256"
+
+
+def test_unknown_hash_algo():
+    """利用できないハッシュアルゴリズムの指定でエラーになるかのテスト"""
+    with pytest.raises(ValueError):
+        FileHandler(hash_algo="unknown")
+
+
+@pytest.mark.linux_only
+@patch.object(FileHandler, "_hash_file", side_effect=["hash1", "hash2"])
+def test_verify_copy_error(mock_hash, file_handler, test_file, tmp_path):
     """コピー検証エラーのテスト（Linux環境専用）"""
-    mock_md5.return_value.hexdigest.side_effect = ["hash1", "hash2"]
     assert (
         file_handler.verify_copy(str(test_file["path"]), str(tmp_path / "dest.txt"))
         is False
     )
 
 
+@pytest.mark.linux_only
+def test_verify_copy_content_mismatch(file_handler, tmp_path):
+    """同一サイズで内容が異なるファイルのコピー検証テスト（Linux環境専用）"""
+    source = tmp_path / "source.bin"
+    dest = tmp_path / "dest.bin"
+    source.write_bytes(b"a" * 4096)
+    dest.write_bytes(b"a" * 4095 + b"b")
+
+    assert file_handler.verify_copy(str(source), str(dest)) is False
+
+
+@pytest.mark.linux_only
+def test_verify_copy_sampled(file_handler, tmp_path):
+    """先頭と末尾のみを比較する簡易検証のテスト（Linux環境専用）"""
+    source = tmp_path / "source.bin"
+    middle = tmp_path / "middle.bin"
+    tail = tmp_path / "tail.bin"
+    source.write_bytes(b"a" * 4096)
+    middle.write_bytes(b"a" * 2048 + b"b" + b"a" * 2047)
+    tail.write_bytes(b"a" * 4095 + b"b")
+
+    with patch("src.file_operations.file_handler._VERIFY_SAMPLE_SIZE", 1024):
+        assert file_handler.verify_copy(str(source), str(middle), strict=False)
+        assert not file_handler.verify_copy(str(source), str(middle))
+        assert not file_handler.verify_copy(str(source), str(tail), strict=False)
+
+
+@pytest.mark.linux_only
+def test_copy_and_verify(file_handler, tmp_path):
+    """コピーしながら検証するテスト（Linux環境専用）"""
+    source = tmp_path / "source.bin"
+    data = os.urandom(10000)
+    source.write_bytes(data)
+    dest_dir = tmp_path / "dest"
+    file = File(str(source), len(data), None, "normal", False)
+
+    with patch("src.file_operations.file_handler._COPY_BUFFER_SIZE", 4096):
+        assert file_handler.copy_and_verify(file, str(dest_dir)) is True
+    assert (dest_dir / "source.bin").read_bytes() == data
+
+    with patch.object(file_handler, "_hash_file", return_value="mismatch"):
+        assert file_handler.copy_and_verify(file, str(dest_dir)) is False
+
+
+@pytest.mark.linux_only
+def test_copy_and_verify_reuses_copy_helpers(file_handler, tmp_path):
+    """copy_filesと同じ方法でコピー・検証するかのテスト（Linux環境専用）"""
+    source = tmp_path / "source.bin"
+    data = os.urandom(10000)
+    source.write_bytes(data)
+    os.utime(source, (1_000_000_000, 1_000_000_000))
+    dest_dir = tmp_path / "dest"
+    file = File(str(source), len(data), None, "normal", False)
+
+    with patch.object(
+        file_handler, "_open_noatime", wraps=file_handler._open_noatime
+    ) as mock_open_noatime, patch.object(
+        file_handler, "_hash_file", wraps=file_handler._hash_file
+    ) as mock_hash:
+        assert file_handler.copy_and_verify(
+            file, str(dest_dir), str(dest_dir / "source (1).bin")
+        )
+    mock_open_noatime.assert_called_once_with(str(source))
+    # コピー先はページキャッシュを破棄し、ディスク上の内容で検証する
+    mock_hash.assert_called_once_with(str(dest_dir / "source (1).bin"), drop_cache=True)
+    assert (dest_dir / "source (1).bin").read_bytes() == data
+    assert os.stat(dest_dir / "source (1).bin").st_mtime_ns == 1_000_000_000 * 10**9
+
+
+@pytest.mark.linux_only
+def test_copy_and_verify_removes_partial_copy(file_handler, tmp_path):
+    """コピーの途中で失敗した場合にコピー先を削除するかのテスト（Linux環境専用）"""
+    source = tmp_path / "source.bin"
+    source.write_bytes(os.urandom(10000))
+    dest_dir = tmp_path / "dest"
+    dest_dir.mkdir()
+    file = File(str(source), 10000, None, "normal", False)
+
+    with patch.object(
+        file_handler, "_copy_metadata", side_effect=OSError(errno.EIO, "I/O error")
+    ):
+        assert file_handler.copy_and_verify(file, str(dest_dir)) is False
+    assert not (dest_dir / "source.bin").exists()
+
+    # コピー元を開けなかった場合は既存のコピー先を削除しない
+    (dest_dir / "source.bin").write_bytes(b"existing")
+    source.unlink()
+    assert file_handler.copy_and_verify(file, str(dest_dir)) is False
+    assert (dest_dir / "source.bin").read_bytes() == b"existing"
+
+
+@pytest.mark.linux_only
+def test_verify_copy_ondisk(file_handler, test_file, tmp_path):
+    """コピー先のページキャッシュを破棄して検証するテスト（Linux環境専用）"""
+    dest = tmp_path / "dest.txt"
+    dest.write_text(test_file["data"])
+
+    with patch.object(
+        file_handler, "_drop_page_cache", wraps=file_handler._drop_page_cache
+    ) as mock_drop:
+        assert file_handler.verify_copy(
+            str(test_file["path"]), str(dest), verify_mode="ondisk"
+        )
+        assert mock_drop.call_count == 1
+
+    with pytest.raises(ValueError):
+        file_handler.verify_copy(str(test_file["path"]), str(dest), verify_mode="x")
+
+
+@pytest.mark.linux_only
+def test_verify_copy_same_inode(file_handler, tmp_path):
+    """同一inodeのファイルはハッシュ計算を省略するテスト（Linux環境専用）"""
+    source = tmp_path / "source.bin"
+    source.write_bytes(os.urandom(4096))
+    link = tmp_path / "link.bin"
+    os.link(source, link)
+
+    with patch.object(file_handler, "_hash_file") as mock_hash:
+        assert file_handler.verify_copy(str(source), str(link)) is True
+        mock_hash.assert_not_called()
+
+
+@pytest.mark.linux_only
+def test_shares_extents_plain_copy(file_handler, tmp_path):
+    """通常のコピーはエクステント共有と判定しないテスト（Linux環境専用）"""
+    source = tmp_path / "source.bin"
+    dest = tmp_path / "dest.bin"
+    source.write_bytes(os.urandom(8192))
+    dest.write_bytes(source.read_bytes())
+
+    assert file_handler._shares_extents(str(source), str(dest)) is False
+
+
 @pytest.mark.linux_only
 @patch("os.stat")
 def test_get_file_attributes(mock_stat, file_handler, test_file_obj):
@@ -211,6 +707,28 @@ def test_handle_corrupted_files(file_handler, tmp_path):
     assert "破損" in errors[0].message
 
 
+@pytest.mark.linux_only
+@pytest.mark.parametrize("num_corrupted", [1, 10_000])
+def test_handle_corrupted_files_already_flagged(file_handler, tmp_path, num_corrupted):
+    """破損と判定済みのファイルを読み込まずに報告するテスト（Linux環境専用）"""
+    normal = tmp_path / "normal.txt"
+    normal.write_text("データ")
+    files = [
+        File(str(tmp_path / f"corrupted{i}.txt"), 100, None, "破損", True)
+        for i in range(num_corrupted)
+    ]
+    files.append(File(str(normal), normal.stat().st_size, None, "正常", False))
+
+    with patch.object(
+        file_handler, "_check_file", wraps=file_handler._check_file
+    ) as mock_check:
+        errors = file_handler.handle_corrupted_files(files)
+
+    assert len(errors) == num_corrupted
+    assert all("破損" in error.message for error in errors)
+    mock_check.assert_called_once_with(files[-1], False)
+
+
 @pytest.mark.linux_only
 @pytest.mark.parametrize("num_corrupted", [1, 3, 5])
 def test_handle_corrupted_files_multiple(file_handler, tmp_path, num_corrupted):
@@ -233,3 +751,54 @@ def test_handle_corrupted_files_multiple(file_handler, tmp_path, num_corrupted):
     assert all(isinstance(e, FileError) for e in errors)
     assert all(e.error_code == 6 for e in errors)  # FILE_006
     assert all("破損" in e.message for e in errors)
+
+
+@pytest.mark.linux_only
+@pytest.mark.parametrize("deep", [False, True])
+def test_handle_corrupted_files_scan_modes(file_handler, tmp_path, deep):
+    """簡易チェックと全体読み込みチェックのテスト（Linux環境専用）"""
+    valid = tmp_path / "image.png"
+    valid.write_bytes(b"\x89PNG\r\n\x1a\n" + os.urandom(4096))
+    mismatched = tmp_path / "image.jpg"
+    mismatched.write_bytes(b"GIF89a" + os.urandom(4096))
+    files = [
+        File(str(valid), 4104, None, "normal", False),
+        File(str(mismatched), 4102, None, "normal", False),
+    ]
+
+    errors = file_handler.handle_corrupted_files(files, deep=deep)
+
+    assert len(errors) == 1
+    assert "拡張子が不正です" in errors[0].message
+    assert files[0].is_corrupted is False
+    assert files[1].is_corrupted is True
+
+
+@pytest.mark.linux_only
+def test_check_file_accessibility_strict(file_handler, tmp_path):
+    """ロック状態を含むファイルアクセス確認のテスト（Linux環境専用）"""
+    import fcntl
+
+    path = tmp_path / "locked.txt"
+    path.write_text("data")
+    file = File(str(path), 4, None, "normal", False)
+
+    assert file_handler.check_file_accessibility(file, strict=True) is True
+    with open(path, "rb") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        assert file_handler.check_file_accessibility(file) is True
+        assert file_handler.check_file_accessibility(file, strict=True) is False
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        File("/test/file1.txt", 1000, None, "正常", False),
+        FileAttributes("2024-01-01", "2024-01-01", "644", "user", False),
+        FileError(6, "破損"),
+    ],
+)
+def test_value_objects_slotted(obj):
+    """大量に生成する情報クラスがインスタンス辞書を持たないかのテスト"""
+    assert not hasattr(obj, "__dict__")
+    assert sys.getsizeof(obj) <= 200
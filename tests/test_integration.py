@@ -5,22 +5,9 @@
 """
 
 import pytest
-from unittest.mock import patch, MagicMock
-import os
 import hashlib
-from src.main import Application
 from src.disk_operations.disk_manager import Disk, FilesystemStatus
 from src.file_operations.file_handler import File
-from src.gui.main_window import MainWindow
-
-
-@pytest.fixture
-def app():
-    """アプリケーションのフィクスチャ"""
-    with patch("src.main.MainWindow"), patch("src.main.DiskManager"), patch(
-        "src.main.FileHandler"
-    ), patch("src.main.Logger"):
-        return Application()
 
 
 @pytest.fixture
@@ -1,48 +1,61 @@
+import datetime
 import os
+import time
 import pytest
-from src.utils.logger import Logger
+from unittest.mock import patch
+from src.utils.logger import (
+    _format,
+    Logger,
+    LEVEL_DEBUG,
+    LEVEL_ERROR,
+    LEVEL_INFO,
+    LEVEL_WARNING,
+)
 
 
 def test_log_info(capsys):
     """情報ログの記録テスト"""
-    logger = Logger()
+    logger = Logger(verbose=True)
     test_message = "テスト情報メッセージ"
 
     logger.log_info(test_message)
+    logger.flush()
     captured = capsys.readouterr().out
 
     assert "INFO" in captured
     assert test_message in captured
     assert len(logger.logs) > 0
-    assert logger.logs[0].startswith("INFO")
+    assert logger.logs[0][0] == LEVEL_INFO
 
 
 def test_log_error(capsys):
     """エラーログの記録テスト"""
-    logger = Logger()
+    logger = Logger(verbose=True)
     test_message = "テストエラーメッセージ"
 
     logger.log_error(test_message)
+    logger.flush()
     captured = capsys.readouterr().out
 
     assert "ERROR" in captured
     assert test_message in captured
     assert len(logger.logs) > 0
-    assert logger.logs[0].startswith("ERROR")
+    assert logger.logs[0][0] == LEVEL_ERROR
 
 
 def test_log_warning(capsys):
     """警告ログの記録テスト"""
-    logger = Logger()
+    logger = Logger(verbose=True)
     test_message = "テスト警告メッセージ"
 
     logger.log_warning(test_message)
+    logger.flush()
     captured = capsys.readouterr().out
 
     assert "WARNING" in captured
     assert test_message in captured
     assert len(logger.logs) > 0
-    assert logger.logs[0].startswith("WARNING")
+    assert logger.logs[0][0] == LEVEL_WARNING
 
 
 def test_save_logs(tmp_path):
@@ -87,3 +100,114 @@ def test_export_operation_history():
     assert isinstance(history, str)
     assert "テスト情報3" in history
     assert "テストエラー3" in history
+
+
+def test_log_with_format_args(capsys):
+    """%形式の引数付きログの記録テスト"""
+    logger = Logger(verbose=True)
+
+    logger.log_info("%s 個のファイルを検出しました", 3)
+    logger.flush()
+    captured = capsys.readouterr().out
+
+    assert "3 個のファイルを検出しました" in captured
+    assert logger.export_operation_history().endswith("3 個のファイルを検出しました")
+
+
+def test_log_debug(capsys):
+    """デバッグログの記録テスト"""
+    logger = Logger(verbose=True)
+
+    logger.log_debug("破棄されるメッセージ")
+    assert capsys.readouterr().out == ""
+    assert len(logger.logs) == 0
+
+    logger.debug_enabled = True
+    logger.log_debug("テストデバッグメッセージ: %s", 1)
+    logger.flush()
+    captured = capsys.readouterr().out
+
+    assert "DEBUG" in captured
+    assert "テストデバッグメッセージ: 1" in captured
+    assert logger.logs[0][0] == LEVEL_DEBUG
+
+
+def test_log_not_printed_by_default(capsys):
+    """verboseでない場合に標準出力へ表示しないかのテスト"""
+    logger = Logger()
+
+    logger.log_info("表示されないメッセージ")
+    logger.flush()
+
+    assert capsys.readouterr().out == ""
+    assert "表示されないメッセージ" in logger.export_operation_history()
+
+
+def test_log_file_written_on_close(tmp_path):
+    """ログファイルへバッファ経由で書き出されるかのテスト"""
+    log_file = tmp_path / "salvage.log"
+    logger = Logger(log_path=str(log_file))
+
+    logger.log_info("%s 個のファイルを検出しました", 3)
+    logger.log_warning("テスト警告4")
+    logger.close()
+
+    with open(log_file, "r", encoding="utf-8") as f:
+        log_contents = f.read()
+    assert "INFO" in log_contents
+    assert "3 個のファイルを検出しました" in log_contents
+    assert "テスト警告4" in log_contents
+
+
+def test_log_file_flushed_periodically(tmp_path):
+    """closeを待たずに一定間隔でログファイルへ書き出されるかのテスト"""
+    log_file = tmp_path / "salvage.log"
+    with patch("src.utils.logger._FILE_FLUSH_INTERVAL", 0.01):
+        logger = Logger(log_path=str(log_file))
+        logger.log_error("テストエラー5")
+
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            if log_file.exists() and "テストエラー5" in log_file.read_text(
+                encoding="utf-8"
+            ):
+                break
+            time.sleep(0.01)
+        else:
+            pytest.fail("ログファイルへ書き出されませんでした")
+    logger.close()
+
+
+def test_format_timestamp():
+    """ログの時刻がdatetimeの文字列表現と同じ形式で整形されるかのテスト"""
+    for timestamp_ns in (1_700_000_000_123_456_000, 1_700_000_000_000_000_000):
+        expected = datetime.datetime.fromtimestamp(timestamp_ns // 1000 / 1e6)
+        assert _format((LEVEL_INFO, timestamp_ns, "%s", ("テスト",))) == (
+            f"INFO [{expected}]: テスト"
+        )
+
+
+def test_logs_bounded():
+    """メモリ上のログが上限件数で打ち切られるかのテスト"""
+    logger = Logger()
+    limit = logger.logs.maxlen
+
+    for i in range(limit + 1):
+        logger.log_info("%d", i)
+
+    assert len(logger.logs) == limit
+    assert logger.export_operation_history().splitlines()[0].endswith(": 1")
+
+
+def test_log_echo_batched(capsys):
+    """標準出力への表示がまとめて書き出されるかのテスト"""
+    logger = Logger(verbose=True)
+
+    for i in range(100):
+        logger.log_info("メッセージ%d", i)
+    logger.flush()
+    lines = capsys.readouterr().out.splitlines()
+
+    assert len(lines) == 100
+    assert lines[0].endswith("メッセージ0")
+    assert lines[-1].endswith("メッセージ99")
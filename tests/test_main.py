@@ -4,6 +4,8 @@
 このモジュールは、アプリケーションの初期化と実行をテストします。
 """
 
+import itertools
+import threading
 import pytest
 from unittest.mock import patch, MagicMock, call
 from src.main import Application, main
@@ -11,15 +13,6 @@ from src.disk_operations.disk_manager import Disk, FilesystemStatus
 from src.file_operations.file_handler import File
 
 
-@pytest.fixture
-def app():
-    """アプリケーションのフィクスチャ"""
-    with patch("src.main.MainWindow"), patch("src.main.DiskManager"), patch(
-        "src.main.FileHandler"
-    ), patch("src.main.Logger"):
-        return Application()
-
-
 def test_main_initialization():
     """メイン関数の初期化テスト"""
     with patch("src.main.Application") as mock_app:
@@ -46,19 +39,74 @@ def test_application_initialization():
 @pytest.mark.linux_only
 def test_check_sudo_privileges(app):
     """sudo権限チェックのテスト（Linux環境専用）"""
-    with patch("subprocess.run") as mock_run:
-        # sudo権限がある場合
-        mock_run.return_value = MagicMock(returncode=0)
+    # root権限がある場合
+    with patch("os.geteuid", return_value=0):
         assert app.check_sudo_privileges() is True
         app.logger.log_info.assert_called_with("sudo権限の確認に成功しました")
 
-        # sudo権限がない場合
-        mock_run.side_effect = Exception("Permission denied")
+    # root以外で必要なケーパビリティもない場合
+    with patch("os.geteuid", return_value=1000), patch(
+        "src.main._has_required_capabilities", return_value=False
+    ), patch("subprocess.run") as mock_run:
         assert app.check_sudo_privileges() is False
-        app.logger.log_error.assert_called_with(
+        app.logger.log_error.assert_any_call("sudo権限がありません")
+        mock_run.assert_not_called()
+
+    # 実効UIDを取得できない場合
+    with patch("os.geteuid", side_effect=OSError("Permission denied")):
+        assert app.check_sudo_privileges() is False
+        app.logger.log_error.assert_any_call(
             "sudo権限の確認に失敗しました: Permission denied"
         )
 
+    # sudoの実行に失敗した場合
+    with patch("subprocess.run", side_effect=Exception("sudo not found")):
+        assert app.check_sudo_privileges(force_sudo_prompt=True) is False
+        app.logger.log_error.assert_any_call(
+            "sudo権限の確認に失敗しました: sudo not found"
+        )
+
+
+@pytest.mark.linux_only
+def test_check_sudo_privileges_euid(app):
+    """実効UIDによる権限チェックのテスト（Linux環境専用）"""
+    with patch("os.geteuid", return_value=0), patch("subprocess.run") as mock_run:
+        assert app.check_sudo_privileges() is True
+        mock_run.assert_not_called()
+
+    with patch("os.geteuid", return_value=1000), patch(
+        "src.main._has_required_capabilities", return_value=False
+    ):
+        assert app.check_sudo_privileges() is False
+
+    # sudoの実行結果の終了コードを判定する
+    with patch("subprocess.run") as mock_run:
+        mock_run.return_value = MagicMock(returncode=1)
+        assert app.check_sudo_privileges(force_sudo_prompt=True) is False
+
+
+@pytest.mark.linux_only
+@pytest.mark.parametrize(
+    "cap_eff,expected",
+    [("0000000000200002", True), ("0000000000200000", False), ("0", False)],
+)
+def test_check_sudo_privileges_capabilities(app, tmp_path, cap_eff, expected):
+    """root以外でケーパビリティによる権限チェックのテスト（Linux環境専用）"""
+    status = tmp_path / "status"
+    status.write_text(f"Name:\tpython\nCapEff:\t{cap_eff}\n")
+    real_open = open
+
+    def fake_open(path, *args, **kwargs):
+        if path == "/proc/self/status":
+            return real_open(status, *args, **kwargs)
+        return real_open(path, *args, **kwargs)
+
+    with patch("os.geteuid", return_value=1000), patch(
+        "builtins.open", side_effect=fake_open
+    ), patch("subprocess.run") as mock_run:
+        assert app.check_sudo_privileges() is expected
+        mock_run.assert_not_called()
+
 
 @pytest.mark.linux_only
 def test_detect_and_update_disks(app):
@@ -97,6 +145,23 @@ def test_handle_disk_selection(app):
     )
 
 
+def test_handle_disk_selection_uses_detected_disks(app):
+    """検出済みディスクを選択時に再利用するテスト"""
+    mock_disk = Disk("/dev/sda1", 1000000000, "ext4", False, "正常")
+    app.disk_manager.detect_disks.return_value = [mock_disk]
+
+    app.detect_and_update_disks()
+    assert app.handle_disk_selection("/dev/sda1 (0.9GB, ext4)") is mock_disk
+    assert app.handle_disk_selection("/dev/sdb1 (0.9GB, ext4)") is None
+    app.disk_manager.detect_disks.assert_called_once()
+
+    # マウント後は再検出する
+    app.disk_manager.mount_disk.return_value = True
+    app.mount_disk(mock_disk)
+    app.handle_disk_selection("/dev/sda1 (0.9GB, ext4)")
+    assert app.disk_manager.detect_disks.call_count == 2
+
+
 @pytest.mark.linux_only
 def test_mount_disk(app):
     """ディスクマウントのテスト（Linux環境専用）"""
@@ -105,6 +170,7 @@ def test_mount_disk(app):
     # マウント成功
     app.disk_manager.mount_disk.return_value = True
     assert app.mount_disk(mock_disk) is True
+    app.file_handler.clear_scan_cache.assert_called_once()
     app.logger.log_info.assert_called_with("ディスク /dev/sda1 をマウントしました")
 
     # マウント失敗
@@ -176,42 +242,263 @@ def test_copy_files(app):
     destination = "/path/to/destination"
 
     # コピー成功
-    app.file_handler.copy_files.return_value = True
+    app.file_handler.copy_files.side_effect = _copy_all
+    app.file_handler.verify_copy.return_value = True
     app.copy_files(mock_files, destination)
 
-    app.window.update_progress.assert_has_calls(
-        [call(0, "コピーを開始します..."), call(100, "コピーが完了しました")]
+    assert app.file_handler.copy_files.call_args.args == (mock_files, destination)
+    app.window.update_progress.assert_called_with(
+        100, "すべてのファイルのコピーが完了しました"
     )
-    app.file_handler.copy_files.assert_called_once_with(mock_files, destination)
-    app.logger.log_info.assert_called_with("ファイルのコピーが完了しました")
+    app.logger.log_info.assert_any_call("/test/file1.txt のコピーが完了しました")
+    app.logger.log_info.assert_any_call("/test/file2.txt のコピーが完了しました")
+    app.window.show_error.assert_not_called()
 
     # コピー失敗
-    app.file_handler.copy_files.return_value = False
+    app.file_handler.copy_files.side_effect = OSError("書き込みエラー")
     app.copy_files(mock_files, destination)
-    app.logger.log_error.assert_called_with("ファイルのコピーに失敗しました")
+    app.window.show_error.assert_called_once_with(
+        "ファイルコピー中にエラーが発生しました"
+    )
+
+
+@pytest.mark.linux_only
+def test_schedule_file_refresh(app):
+    """ファイル一覧の再読み込みが1回にまとめられるかのテスト（Linux環境専用）"""
+    root = app.window.window.TKroot
+    root.after.side_effect = ["after#1", "after#2"]
+    mock_disk = Disk("/dev/sda1", 1000000000, "ext4", False, "正常")
+
+    app._schedule_file_refresh(mock_disk)
+    app._schedule_file_refresh(mock_disk)
+
+    root.after_cancel.assert_called_once_with("after#1")
+    assert app._pending_refresh_id == "after#2"
+
+    # 予約した処理が実行されるとワーカースレッドで読み込みを開始する
+    with patch.object(app, "_run_in_background") as mock_run:
+        root.after.call_args.args[1]()
+    mock_run.assert_called_once_with(
+        "-FILES_READY-", app.file_handler.list_files, "/mnt/sda1"
+    )
+    assert app._pending_refresh_id is None
+
+
+@pytest.mark.linux_only
+def test_batched_disk_updates(app):
+    """続けて届いた検出結果の表示が1回にまとめられるかのテスト（Linux環境専用）"""
+    root = app.window.window.TKroot
+    root.after.return_value = "after#1"
+    detections = [
+        [Disk(f"/dev/sd{name}1", 1000000000, "ext4", False, "正常")] for name in "abc"
+    ]
+
+    for disks in detections:
+        app._queue_detected_disks(disks)
+
+    root.after.assert_called_once()
+    app.window.update_disk_list.assert_not_called()
+    # 選択時に参照するディスクは反映を待たずに更新される
+    assert list(app._disks_by_path) == ["/dev/sdc1"]
+
+    root.after.call_args.args[1]()
+    assert app.window.update_disk_list.call_count == 1
+    app.window.update_disk_list.assert_called_with(detections[-1])
+    assert app._disk_flush_id is None
+
+
+def _copy_all(files, destination, progress_cb=None, max_workers=None):
+    """全ファイルのコピー完了を通知するFileHandler.copy_filesの代替"""
+    for file in files:
+        progress_cb(file, None)
+    return True
+
+
+@pytest.mark.linux_only
+def test_copy_files_same_name_verified_separately(app):
+    """同名ファイルをそれぞれのコピー先で検証するかのテスト（Linux環境専用）"""
+    mock_files = [
+        File("/a/x.txt", 1024, None, "normal", False),
+        File("/b/x.txt", 1024, None, "normal", False),
+    ]
+    app.disk_manager.is_rotational.return_value = False
+    app.file_handler.copy_files.side_effect = _copy_all
+    app.file_handler.verify_copy.return_value = True
+
+    app._copy_files(mock_files, "/dest", MagicMock())
+
+    assert sorted(c.args for c in app.file_handler.verify_copy.call_args_list) == [
+        ("/a/x.txt", "/dest/x.txt"),
+        ("/b/x.txt", "/dest/x (1).txt"),
+    ]
+
+
+@pytest.mark.linux_only
+def test_copy_files_applies_events_on_caller_thread(app):
+    """同期版のコピーで通知をGUIへ呼び出し元のスレッドから反映するかのテスト（Linux環境専用）"""
+    mock_files = [
+        File(f"/path/to/file{i}.txt", 1024, None, "normal", False) for i in range(4)
+    ]
+    app.disk_manager.is_rotational.return_value = False
+    app.file_handler.copy_files.side_effect = _copy_all
+    app.file_handler.verify_copy.return_value = False
+    threads = set()
+    app.window.update_progress.side_effect = lambda *args: threads.add(
+        threading.get_ident()
+    )
+    app.window.show_error.side_effect = lambda *args: threads.add(threading.get_ident())
+
+    app.copy_files(mock_files, "/path/to/dest")
+
+    assert threads == {threading.get_ident()}
+    assert app.window.show_error.call_count == 4
+    app.window.update_progress.assert_called_with(
+        100, "すべてのファイルのコピーが完了しました"
+    )
+
+
+@pytest.mark.linux_only
+def test_copy_files_notifies_events(app):
+    """コピー処理がGUIを直接操作せずに通知先へイベントを送るかのテスト（Linux環境専用）"""
+    mock_files = [File("/path/to/file1.txt", 1024, "2024-01-01 12:00:00", "user", "")]
+    app.file_handler.copy_files.side_effect = _copy_all
+    app.file_handler.verify_copy.return_value = True
+    notify = MagicMock()
+
+    app._copy_files(mock_files, "/path/to/dest", notify)
+
+    assert notify.call_args_list == [
+        call("-COPY_PROGRESS-", (100, "/path/to/file1.txt をコピーしました (1/1)")),
+        call("-COPY_DONE-", (100, "すべてのファイルのコピーが完了しました")),
+    ]
+    app.window.update_progress.assert_not_called()
+
+
+@pytest.mark.linux_only
+def test_copy_files_throttles_progress(app):
+    """コピー進捗の通知が間引かれるかのテスト（Linux環境専用）"""
+    mock_files = [
+        File(f"/path/to/file{i}.txt", 1024, "2024-01-01 12:00:00", "user", "")
+        for i in range(1, 4)
+    ]
+    app.file_handler.copy_files.side_effect = _copy_all
+    app.file_handler.verify_copy.return_value = True
+    # 1並列にして完了順を固定する
+    app.disk_manager.is_rotational.return_value = True
+    notify = MagicMock()
+
+    with patch("src.main.time.monotonic", return_value=1000.0):
+        app._copy_files(mock_files, "/path/to/dest", notify)
+
+    # 同一時刻では最初と最後のファイルのみ通知される
+    progress_calls = [
+        c for c in notify.call_args_list if c.args[0] == "-COPY_PROGRESS-"
+    ]
+    assert progress_calls == [
+        call("-COPY_PROGRESS-", (33, "/path/to/file1.txt をコピーしました (1/3)")),
+        call("-COPY_PROGRESS-", (100, "/path/to/file3.txt をコピーしました (3/3)")),
+    ]
+
+
+@pytest.mark.linux_only
+def test_copy_files_skips_unchanged_progress(app):
+    """進捗値が変わらないファイルでは通知しないかのテスト（Linux環境専用）"""
+    mock_files = [
+        File(f"/path/to/file{i}.txt", 1024, "2024-01-01 12:00:00", "user", "")
+        for i in range(250)
+    ]
+    app.file_handler.copy_files.side_effect = _copy_all
+    app.file_handler.verify_copy.return_value = True
+    app.disk_manager.is_rotational.return_value = True
+    notify = MagicMock()
+
+    # 時間による間引きが起きないよう、毎回十分に時刻を進める
+    with patch("src.main.time.monotonic", side_effect=itertools.count(0, 1.0)):
+        app._copy_files(mock_files, "/path/to/dest", notify)
+
+    progress = [
+        c.args[1][0] for c in notify.call_args_list if c.args[0] == "-COPY_PROGRESS-"
+    ]
+    assert progress == list(range(101))
+
+
+@pytest.mark.linux_only
+def test_copy_files_batch(app):
+    """複数ファイルをまとめてコピーし、完了毎に検証するかのテスト（Linux環境専用）"""
+    mock_files = [
+        File(f"/path/to/file{i}.txt", 1024, "2024-01-01 12:00:00", "user", "")
+        for i in range(1, 5)
+    ]
+    app.disk_manager.is_rotational.return_value = False
+    app.file_handler.copy_files.side_effect = _copy_all
+    app.file_handler.verify_copy.side_effect = (
+        lambda src, dst, verify_mode: src != "/path/to/file2.txt"
+    )
+    notify = MagicMock()
+
+    app._copy_files(mock_files, "/path/to/dest", notify)
+
+    app.file_handler.copy_files.assert_called_once()
+    assert app.file_handler.copy_files.call_args.kwargs["max_workers"] > 1
+    assert app.file_handler.verify_copy.call_count == 4
+    assert app.file_handler.verify_copy.call_args.kwargs["verify_mode"] == "ondisk"
+    assert (
+        notify.call_args_list.count(
+            call("-COPY_ERROR-", "/path/to/file2.txt のコピー検証に失敗しました")
+        )
+        == 1
+    )
+    assert notify.call_args_list[-1] == call(
+        "-COPY_DONE-", (100, "すべてのファイルのコピーが完了しました")
+    )
 
 
 @pytest.mark.linux_only
 def test_run(app):
     """アプリケーション実行のテスト（Linux環境専用）"""
+    mock_disk = Disk("/dev/sda1", 1000000000, "ext4", False, "正常")
+    app.window.current_disk = mock_disk
+    app.window.selected_files = []
+
     # イベントループのシミュレーション
     app.window.window.read.side_effect = [
-        ("-MOUNT-", {"device": "/dev/sda1"}),  # マウントボタンクリック
-        ("-COPY-", {"destination": "/path/to/dest"}),  # コピーボタンクリック
+        ("-MOUNT-", {}),  # マウントボタンクリック
+        ("-MOUNT_READY-", {"-MOUNT_READY-": ((mock_disk,), True)}),  # マウント完了
+        ("-UNMOUNT-", {}),  # アンマウントボタンクリック
+        ("-UNMOUNT_READY-", {"-UNMOUNT_READY-": ((mock_disk,), False)}),  # 失敗
+        ("-FILE_TREE-", {"-FILE_TREE-": ["/test/file1.txt"]}),  # ファイル選択
+        ("-COPY-", {"-DEST_PATH-": "/path/to/dest"}),  # コピーボタンクリック
         ("-EXIT-", None),  # 終了ボタンクリック
     ]
 
-    # テスト用のモックオブジェクト
-    mock_disk = Disk("/dev/sda1", 1000000000, "ext4", False, "正常")
-    app.handle_disk_selection.return_value = mock_disk
-    app.mount_disk.return_value = True
-    app.file_handler.copy_files.return_value = True
-
     # アプリケーションを実行
-    app.run()
+    with patch.object(app, "check_sudo_privileges", return_value=True), patch.object(
+        app, "_run_in_background"
+    ) as mock_background, patch.object(app, "_schedule_file_refresh") as mock_schedule:
+        app.run()
 
     # 期待される呼び出しを確認
     assert app.window.create_window.called
-    assert app.window.window.read.call_count == 3
+    assert app.window.window.read.call_count == 7
     assert app.window.close.called
-    app.logger.log_info.assert_called_with("アプリケーションを終了します")
+    app.logger.close.assert_called_once()
+
+    # マウント・アンマウントはイベントループ内で実行せず、ワーカースレッドへ渡す
+    app.disk_manager.mount_disk.assert_not_called()
+    app.disk_manager.unmount_disk.assert_not_called()
+    assert (
+        call("-MOUNT_READY-", app.disk_manager.mount_disk, mock_disk)
+        in mock_background.call_args_list
+    )
+    assert (
+        call("-UNMOUNT_READY-", app.disk_manager.unmount_disk, mock_disk)
+        in mock_background.call_args_list
+    )
+
+    # マウント完了時は走査結果を破棄してファイル一覧を再読み込みする
+    app.file_handler.clear_scan_cache.assert_called_once()
+    mock_schedule.assert_called_once_with(mock_disk)
+    app.window.show_error.assert_any_call("/dev/sda1 のアンマウントに失敗しました")
+    # 選択されたノードは仮の子ノードを除外するselect_filesを経由して保持する
+    app.window.select_files.assert_called_once_with(["/test/file1.txt"])
+    app.window.show_error.assert_called_with("コピーするファイルを選択してください")
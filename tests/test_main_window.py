@@ -5,30 +5,23 @@ MainWindowクラスのテストモジュール
 """
 
 import pytest
-from unittest.mock import MagicMock, patch, call
-import PySimpleGUI as sg
-from src.gui.main_window import MainWindow
+from collections import defaultdict
+from unittest.mock import MagicMock, Mock, patch, call
+from src.gui.main_window import MainWindow, _format_size, _PLACEHOLDER_SUFFIX
 from src.disk_operations.disk_manager import Disk, FilesystemStatus
 from src.file_operations.file_handler import File
 
 
 @pytest.fixture
-def mock_sg():
-    """PySimpleGUIのモックフィクスチャ"""
-    with patch("src.gui.main_window.sg") as mock_sg:
-        # 必要な属性をモックに追加
-        mock_sg.Text = MagicMock()
-        mock_sg.Tree = MagicMock()
-        mock_sg.TreeData = MagicMock()
-        mock_sg.Column = MagicMock()
-        mock_sg.Button = MagicMock()
-        mock_sg.Input = MagicMock()
-        mock_sg.FolderBrowse = MagicMock()
-        mock_sg.ProgressBar = MagicMock()
-        mock_sg.Window = MagicMock()
-        mock_sg.popup_error = MagicMock()
-        mock_sg.popup_scrolled = MagicMock()
-        yield mock_sg
+def mock_sg(monkeypatch):
+    """PySimpleGUIのモックフィクスチャ
+
+    MagicMockは参照された属性（sg.Window、sg.popup_errorなど）を自動で作成するため、
+    モジュールのsgを差し替えるだけにする
+    """
+    mock_sg = MagicMock()
+    monkeypatch.setattr("src.gui.main_window.sg", mock_sg)
+    return mock_sg
 
 
 @pytest.fixture
@@ -39,14 +32,13 @@ def main_window(mock_sg):
 
 @pytest.fixture
 def mock_window():
-    """モック化されたウィンドウのフィクスチャ"""
+    """モック化されたウィンドウのフィクスチャ
+
+    window[key]はキー毎に別の要素のモックを返す（要素はMockで、初回参照時に作成する）
+    """
+    elements = defaultdict(Mock)
     mock = MagicMock()
-    mock["-DISK_TREE-"] = MagicMock()
-    mock["-FILE_TREE-"] = MagicMock()
-    mock["-PROGRESS-"] = MagicMock()
-    mock["-STATUS-"] = MagicMock()
-    mock["-DISK_STATUS-"] = MagicMock()
-    mock["-DISK_LIST-"] = MagicMock()
+    mock.__getitem__.side_effect = elements.__getitem__
     return mock
 
 
@@ -83,6 +75,20 @@ def test_update_disk_list(main_window, mock_window):
     mock_window["-DISK_LIST-"].update.assert_called_once()
 
 
+def test_update_disk_list_unchanged(main_window, mock_window):
+    """同じディスク一覧の再表示でウィジェットを更新しないかのテスト"""
+    main_window.window = mock_window
+
+    main_window.update_disk_list([Disk("/dev/sda1", 1 << 30, "ext4", False, "正常")])
+    main_window.update_disk_list([Disk("/dev/sda1", 1 << 30, "ext4", True, "正常")])
+    main_window.update_disk_list([])
+
+    assert mock_window["-DISK_LIST-"].update.call_args_list == [
+        call(values=["/dev/sda1 (1.0GB, ext4)"]),
+        call(values=[]),
+    ]
+
+
 def test_update_file_tree(main_window, mock_window, mock_sg):
     """ファイルツリー更新のテスト"""
     main_window.window = mock_window
@@ -95,6 +101,119 @@ def test_update_file_tree(main_window, mock_window, mock_sg):
     mock_window["-FILE_TREE-"].update.assert_called_once()
 
 
+def test_expand_node(mock_window):
+    """ディレクトリ展開時に、展開したディレクトリの中身のみ追加するかのテスト"""
+    main_window = MainWindow()
+    main_window.window = mock_window
+    main_window.update_file_tree(
+        [
+            File("/test/file1.txt", 1000, None, "正常", False),
+            File("/test/file2.txt", 2000, None, "正常", False),
+            File("/other/file3.txt", 3000, None, "正常", False),
+        ]
+    )
+    tree = mock_window["-FILE_TREE-"]
+    placeholder = "/test" + _PLACEHOLDER_SUFFIX
+    tree.KeyToID = {"": "", "/test": "I001", placeholder: "I002"}
+    tree.IdToKey = {node_id: key for key, node_id in tree.KeyToID.items()}
+    tree.update.reset_mock()
+
+    main_window.expand_node("/test")
+    # ツリー全体は再構築せず、仮の子ノードをファイルに置き換える
+    tree.update.assert_not_called()
+    tree.Widget.delete.assert_called_once_with("I002")
+    assert placeholder not in tree.KeyToID
+    assert "I002" not in tree.IdToKey
+    assert [c.args[0].key for c in tree.add_treeview_data.call_args_list] == [
+        "/test/file1.txt",
+        "/test/file2.txt",
+    ]
+    tree.Widget.item.assert_called_once_with("I001", open=True)
+    assert "/other" + _PLACEHOLDER_SUFFIX in main_window._treedata.tree_dict
+
+    # 展開済みのディレクトリや未知のキーでは追加しない
+    tree.add_treeview_data.reset_mock()
+    main_window.expand_node("/test")
+    main_window.expand_node("/unknown")
+    tree.add_treeview_data.assert_not_called()
+
+
+@pytest.fixture
+def real_window():
+    """実際のPySimpleGUIのウィンドウを作成したMainWindowのフィクスチャ
+
+    ディスプレイが利用できない環境ではスキップする
+    """
+    tkinter = pytest.importorskip("tkinter")
+    try:
+        tkinter.Tk().destroy()
+    except tkinter.TclError as e:
+        pytest.skip(f"ディスプレイが利用できません: {e}")
+    main_window = MainWindow()
+    main_window.create_window()
+    yield main_window
+    main_window.close()
+
+
+def test_expand_node_real_tree(real_window):
+    """実際のsg.Treeでディレクトリの中身のみを追加するかのテスト"""
+    real_window.update_file_tree(
+        [
+            File("/test/file1.txt", 1000, None, "正常", False),
+            File("/test/file2.txt", 2000, None, "正常", False),
+            File("/other/file3.txt", 3000, None, "正常", False),
+        ]
+    )
+    tree = real_window.window["-FILE_TREE-"]
+    other_id = tree.KeyToID["/other"]
+
+    real_window.expand_node("/test")
+
+    test_id = tree.KeyToID["/test"]
+    assert [tree.IdToKey[i] for i in tree.Widget.get_children(test_id)] == [
+        "/test/file1.txt",
+        "/test/file2.txt",
+    ]
+    assert tree.Widget.item(test_id, "open")
+    assert "/test" + _PLACEHOLDER_SUFFIX not in tree.KeyToID
+    # 他のディレクトリのノードは作り直さない
+    assert tree.KeyToID["/other"] == other_id
+    assert [tree.IdToKey[i] for i in tree.Widget.get_children(other_id)] == [
+        "/other" + _PLACEHOLDER_SUFFIX
+    ]
+
+
+def test_refresh_file_tree_reuses_treedata(mock_window):
+    """ツリーの再構築でTreeDataを再利用するかのテスト"""
+    main_window = MainWindow()
+    main_window.window = mock_window
+    treedata = main_window._treedata
+
+    main_window.update_file_tree([File("/test/file1.txt", 1000, None, "正常", False)])
+    main_window.update_file_tree([File("/other/file2.txt", 2000, None, "正常", False)])
+
+    assert mock_window["-FILE_TREE-"].update.call_args.kwargs["values"] is treedata
+    assert "/test" not in treedata.tree_dict
+    assert "/other" in treedata.tree_dict
+    assert [child.key for child in treedata.root_node.children] == ["/"]
+
+
+@pytest.mark.parametrize(
+    "size,expected",
+    [
+        (0, "0.0B"),
+        (1023, "1023.0B"),
+        (1024, "1.0KB"),
+        (1536, "1.5KB"),
+        (1024**3, "1.0GB"),
+        (1024**6, "1024.0PB"),
+    ],
+)
+def test_format_size(size, expected):
+    """ファイルサイズ表示の変換テスト"""
+    assert _format_size(size) == expected
+
+
 def test_update_progress(main_window, mock_window):
     """進捗更新のテスト"""
     main_window.window = mock_window
@@ -116,6 +235,43 @@ def test_update_progress(main_window, mock_window):
     status_element.update.assert_called_once_with(value=test_message)
 
 
+def test_update_progress_same_value(main_window, mock_window):
+    """進捗値が同じ場合にプログレスバーを更新しないかのテスト"""
+    main_window.window = mock_window
+
+    with patch("src.gui.main_window.time.monotonic", side_effect=[10.0, 20.0]):
+        main_window.update_progress(50, "file1")
+        main_window.update_progress(50, "file2")
+
+    assert mock_window["-PROGRESS-"].update.call_args_list == [call(current_count=50)]
+    assert mock_window["-STATUS-"].update.call_args_list == [
+        call(value="file1"),
+        call(value="file2"),
+    ]
+
+
+def test_update_progress_throttled(main_window, mock_window):
+    """進捗更新の間引きのテスト"""
+    main_window.window = mock_window
+    progress_element = MagicMock()
+    mock_window.__getitem__.side_effect = lambda x: {
+        "-PROGRESS-": progress_element,
+        "-STATUS-": MagicMock(),
+    }[x]
+
+    main_window.update_progress(10, "1件目")
+    main_window.update_progress(20, "2件目")
+    main_window.update_progress(100, "完了")
+    main_window.update_progress(0, "開始")
+    main_window.update_progress(30, "3件目")
+
+    assert progress_element.update.call_args_list == [
+        call(current_count=10),
+        call(current_count=100),
+        call(current_count=0),
+    ]
+
+
 def test_show_error(main_window, mock_sg):
     """エラー表示のテスト"""
     test_message = "テストエラー"
@@ -125,6 +281,26 @@ def test_show_error(main_window, mock_sg):
     )
 
 
+def test_show_error_buffered(main_window, mock_window, mock_sg):
+    """ウィンドウ表示中のエラーがまとめて表示されるかのテスト"""
+    main_window.window = mock_window
+
+    main_window.show_error("エラー1")
+    main_window.show_error("エラー2")
+    mock_window.write_event_value.assert_called_once_with("-FLUSH_ERRORS-", None)
+    mock_sg.popup_error.assert_not_called()
+
+    main_window.flush_errors()
+    mock_sg.popup_scrolled.assert_called_once()
+    assert mock_sg.popup_scrolled.call_args.args[0] == "エラー1\nエラー2"
+
+    # 表示後は次のエラーで再びイベントを発行する
+    main_window.show_error("エラー3")
+    assert mock_window.write_event_value.call_count == 2
+    main_window.flush_errors()
+    mock_sg.popup_error.assert_called_once_with("エラー: エラー3", title="エラー")
+
+
 def test_show_help(main_window, mock_sg):
     """ヘルプ表示のテスト"""
     main_window.show_help()
@@ -141,6 +317,21 @@ def test_display_disk_status(main_window, mock_window):
     mock_window["-DISK_STATUS-"].update.assert_called_once()
 
 
+def test_display_disk_status_unchanged(main_window, mock_window):
+    """同じディスク状態の再表示でウィジェットを更新しないかのテスト"""
+    main_window.window = mock_window
+    broken = FilesystemStatus(False, "inode破損")
+
+    main_window.display_disk_status(broken)
+    main_window.display_disk_status(FilesystemStatus(False, "inode破損"))
+    main_window.display_disk_status(FilesystemStatus(True, ""))
+
+    assert mock_window["-DISK_STATUS-"].update.call_args_list == [
+        call("問題あり: inode破損"),
+        call("正常"),
+    ]
+
+
 def test_close(main_window, mock_window):
     """ウィンドウ終了のテスト"""
     main_window.window = mock_window
@@ -152,6 +343,11 @@ def test_close(main_window, mock_window):
     "event,values,expected_files",
     [
         ("-SELECT-", {"-FILE_TREE-": ["file1.txt"]}, ["file1.txt"]),
+        (
+            "-SELECT-",
+            {"-FILE_TREE-": ["/test", "/test" + _PLACEHOLDER_SUFFIX]},
+            ["/test"],
+        ),
         ("-SELECT_ALL-", {"-FILE_TREE-": []}, ["file1.txt", "file2.txt"]),
         ("-DESELECT-", {"-FILE_TREE-": []}, []),
     ],
@@ -164,3 +360,16 @@ def test_handle_file_selection(main_window, mock_window, event, values, expected
 
     main_window.handle_file_selection(event, values)
     assert main_window.selected_files == expected_files
+
+
+def test_select_all_excludes_placeholders(main_window, mock_window):
+    """すべて選択で未展開のディレクトリの仮の子ノードを除外するかのテスト"""
+    main_window.window = mock_window
+    mock_window["-FILE_TREE-"].get_children.return_value = [
+        "/file1.txt",
+        "/test",
+        "/test" + _PLACEHOLDER_SUFFIX,
+    ]
+
+    main_window.handle_file_selection("-SELECT_ALL-", {"-FILE_TREE-": []})
+    assert main_window.selected_files == ["/file1.txt", "/test"]